@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark loading the processed tables: CSV parsing vs the binary artifact.
+
+Every stage used to re-parse the CSVs in data/processed. The sync now also
+writes `network.arrays/`, whose integer codes and numeric columns are
+memory-mapped on load. This writes synthetic tables of each size to a
+temporary directory and times both paths through `read_frames()`.
+
+Usage:
+    python benchmarks/bench_artifact.py
+    python benchmarks/bench_artifact.py --sizes 10000 100000 --edges-per-node 10
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.artifact import ARTIFACT_DIR, write_artifact
+from pedp_network_map.data import read_frames
+
+from bench_node_store import COLORS, synthetic_frames
+from bench_tooltips import RELATIONSHIPS
+
+
+def write_tables(data_dir, n_nodes, edges_per_node, seed=0):
+    rng = np.random.default_rng(seed)
+    nodes_df, positions_df = synthetic_frames(n_nodes, seed)
+    n_edges = n_nodes * edges_per_node
+    ids = nodes_df['id'].to_numpy()
+    pd.DataFrame({
+        'source': ids[rng.integers(0, n_nodes, n_edges)],
+        'target': ids[rng.integers(0, n_nodes, n_edges)],
+        'relationship_type': rng.choice(RELATIONSHIPS, n_edges),
+    }).to_csv(data_dir / 'edges.csv', index=False)
+    nodes_df.to_csv(data_dir / 'nodes.csv', index=False)
+    positions_df.to_csv(data_dir / 'node_positions.csv', index=False)
+    COLORS.to_csv(data_dir / 'colors.csv', index=False)
+    return n_edges
+
+
+def timed_read(data_dir, runs=3):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        read_frames(data_dir)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(n_nodes, edges_per_node):
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        n_edges = write_tables(data_dir, n_nodes, edges_per_node)
+        csv_time = timed_read(data_dir)
+
+        start = time.perf_counter()
+        write_artifact(data_dir)
+        write_time = time.perf_counter() - start
+        artifact_time = timed_read(data_dir)
+
+        csv_size = sum(path.stat().st_size for path in data_dir.glob('*.csv'))
+        artifact_size = sum(path.stat().st_size for path in (data_dir / ARTIFACT_DIR).iterdir())
+    print(f"{n_nodes:>8,d} nodes, {n_edges:>10,d} edges | "
+          f"CSV: {csv_time:6.3f}s ({csv_size / 2**20:6.1f} MB) | "
+          f"artifact: {artifact_time:6.3f}s ({artifact_size / 2**20:6.1f} MB, written in {write_time:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--edges-per-node', type=int, default=10)
+    args = parser.parse_args()
+
+    print("read_frames() time, best of 3")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes, args.edges_per_node)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark betweenness/closeness: NetworkX exact vs sampled Brandes.
+
+The centrality table used to run `nx.betweenness_centrality` and
+`nx.closeness_centrality` on the full undirected graph, which is O(VE).
+`path_centrality` runs the same searches over CSR arrays and, above
+EXACT_NODE_LIMIT nodes, from a per-component sample of sources only.
+For sizes up to --exact-limit the sampled result is compared with the
+exact one, and the observed error is checked against the reported bound.
+
+Usage:
+    python benchmarks/bench_centrality.py
+    python benchmarks/bench_centrality.py --sizes 1000 10000 100000 --samples 500 --workers 4
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.centrality import path_centrality
+from pedp_network_map.graph import build_graph, real_graph
+
+from bench_tooltips import synthetic_network
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench(n_nodes, edges_per_node, samples, workers, exact_limit):
+    network = synthetic_network(n_nodes, edges_per_node)
+    G_undirected = real_graph(build_graph(network)).to_undirected()
+    line = f"{n_nodes:>8,d} nodes |"
+
+    if n_nodes <= exact_limit:
+        G_nx = G_undirected.to_networkx()
+        _, nx_time = timed(lambda: (nx.betweenness_centrality(G_nx), nx.closeness_centrality(G_nx)))
+        exact, exact_time = timed(path_centrality, G_undirected, samples=0, workers=workers)
+        line += f" networkx {nx_time:7.2f}s | exact {exact_time:7.2f}s |"
+
+    sampled, sampled_time = timed(path_centrality, G_undirected, samples=samples, workers=workers)
+    line += f" k={samples} {sampled_time:6.2f}s"
+
+    if n_nodes <= exact_limit:
+        error = np.abs(sampled.betweenness - exact.betweenness)
+        line += (f" | max error {error.max():.4f} (bound {sampled.error.max():.4f}, "
+                 f"exceeded for {(error > sampled.error).mean():.1%} of nodes)")
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 5_000, 100_000])
+    parser.add_argument('--edges-per-node', type=int, default=2)
+    parser.add_argument('--samples', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--exact-limit', type=int, default=5_000,
+                        help='only run the exact algorithms up to this size (default: 5000)')
+    args = parser.parse_args()
+
+    print("Betweenness + closeness time")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes, args.edges_per_node, args.samples, args.workers, args.exact_limit)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark derived-edge generation: the old iterrows loop vs the rule engine.
+
+The sync used to find approved funders with two `str.contains` passes and
+then build one `funds` edge per row with `iterrows()`. The rule engine in
+`pedp_network_map.rules` evaluates the same rule as column operations,
+builds every derived edge in one DataFrame and dedupes them against the
+Edges tab.
+
+Usage:
+    python benchmarks/bench_edge_rules.py
+    python benchmarks/bench_edge_rules.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.rules import DEFAULT_RULES, Condition, EdgeRule, derive_edges
+
+STATUSES = ['1. prospect', '2. contacted', '3. in review', '4. approved', 'Established']
+CATEGORIES = ['Funder', 'Data Coordination/Standards', 'Data Preservation/Archiving',
+              'Data Collection/Monitoring', 'Capacity Building/Support']
+
+# A second rule so multi-rule runs (and shared-condition caching) are timed too
+EXTRA_RULES = [
+    EdgeRule(name='prospective funders interested',
+             conditions=(Condition('category', 'equals', 'Funder'),
+                         Condition('status', 'in', ['1. prospect', '2. contacted'])),
+             relationship_type='Interested in solving the problem', target='PEDP'),
+]
+
+
+def synthetic_frames(n_nodes, seed=0):
+    """Node sheet with `n_nodes` rows plus an Edges tab that already holds some funds edges."""
+    rng = np.random.default_rng(seed)
+    nodes_df = pd.DataFrame({
+        'id': [f'N{i:06d}' for i in range(n_nodes)],
+        'name': [f'Organization {i}' for i in range(n_nodes)],
+        'category': rng.choice(CATEGORIES, n_nodes),
+        'status': rng.choice(STATUSES + [None], n_nodes),
+    })
+    approved = nodes_df[nodes_df['category'] == 'Funder']['id'].head(n_nodes // 100)
+    edges_df = pd.DataFrame({'source': approved, 'target': 'PEDP', 'relationship_type': 'funds'})
+    return nodes_df, edges_df
+
+
+def iterrows_funding_edges(nodes_df):
+    """The previous generate_funding_edges(), minus its per-row print."""
+    funding_edges = []
+    funders = nodes_df[
+        (nodes_df['category'] == 'Funder') &
+        (nodes_df['status'].str.contains('4', na=False) | nodes_df['status'].str.contains('approved', na=False))
+    ]
+    for idx, funder in funders.iterrows():
+        funding_edges.append({'source': funder['id'], 'target': 'PEDP', 'relationship_type': 'funds'})
+    return pd.DataFrame(funding_edges)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench(n_nodes):
+    nodes_df, edges_df = synthetic_frames(n_nodes)
+    old, old_time = timed(iterrows_funding_edges, nodes_df)
+    new, new_time = timed(derive_edges, nodes_df, DEFAULT_RULES, existing_edges=edges_df)
+    multi, multi_time = timed(derive_edges, nodes_df, DEFAULT_RULES + EXTRA_RULES,
+                              existing_edges=edges_df)
+    print(f"{n_nodes:>9,d} nodes | iterrows: {old_time:7.3f}s ({len(old):,d} edges) | "
+          f"rules: {new_time:6.3f}s ({len(new):,d} new, {len(old) - len(new):,d} already in Edges) | "
+          f"2 rules: {multi_time:6.3f}s ({len(multi):,d} new)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print("Derived-edge generation")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Measure time-to-first-stable-frame for the current and hypothetical maps.
+
+Each map is rendered in every render mode. `physics` is the old
+behaviour, where the browser runs up to 1000 Barnes-Hut stabilization
+iterations; `settled` and `static` start from the precomputed positions.
+
+Two engines:
+- chromium: pages load in headless Chromium through Playwright, and a
+  probe script records `performance.now()` when the first frame after
+  stabilization is drawn (for `static`, simply the first frame). Install
+  with `pip install '.[benchmark]' && playwright install chromium`.
+- node: vis-network runs in Node.js (the same V8 engine) against a stub
+  DOM and a no-op canvas, and the time runs from creating the Network to
+  the end of stabilization. Painting and page parsing are not included,
+  so the numbers are lower than in a browser, but the layout work the
+  modes differ in is the same.
+
+The default (auto) uses Chromium when Playwright is installed, Node.js
+otherwise, and skips with a message when neither is available.
+
+Usage:
+    python benchmarks/bench_first_stable_frame.py --runs 5
+    python benchmarks/bench_first_stable_frame.py --engine node --synthetic 1000
+
+With --keep DIR the instrumented pages are written there to open by hand;
+the time is logged to the browser console.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pyvis
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.data import current_network, hypothetical_network, read_frames
+from pedp_network_map.graph import build_graph
+from pedp_network_map.render import (
+    CURRENT_BACKGROUND, HYPOTHETICAL_BACKGROUND, RENDER_MODES, build_pyvis_network, render_network,
+)
+
+ENGINES = ('auto', 'chromium', 'node')
+VIS_NETWORK_JS = Path(pyvis.__file__).parent / 'templates' / 'lib' / 'vis-9.1.2' / 'vis-network.min.js'
+
+PROBE = """<script type="text/javascript">
+(function () {
+    function record() {
+        network.once('afterDrawing', function () {
+            window.pedpFirstStableFrame = performance.now();
+            console.log('first stable frame: ' + window.pedpFirstStableFrame.toFixed(0) + ' ms');
+        });
+    }
+    if (network.physics.options.enabled && network.physics.options.stabilization.enabled) {
+        network.once('stabilizationIterationsDone', record);
+    } else {
+        record();
+    }
+})();
+</script>
+"""
+
+# Runs vis-network in Node: argv = vis-network.min.js, page JSON ({nodes, edges, options})
+NODE_HARNESS = """
+var fs = require('fs');
+// Just enough DOM and canvas for vis-network; nothing is painted
+function stub() {
+    return new Proxy(function () {}, {
+        get: function (t, k) {
+            if (k === Symbol.toPrimitive) return function () { return 0; };
+            if (k === 'then') return undefined;
+            if (k in t) return t[k];
+            if (k === 'measureText') return function (s) { return {width: String(s).length * 7}; };
+            if (k === 'getBoundingClientRect') return function () {
+                return {left: 0, top: 0, right: 1200, bottom: 800, width: 1200, height: 800};
+            };
+            if (['clientWidth', 'offsetWidth', 'width'].indexOf(k) >= 0) return 1200;
+            if (['clientHeight', 'offsetHeight', 'height'].indexOf(k) >= 0) return 800;
+            if (k === 'style') return (t.style = {});
+            if (k === 'childNodes' || k === 'children') return [];
+            if (k === 'hasChildNodes' || k === 'contains') return function () { return false; };
+            if (k === 'nodeType') return 1;
+            return (t[k] = stub());
+        },
+        set: function (t, k, v) { t[k] = v; return true; },
+        apply: function () { return stub(); },
+        construct: function () { return stub(); }
+    });
+}
+global.window = global;
+global.document = stub();
+global.navigator = {userAgent: 'node', maxTouchPoints: 0, language: 'en'};
+global.requestAnimationFrame = function (fn) { return setTimeout(function () { fn(Date.now()); }, 0); };
+global.cancelAnimationFrame = clearTimeout;
+global.getComputedStyle = function () { return {getPropertyValue: function () { return ''; }}; };
+global.addEventListener = global.removeEventListener = function () {};
+global.devicePixelRatio = 1;
+global.Element = global.HTMLElement = function () {};
+
+var vis = (function (source) {
+    var module = {exports: {}}, exports = module.exports;
+    eval(source);
+    return module.exports;
+})(fs.readFileSync(process.argv[2], 'utf8'));
+var page = JSON.parse(fs.readFileSync(process.argv[3], 'utf8'));
+
+var start = performance.now();
+var network = new vis.Network(stub(), {nodes: new vis.DataSet(page.nodes), edges: new vis.DataSet(page.edges)},
+                              page.options);
+function done() {
+    console.log(performance.now() - start);
+    process.exit(0);
+}
+var physics = page.options.physics;
+if (physics.enabled && physics.stabilization.enabled !== false) {
+    network.once('stabilizationIterationsDone', done);
+} else {
+    setTimeout(done, 0);
+}
+"""
+
+
+def load_maps(data_dir, synthetic=None):
+    """{name: (NetworkData, background)} for the maps to measure."""
+    if synthetic:
+        from bench_tooltips import synthetic_network
+        return {f'synthetic {synthetic:,}': (synthetic_network(synthetic, 2), CURRENT_BACKGROUND)}
+    frames = read_frames(data_dir, hypothetical=True)
+    return {
+        'current': (current_network(frames), CURRENT_BACKGROUND),
+        'hypothetical': (hypothetical_network(frames), HYPOTHETICAL_BACKGROUND),
+    }
+
+
+def render_pages(maps, out_dir):
+    """Render every map in every mode with the timing probe. Returns {(map, mode): path}."""
+    pages = {}
+    cwd = os.getcwd()
+    os.chdir(out_dir)   # pyvis copies its lib/ into the working directory
+    try:
+        for name, (network, background) in maps.items():
+            G = build_graph(network)
+            for mode in RENDER_MODES:
+                path = render_network(G, network, Path(out_dir) / f"{name.replace(' ', '_')}_{mode}.html",
+                                      background=background, mode=mode, data_file=False, search=False)
+                html = path.read_text(encoding='utf-8')
+                path.write_text(html.replace('</body>', PROBE + '</body>', 1), encoding='utf-8')
+                pages[(name, mode)] = path
+    finally:
+        os.chdir(cwd)
+    return pages
+
+
+def measure_chromium(pages, runs, timeout):
+    from playwright.sync_api import sync_playwright
+
+    results = {}
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        for key, path in pages.items():
+            times = []
+            for _ in range(runs):
+                page = browser.new_page()
+                page.goto(path.resolve().as_uri())
+                page.wait_for_function('window.pedpFirstStableFrame !== undefined', timeout=timeout * 1000)
+                times.append(page.evaluate('window.pedpFirstStableFrame'))
+                page.close()
+            results[key] = times
+        browser.close()
+    return results
+
+
+def measure_node(maps, runs, timeout, out_dir):
+    """Time each map and mode with NODE_HARNESS. Returns {(map, mode): [ms, ...]}."""
+    harness = Path(out_dir) / 'harness.js'
+    harness.write_text(NODE_HARNESS, encoding='utf-8')
+    results = {}
+    for name, (network, background) in maps.items():
+        G = build_graph(network)
+        for mode in RENDER_MODES:
+            net = build_pyvis_network(G, network, background=background, inline_tooltips=False, mode=mode)
+            page = Path(out_dir) / f"{name.replace(' ', '_')}_{mode}.json"
+            page.write_text(json.dumps({'nodes': net.nodes, 'edges': net.edges,
+                                        'options': json.loads(net.options.to_json())}), encoding='utf-8')
+            results[(name, mode)] = [
+                float(subprocess.run(['node', str(harness), str(VIS_NETWORK_JS), str(page)], check=True,
+                                     capture_output=True, text=True, timeout=timeout).stdout)
+                for _ in range(runs)
+            ]
+    return results
+
+
+def chromium_available():
+    """True when Playwright is installed and can launch its Chromium."""
+    try:
+        from playwright.sync_api import Error, sync_playwright
+    except ImportError:
+        return False
+    try:
+        with sync_playwright() as p:
+            p.chromium.launch().close()
+    except Error:
+        return False
+    return True
+
+
+def pick_engine(engine):
+    """The engine to run, or None (with a message) when it is not available."""
+    has_chromium = engine != 'node' and chromium_available()
+    has_node = shutil.which('node') is not None
+    if engine == 'auto':
+        engine = 'chromium' if has_chromium else 'node' if has_node else None
+    if engine == 'chromium' and not has_chromium:
+        print("Skipped: Playwright or its Chromium is not installed "
+              "(pip install '.[benchmark]' && playwright install chromium)")
+        return None
+    if engine == 'node' and not has_node:
+        print("Skipped: Node.js is not on PATH")
+        return None
+    if engine is None:
+        print("Skipped: needs Playwright (pip install '.[benchmark]' && playwright install chromium) "
+              "or Node.js; use --keep DIR to write the pages and open them by hand")
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data-dir', type=Path,
+                        default=Path(__file__).resolve().parent.parent / 'data' / 'processed')
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help='measure a synthetic network of N nodes instead of the two maps')
+    parser.add_argument('--engine', choices=ENGINES, default='auto')
+    parser.add_argument('--runs', type=int, default=3, help='page loads per map and mode (default: 3)')
+    parser.add_argument('--timeout', type=float, default=120, help='seconds to wait per load')
+    parser.add_argument('--keep', type=Path,
+                        help='write the instrumented pages here (and measure nothing) to open by hand')
+    args = parser.parse_args()
+
+    maps = load_maps(args.data_dir, args.synthetic)
+    if args.keep:
+        args.keep.mkdir(parents=True, exist_ok=True)
+        for path in render_pages(maps, args.keep.resolve()).values():
+            print(f"  {path}")
+        return 0
+
+    engine = pick_engine(args.engine)
+    if engine is None:
+        return 0
+    with tempfile.TemporaryDirectory() as tmp:
+        if engine == 'chromium':
+            results = measure_chromium(render_pages(maps, Path(tmp)), args.runs, args.timeout)
+            label = 'headless Chromium, page load to first stable frame'
+        else:
+            results = measure_node(maps, args.runs, args.timeout, tmp)
+            label = 'vis-network in Node.js, no painting'
+
+    print(f"Time to first stable frame ({label}; median of {args.runs})")
+    print("-" * 60)
+    for (name, mode), times in results.items():
+        print(f"{name:>16} | {mode:>8} | {statistics.median(times):8.0f} ms "
+              f"(min {min(times):.0f}, max {max(times):.0f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
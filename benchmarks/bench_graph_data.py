@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark the columnar graph data file against inline PyVis literals.
+
+PyVis writes every node and edge into the page as an object literal. The
+renderer now writes them to a content-hashed `.data.<hash>.js`, loaded by
+a shell page through the unhashed `.data.js` pointer
+(pedp_network_map.graphdata). This compares the inline page with the shell
+plus its data file, raw and gzipped, and checks that the shell stays
+byte-identical when the data changes.
+
+Usage:
+    python benchmarks/bench_graph_data.py
+    python benchmarks/bench_graph_data.py --sizes 1000 10000 --edges-per-node 3
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.graph import build_graph
+from pedp_network_map.render import render_network
+
+from bench_tooltips import synthetic_network
+
+
+def sizes(path):
+    data = Path(path).read_bytes()
+    return len(data), len(gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def bench(n_nodes, edges_per_node):
+    network = synthetic_network(n_nodes, edges_per_node)
+    G = build_graph(network)
+    changed = synthetic_network(n_nodes, edges_per_node, seed=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)   # pyvis copies its lib/ into the working directory
+        try:
+            # Unclustered, so both pages carry the same nodes and edges
+            inline = sizes(render_network(G, network, Path(tmp) / 'inline.html',
+                                          clustered=False, data_file=False))
+            shell_path = render_network(G, network, Path(tmp) / 'shell.html', clustered=False)
+            shell = sizes(shell_path)
+            data = sizes(next(Path(tmp).glob('shell.data.*.js')))
+            next_path = render_network(build_graph(changed), changed, Path(tmp) / 'next' / 'shell.html',
+                                       clustered=False)
+            same_shell = next_path.read_bytes() == shell_path.read_bytes()
+        finally:
+            os.chdir(cwd)
+
+    print(f"{n_nodes:>8,d} nodes, {G.number_of_edges():>8,d} edges | "
+          f"inline page {inline[0] / 1e6:6.2f} MB (gz {inline[1] / 1e6:5.2f}) | "
+          f"shell {shell[0] / 1e3:5.1f} KB + data {data[0] / 1e6:6.2f} MB (gz {data[1] / 1e6:5.2f}) | "
+          f"shell after a data change: {'unchanged' if same_shell else 'changed'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000])
+    parser.add_argument('--edges-per-node', type=int, default=2)
+    args = parser.parse_args()
+
+    print("Inline node/edge literals vs shell page + columnar data file")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes, args.edges_per_node)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark graph construction: repeated NetworkX copies vs typed views.
+
+A render used to build one nx.DiGraph with node attributes and then copy
+it into real, sizing and undirected variants, six graphs in total. The
+typed graph stores edges once in CSR arrays and every variant is a view.
+This measures build time and peak traced memory for the work a render
+does: degrees of the real undirected graph and sizing degree centrality.
+
+Usage:
+    python benchmarks/bench_graph_views.py
+    python benchmarks/bench_graph_views.py --sizes 10000 100000 --edges-per-node 3
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import networkx as nx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.graph import (
+    HYPOTHETICAL_RELATIONSHIP, NON_SIZING_RELATIONSHIP, build_graph, real_graph, sizing_graph,
+)
+
+from bench_tooltips import synthetic_network
+
+
+def copies_path(network):
+    """The previous approach: an attributed DiGraph plus filtered copies."""
+    G = nx.DiGraph()
+    for node, record in network.records.items():
+        G.add_node(node, **record)
+    for row in network.edges.itertuples(index=False):
+        G.add_edge(row.source, row.target, relationship_type=row.relationship_type)
+
+    def without(graph, excluded):
+        H = nx.DiGraph()
+        H.add_nodes_from(graph.nodes(data=True))
+        H.add_edges_from((s, t, d) for s, t, d in graph.edges(data=True)
+                         if d['relationship_type'] not in excluded)
+        return H
+
+    G_real = without(G, {HYPOTHETICAL_RELATIONSHIP})
+    G_sizing = without(G, {HYPOTHETICAL_RELATIONSHIP, NON_SIZING_RELATIONSHIP})
+    degrees = dict(G_real.to_undirected().degree())
+    centrality = nx.degree_centrality(G_sizing.to_undirected())
+    _ = G.to_undirected().number_of_edges()
+    return degrees, centrality
+
+
+def views_path(network):
+    G = build_graph(network)
+    degrees = real_graph(G).to_undirected().degree()
+    centrality = sizing_graph(G).to_undirected().degree_centrality()
+    _ = G.to_undirected().number_of_edges()
+    return degrees, centrality
+
+
+def measure(func, network):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(network)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def bench(n_nodes, edges_per_node):
+    network = synthetic_network(n_nodes, edges_per_node)
+    old, old_time, old_mem = measure(copies_path, network)
+    new, new_time, new_mem = measure(views_path, network)
+    assert old == new, "typed views disagree with the NetworkX copies"
+    print(f"{n_nodes:>8,d} nodes, {len(network.edges):>8,d} edges | "
+          f"copies: {old_time:6.2f}s {old_mem:7.1f} MB | "
+          f"views: {new_time:6.2f}s {new_mem:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--edges-per-node', type=int, default=2)
+    args = parser.parse_args()
+
+    print("Graph build time and peak traced memory")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes, args.edges_per_node)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
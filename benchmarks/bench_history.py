@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the append-only sync history on synthetic networks.
+
+Simulates daily syncs of a synthetic network in which a small share of
+nodes is edited or added each day, and records each one with
+pedp_network_map.history.record_sync(). Reports the log size against
+keeping a full copy of nodes.csv and edges.csv per day, the time to
+rebuild the network at a past date, and the time to compute a daily
+time-lapse over the whole history.
+
+Usage:
+    python benchmarks/bench_history.py
+    python benchmarks/bench_history.py --sizes 1000 10000 --days 365 --churn 0.01
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.history import load_history, record_sync
+
+from synthetic_network import synthetic_tables
+
+START = pd.Timestamp('2026-01-01', tz='UTC')
+
+
+def daily_tables(n_nodes, days, churn, seed=0):
+    """Yield (day, nodes_df, edges_df): each day renames `churn` of the nodes and adds as many."""
+    rng = np.random.default_rng(seed)
+    tables = synthetic_tables(n_nodes, seed=seed)
+    nodes_df, edges_df = tables['nodes'], tables['edges']
+    per_day = max(1, int(n_nodes * churn))
+    for day in range(days):
+        yield START + pd.Timedelta(days=day), nodes_df, edges_df
+        nodes_df = nodes_df.copy()
+        edited = rng.choice(len(nodes_df), per_day, replace=False)
+        nodes_df.loc[nodes_df.index[edited], 'description'] = f'Updated on day {day + 1}'
+        added = nodes_df.sample(per_day, random_state=day).assign(
+            id=[f'N{day}-{i}' for i in range(per_day)])
+        nodes_df = pd.concat([nodes_df, added], ignore_index=True)
+
+
+def bench(n_nodes, days, churn):
+    with tempfile.TemporaryDirectory() as tmp:
+        history_dir = Path(tmp)
+        record_time = copy_bytes = 0
+        for day, nodes_df, edges_df in daily_tables(n_nodes, days, churn):
+            copy_bytes += len(nodes_df.to_csv(index=False)) + len(edges_df.to_csv(index=False))
+            start = time.perf_counter()
+            record_sync(nodes_df, edges_df, history_dir, at=day)
+            record_time += time.perf_counter() - start
+        log_bytes = sum(path.stat().st_size for path in history_dir.iterdir())
+
+        start = time.perf_counter()
+        history = load_history(history_dir)
+        load_time = time.perf_counter() - start
+
+        middle = START + pd.Timedelta(days=days // 2, hours=12)
+        start = time.perf_counter()
+        nodes_df, _ = history.snapshot(middle)
+        snapshot_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        frame = history.timelapse(pd.date_range(START, periods=days, freq='D'))
+        timelapse_time = time.perf_counter() - start
+        assert frame['nodes'].iloc[days // 2] == len(nodes_df)
+
+    print(f"{n_nodes:>8,d} nodes x {days} days | log {log_bytes / 1e6:7.2f} MB "
+          f"(daily copies {copy_bytes / 1e6:8.1f} MB) | record {record_time / days * 1000:7.1f} ms/sync | "
+          f"load {load_time * 1000:7.1f} ms | snapshot {snapshot_time * 1000:6.2f} ms | "
+          f"time-lapse {timelapse_time * 1000:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000])
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--churn', type=float, default=0.01,
+                        help='share of nodes edited and added per day (default: 0.01)')
+    args = parser.parse_args()
+
+    print("Append-only history: storage, point-in-time rebuild and time-lapse")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes, args.days, args.churn)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-node lookups: boolean-mask scans vs the id-indexed node store.
+
+The renderers used to run `nodes_df[nodes_df['id'] == node].iloc[0]` once
+per node, which is O(N) per lookup and O(N²) per render. The node store
+from `pedp_network_map.data` is built once and then answers each lookup
+with a dict access.
+
+Mask scans at 100k nodes would take minutes, so only `--sample` lookups
+are timed and the full-render cost is extrapolated from them.
+
+Usage:
+    python benchmarks/bench_node_store.py
+    python benchmarks/bench_node_store.py --sizes 10000 100000 --sample 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.data import build_network_data
+
+CATEGORIES = ['Funder', 'Data Coordination/Standards', 'Data Preservation/Archiving',
+              'Data Collection/Monitoring', 'Capacity Building/Support']
+COLORS = pd.DataFrame({'name': ['red', 'green', 'blue', 'orange', 'teal'],
+                       'hex': ['#e74c3c', '#2ecc71', '#3498db', '#f39c12', '#1abc9c']})
+
+
+def synthetic_frames(n_nodes, seed=0):
+    """Build node and position tables with `n_nodes` rows in the project schema."""
+    rng = np.random.default_rng(seed)
+    ids = np.array([f'N{i:06d}' for i in range(n_nodes)])
+    nodes_df = pd.DataFrame({
+        'id': ids,
+        'name': [f'Organization {i}' for i in range(n_nodes)],
+        'organization': '',
+        'contact': '',
+        'description': '',
+        'status': 'Established',
+        'website': '',
+        'category': rng.choice(CATEGORIES, n_nodes),
+        'timeline': 'Established/Long-running',
+        'color': rng.choice(COLORS['name'], n_nodes),
+    })
+    positions_df = pd.DataFrame({
+        'id': ids,
+        'x': rng.integers(-600, 600, n_nodes),
+        'y': rng.integers(-400, 400, n_nodes),
+        'fixed': False,
+    })
+    return nodes_df, positions_df
+
+
+def bench(n_nodes, sample):
+    nodes_df, positions_df = synthetic_frames(n_nodes)
+    nodes_df['hex_color'] = nodes_df['color'].map(dict(zip(COLORS['name'], COLORS['hex'])))
+    ids = nodes_df['id'].tolist()
+    sample_ids = ids[:: max(1, n_nodes // sample)][:sample]
+
+    # Old path: one boolean-mask scan per node
+    start = time.perf_counter()
+    for node in sample_ids:
+        node_data = nodes_df[nodes_df['id'] == node].iloc[0]
+        _ = node_data['name'], node_data['category'], node_data['hex_color']
+    mask_per_lookup = (time.perf_counter() - start) / len(sample_ids)
+
+    # New path: build the store once, then look up every node
+    start = time.perf_counter()
+    network = build_network_data(nodes_df.drop(columns='hex_color'),
+                                 pd.DataFrame(columns=['source', 'target', 'relationship_type']),
+                                 positions_df, COLORS)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for node in ids:
+        node_data = network.node(node)
+        _ = node_data['name'], node_data['category'], node_data['hex_color']
+        _ = network.positions[node]
+    lookup_time = time.perf_counter() - start
+
+    mask_total = mask_per_lookup * n_nodes
+    store_total = build_time + lookup_time
+    print(f"{n_nodes:>8,d} nodes | mask scan: {mask_total:9.2f}s "
+          f"(extrapolated from {len(sample_ids)} lookups) | "
+          f"store: {store_total:6.3f}s (build {build_time:.3f}s + lookups {lookup_time:.3f}s) | "
+          f"speedup ×{mask_total / store_total:,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--sample', type=int, default=1000,
+                        help='mask-scan lookups to time per size (default: 1000)')
+    args = parser.parse_args()
+
+    print("Per-render node lookup cost (all nodes)")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes, args.sample)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
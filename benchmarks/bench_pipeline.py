@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark every pipeline stage on synthetic networks of increasing size.
+
+For each size, a synthetic dataset in the project's schema
+(synthetic_network.py) is written to a temporary project directory, and
+each stage is run in order on it:
+
+    load_csv, load_artifact, graph_build, centrality, positions,
+    hypothetical, tooltips, html_write, watermark
+
+Each stage is timed once, then run again under tracemalloc for its peak
+Python/NumPy allocation (--no-memory skips the second run). Results are
+printed and written as JSON to --report.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 --report outputs/bench.json
+    python benchmarks/bench_pipeline.py --sizes 100000 --layout-iterations 50 --no-memory
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.artifact import write_artifact
+from pedp_network_map.centrality import centrality_table
+from pedp_network_map.data import current_network, read_frames
+from pedp_network_map.graph import build_graph
+from pedp_network_map.layout import DEFAULT_ITERATIONS, calculate_positions
+from pedp_network_map.overlays import HYPOTHETICAL_OVERLAYS, patch_file
+from pedp_network_map.render import node_tooltips, render_network
+
+from synthetic_network import write_dataset
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_REPORT = PROJECT_DIR / 'outputs' / 'benchmark_report.json'
+HYPOTHETICAL_SCRIPT = PROJECT_DIR / 'scripts' / 'generate_hypothetical_network.py'
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@contextlib.contextmanager
+def command_line(argv):
+    previous = sys.argv
+    sys.argv = argv
+    try:
+        yield
+    finally:
+        sys.argv = previous
+
+
+def stages(root, args):
+    """(name, function) pairs; each function takes and returns the shared state dict."""
+    data_dir = root / 'data' / 'processed'
+    page = root / 'outputs' / 'network_map.html'
+
+    def load_csv(state):
+        state['frames'] = read_frames(data_dir)
+
+    def load_artifact(state):
+        state['frames'] = read_frames(data_dir)
+
+    def graph_build(state):
+        state['network'] = current_network(state['frames'])
+        state['G'] = build_graph(state['network'])
+
+    def centrality(state):
+        centrality_table(state['G'], state['network'], samples=args.betweenness_samples,
+                         workers=args.workers)
+
+    def positions(state):
+        calculate_positions(state['frames']['nodes'], state['frames']['edges'],
+                            iterations=args.layout_iterations)
+
+    def hypothetical(state):
+        # The script works on ./data/processed and prints its progress
+        script = runpy.run_path(str(HYPOTHETICAL_SCRIPT))
+        with working_directory(root), contextlib.redirect_stdout(io.StringIO()), \
+                command_line([str(HYPOTHETICAL_SCRIPT)]):
+            script['main']()
+
+    def tooltips(state):
+        node_tooltips(state['G'], state['network'])
+
+    def html_write(state):
+        # PyVis copies its lib/ folder into the working directory
+        with working_directory(root):
+            render_network(state['G'], state['network'], page)
+        state['html_bytes'] = page.stat().st_size
+
+    def watermark(state):
+        target = page.with_name('network_map_watermarked.html')
+        shutil.copyfile(page, target)
+        patch_file(target, HYPOTHETICAL_OVERLAYS)
+
+    return [
+        ('load_csv', load_csv),
+        ('load_artifact', load_artifact),
+        ('graph_build', graph_build),
+        ('centrality', centrality),
+        ('positions', positions),
+        ('hypothetical', hypothetical),
+        ('tooltips', tooltips),
+        ('html_write', html_write),
+        ('watermark', watermark),
+    ]
+
+
+def run_size(n_nodes, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        tables = write_dataset(root / 'data' / 'processed', n_nodes, seed=args.seed)
+        (root / 'outputs').mkdir()
+        state = {}
+        results = []
+        for name, stage in stages(root, args):
+            if name == 'load_artifact':
+                write_artifact(root / 'data' / 'processed')
+
+            start_cpu = time.process_time()
+            start = time.perf_counter()
+            stage(state)
+            seconds = time.perf_counter() - start
+            cpu_seconds = time.process_time() - start_cpu
+
+            peak = None
+            if args.memory:
+                tracemalloc.start()
+                stage(state)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            results.append({
+                'stage': name,
+                'seconds': round(seconds, 4),
+                'cpu_seconds': round(cpu_seconds, 4),
+                'peak_mb': None if peak is None else round(peak / 2**20, 2),
+            })
+            memory = '' if peak is None else f" {peak / 2**20:9.1f} MB"
+            print(f"  {name:<14s} {seconds:9.3f}s{memory}")
+
+        nodes, edges = tables['nodes'], tables['edges']
+        linked = set(edges['source']) | set(edges['target'])
+        return {
+            'nodes': len(nodes),
+            'edges': len(edges),
+            'isolated_nodes': int((~nodes['id'].isin(linked)).sum()),
+            'html_bytes': state.get('html_bytes'),
+            'stages': results,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--report', type=Path, default=DEFAULT_REPORT,
+                        help='JSON report path (default: outputs/benchmark_report.json)')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip the tracemalloc run of each stage')
+    parser.add_argument('--layout-iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--betweenness-samples', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {
+            'layout_iterations': args.layout_iterations,
+            'betweenness_samples': args.betweenness_samples,
+            'workers': args.workers,
+            'seed': args.seed,
+            'memory': args.memory,
+        },
+        'sizes': [],
+    }
+    print("Pipeline stages on synthetic networks (wall time, tracemalloc peak)")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        print(f"{n_nodes:,d} nodes")
+        report['sizes'].append(run_size(n_nodes, args))
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+    print(f"\n✓ Report saved to: {args.report}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark hypothetical-scenario generation on synthetic networks.
+
+generate_hypothetical_network.py used to build a networkx graph edge by
+edge and look every isolated node up with `nodes_df[nodes_df['id'] ==
+node_id]`. It now analyses the base network once with one bincount
+(pedp_network_map.scenarios.BaseNetwork) and derives each scenario from
+array masks. This times the old loop against the vectorized analysis,
+then a batch of scenarios generated from that one analysis.
+
+Usage:
+    python benchmarks/bench_scenarios.py
+    python benchmarks/bench_scenarios.py --sizes 1000 100000 --scenarios 50
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import networkx as nx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.scenarios import CORE, BaseNetwork, Hub, ScenarioSpec, generate_scenario
+
+from synthetic_network import CATEGORIES, synthetic_tables
+
+
+def loop_isolated(nodes_df, edges_df):
+    """The old per-node isolation and category split."""
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes_df['id'])
+    for _, edge in edges_df.iterrows():
+        G.add_edge(edge['source'], edge['target'])
+    G_undirected = G.to_undirected()
+    funders, others = [], []
+    for node_id in (node for node in G.nodes() if G_undirected.degree(node) == 0):
+        if nodes_df[nodes_df['id'] == node_id].iloc[0]['category'] == 'Funder':
+            funders.append(node_id)
+        else:
+            others.append(node_id)
+    return funders, others
+
+
+def scenario_specs(count):
+    """`count` specs with 1 to len(CATEGORIES) hubs, one category per hub plus a catch-all."""
+    categories = [name for name, _, _ in CATEGORIES]
+    specs = []
+    for i in range(count):
+        n_hubs = 1 + i % len(categories)
+        hubs = [Hub(f'HYP-S{i}-{j}', f'Hub {j}', categories[j], 'red', attach=(categories[j],),
+                    flow='in' if categories[j] == 'Funder' else 'out')
+                for j in range(n_hubs - 1)]
+        hubs.append(Hub(f'HYP-S{i}-REST', 'Catch-all hub', 'Data Coordination/Standards', 'red'))
+        specs.append(ScenarioSpec(f'scenario-{i}', tuple(hubs), CORE))
+    return specs
+
+
+def bench(n_nodes, n_scenarios, loop_limit):
+    tables = synthetic_tables(n_nodes)
+    nodes_df, edges_df = tables['nodes'], tables['edges']
+
+    start = time.perf_counter()
+    base = BaseNetwork(nodes_df, edges_df)
+    analyse_time = time.perf_counter() - start
+
+    specs = scenario_specs(n_scenarios)
+    start = time.perf_counter()
+    scenarios = [generate_scenario(base, spec) for spec in specs]
+    batch_time = time.perf_counter() - start
+    edges = sum(len(scenario.edges) for scenario in scenarios)
+
+    line = (f"{n_nodes:>8,d} nodes | analyse {analyse_time * 1000:8.1f} ms | "
+            f"{n_scenarios} scenarios {batch_time:6.2f}s ({edges:,} edges)")
+    if n_nodes <= loop_limit:
+        start = time.perf_counter()
+        funders, others = loop_isolated(nodes_df, edges_df)
+        loop_time = time.perf_counter() - start
+        assert len(funders) + len(others) == int(base.isolated.sum())
+        line += f" | old loop {loop_time:8.2f}s"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--scenarios', type=int, default=20)
+    parser.add_argument('--loop-limit', type=int, default=10_000,
+                        help='skip the old loop above this many nodes (default: 10000)')
+    args = parser.parse_args()
+
+    print("Isolation analysis and batch scenario generation")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes, args.scenarios, args.loop_limit)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the map's precomputed search index on synthetic networks.
+
+Without an index, a search box has to scan every node's text for each
+keystroke. pedp_network_map.search builds a sorted token list with
+postings at build time, so a query is a binary search per word plus the
+matching posting lists. This times the index build, reports the size of
+the `.search.js` sidecar, and compares the indexed prefix lookup (the
+same steps the page runs) with a scan over the four searched fields.
+
+Usage:
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --sizes 10000 100000 --queries 500
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.search import (
+    MAX_DESCRIPTION_WORDS, SEARCH_FIELDS, STOP_WORDS, search_index, search_words,
+)
+
+from bench_tooltips import synthetic_network
+
+
+def indexed_query(index, query):
+    """Nodes whose words start with every query word (the page's prefix path)."""
+    tokens = index['tokens']
+    matches = None
+    for word in search_words([query])[0]:
+        if not word:
+            continue
+        nodes = set()
+        start = bisect.bisect_left(tokens, word)
+        for t in range(start, len(tokens)):
+            if not tokens[t].startswith(word):
+                break
+            nodes.update(posting >> 2 for posting in itertools.accumulate(index['postings'][t]))
+        matches = nodes if matches is None else matches & nodes
+    return matches or set()
+
+
+def field_words(value, column):
+    """The words of one field the index holds (descriptions are capped)."""
+    words = [word for word in search_words([value])[0] if word and word not in STOP_WORDS]
+    return words[:MAX_DESCRIPTION_WORDS] if column == 'description' else words
+
+
+def scan_query(texts, query):
+    """Nodes whose words start with every query word, by scanning each node's text."""
+    query_words = [word for word in search_words([query])[0] if word]
+    return {i for i, words in enumerate(texts)
+            if all(any(w.startswith(q) for w in words) for q in query_words)}
+
+
+def bench(n_nodes, n_queries, seed=0):
+    network = synthetic_network(n_nodes, 2)
+    node_ids = list(network.records)
+
+    start = time.perf_counter()
+    index = search_index(network, node_ids)
+    build_time = time.perf_counter() - start
+    size = len(json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+    rng = np.random.default_rng(seed)
+    names = [network.node(node)['name'] for node in node_ids]
+    queries = [name.split()[0][:rng.integers(2, 6)] for name in rng.choice(names, n_queries)]
+    texts = [[w for column in SEARCH_FIELDS for w in field_words(network.node(node).get(column), column)]
+             + search_words([node])[0] for node in node_ids]
+
+    start = time.perf_counter()
+    indexed = [indexed_query(index, query) for query in queries]
+    indexed_time = (time.perf_counter() - start) / n_queries
+    start = time.perf_counter()
+    scanned = [scan_query(texts, query) for query in queries]
+    scan_time = (time.perf_counter() - start) / n_queries
+    assert indexed == scanned
+
+    print(f"{n_nodes:>8,d} nodes | build {build_time:6.2f}s | index {size / 1e6:6.2f} MB "
+          f"({len(index['tokens']):,} tokens) | query: indexed {indexed_time * 1000:7.2f} ms, "
+          f"scan {scan_time * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 50_000])
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    print("Search index build, size and per-query time")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes, args.queries)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark tooltip construction and page weight.
+
+The renderer used to walk `out_edges` and `in_edges` for every node, sort
+per node and inline every tooltip into the HTML. Tooltips are now grouped
+by (node, section) in one pass over the edge table and shipped in a
+`.tooltips.js` sidecar that the page loads on first hover.
+
+Usage:
+    python benchmarks/bench_tooltips.py
+    python benchmarks/bench_tooltips.py --sizes 1000 10000 --edges-per-node 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.data import build_network_data
+from pedp_network_map.graph import build_graph, real_graph
+from pedp_network_map.render import TOOLTIP_SECTIONS, node_tooltips, render_network
+
+from bench_node_store import COLORS, synthetic_frames
+
+RELATIONSHIPS = ['is a member of', 'funds', 'coordinates action with']
+
+
+def synthetic_network(n_nodes, edges_per_node, seed=0):
+    rng = np.random.default_rng(seed)
+    nodes_df, positions_df = synthetic_frames(n_nodes, seed)
+    n_edges = n_nodes * edges_per_node
+    edges_df = pd.DataFrame({
+        'source': nodes_df['id'].to_numpy()[rng.integers(0, n_nodes, n_edges)],
+        'target': nodes_df['id'].to_numpy()[rng.integers(0, n_nodes, n_edges)],
+        'relationship_type': rng.choice(RELATIONSHIPS, n_edges),
+    })
+    edges_df = edges_df[edges_df['source'] != edges_df['target']]
+    return build_network_data(nodes_df, edges_df, positions_df, COLORS)
+
+
+def per_node_tooltips(G, network):
+    """The previous per-node out_edges/in_edges walk (inline tooltips)."""
+    G_real = real_graph(G).to_networkx()
+    nx.set_node_attributes(G_real, {node: record['name'] for node, record in network.records.items()}, 'name')
+    G_real_undirected = G_real.to_undirected()
+    tooltips = {}
+    for node in G.nodes():
+        node_data = network.node(node)
+        lines = [node_data['name'], f"Category: {node_data['category']}", ""]
+        if G_real_undirected.degree(node) == 0:
+            lines.append("Actively working in this space")
+        else:
+            connections = {key: [] for key, _ in TOOLTIP_SECTIONS}
+            for _, target, data in G_real.out_edges(node, data=True):
+                rel_type, name = data['relationship_type'], G_real.nodes[target]['name']
+                if rel_type == "is a member of":
+                    connections['member_of'].append(name)
+                elif rel_type == "funds":
+                    connections['funds'].append(name)
+                elif rel_type == "coordinates action with":
+                    connections['coordinates'].append(name)
+            for source, _, data in G_real.in_edges(node, data=True):
+                rel_type, name = data['relationship_type'], G_real.nodes[source]['name']
+                if rel_type == "is a member of":
+                    connections['has_members'].append(name)
+                elif rel_type == "funds":
+                    connections['funded_by'].append(name)
+                elif rel_type == "coordinates action with":
+                    if name not in connections['coordinates']:
+                        connections['coordinates'].append(name)
+            for key, heading in TOOLTIP_SECTIONS:
+                if connections[key]:
+                    lines.append(heading)
+                    lines.extend(f"• {org}" for org in sorted(connections[key]))
+                    lines.append("")
+        tooltips[node] = "\n".join(lines).rstrip()
+    return tooltips
+
+
+def bench(n_nodes, edges_per_node):
+    network = synthetic_network(n_nodes, edges_per_node)
+    G = build_graph(network)
+
+    start = time.perf_counter()
+    per_node_tooltips(G, network)
+    old_time = time.perf_counter() - start
+    start = time.perf_counter()
+    node_tooltips(G, network)
+    new_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)   # pyvis copies its lib/ into the working directory
+        try:
+            inline = render_network(G, network, Path(tmp) / 'inline.html', lazy_tooltips=False,
+                                    data_file=False)
+            lazy = render_network(G, network, Path(tmp) / 'lazy.html', data_file=False)
+            inline_size = inline.stat().st_size
+            lazy_size = lazy.stat().st_size
+            sidecar_size = (Path(tmp) / 'lazy.tooltips.js').stat().st_size
+        finally:
+            os.chdir(cwd)
+
+    print(f"{n_nodes:>8,d} nodes, {G.number_of_edges():>8,d} edges | "
+          f"tooltips: per-node {old_time:6.3f}s, grouped {new_time:6.3f}s | "
+          f"page: inline {inline_size / 1e6:6.2f} MB, lazy {lazy_size / 1e6:6.2f} MB "
+          f"+ sidecar {sidecar_size / 1e6:.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000])
+    parser.add_argument('--edges-per-node', type=int, default=2)
+    args = parser.parse_args()
+
+    print("Tooltip build time and initial page weight")
+    print("-" * 60)
+    for n_nodes in args.sizes:
+        bench(n_nodes, args.edges_per_node)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
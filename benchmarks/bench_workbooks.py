@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark reading the attendance workbook: pd.read_excel per script vs the
+shared cached ingestion.
+
+Each funder/attendee script used to open the workbook with pd.read_excel
+and loop over it with iterrows(). They now share read_sheet(), which
+parses the workbook once in openpyxl read-only mode and caches the sheets
+by file hash, plus vectorized classification and id helpers. This writes a
+synthetic attendance workbook and times four script runs each way.
+
+Usage:
+    python benchmarks/bench_workbooks.py
+    python benchmarks/bench_workbooks.py --rows 1000 20000
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.workbooks import (
+    AFFILIATION_COLUMN, ATTENDANCE_SHEET, FUNDER_KEYWORDS, affiliations, is_funder, name_ids, read_sheet,
+)
+
+SCRIPT_RUNS = 4   # extract_funders, generate_funders_csv, extract_new_orgs, ...
+WORDS = ['Open', 'Data', 'Climate', 'Ocean', 'Earth', 'Foundation', 'University', 'Trust', 'Lab', 'Center']
+
+
+def write_workbook(path, rows, seed=0):
+    rng = random.Random(seed)
+    names = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + f' {i % (rows // 3 + 1)}'
+             for i in range(rows)]
+    pd.DataFrame({'Name': [f'Attendee {i}' for i in range(rows)], AFFILIATION_COLUMN: names}) \
+        .to_excel(path, sheet_name=ATTENDANCE_SHEET, index=False)
+
+
+def old_run(path):
+    df = pd.read_excel(path, sheet_name=ATTENDANCE_SHEET)
+    funders = []
+    for _, row in df.iterrows():
+        affiliation = str(row.get(AFFILIATION_COLUMN, '')).strip()
+        if affiliation in ('', 'nan'):
+            continue
+        if any(keyword in affiliation.lower() for keyword in FUNDER_KEYWORDS):
+            funders.append(''.join(re.sub(r'[^a-zA-Z]', '', word) for word in affiliation.split()[:2]))
+    return funders
+
+
+def new_run(path, cache_dir):
+    names = affiliations(read_sheet(path, ATTENDANCE_SHEET, cache_dir=cache_dir))
+    return name_ids(names[is_funder(names)], words=2).tolist()
+
+
+def bench(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'attendance.xlsx'
+        write_workbook(path, rows)
+
+        start = time.perf_counter()
+        old = [old_run(path) for _ in range(SCRIPT_RUNS)]
+        old_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = [new_run(path, Path(tmp) / 'cache') for _ in range(SCRIPT_RUNS)]
+        new_time = time.perf_counter() - start
+    assert old == new
+    print(f"{rows:>8,d} rows | read_excel + iterrows {old_time:7.2f}s | cached + vectorized {new_time:7.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 20_000])
+    args = parser.parse_args()
+
+    print(f"Time for {SCRIPT_RUNS} script runs over the same workbook")
+    print("-" * 60)
+    for rows in args.rows:
+        bench(rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
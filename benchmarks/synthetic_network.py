@@ -0,0 +1,140 @@
+"""
+Synthetic PEDP-style networks in the project's CSV schema.
+
+Shared by the benchmark suite. The tables follow data/processed:
+- nodes.csv: id, name, organization, contact, description, status,
+  website, category, timeline, color (colour names from colors.csv)
+- edges.csv: source, target, relationship_type
+- node_positions.csv: id, x, y, fixed
+- colors.csv: name, hex
+
+Proportions follow the real sheet: about half the nodes are funders, and
+roughly 60% of all nodes have no relationships yet. Isolated funders are
+the ones the hypothetical hubs connect. Among connected nodes, a few are
+PEDP members, funders fund non-funders, and the rest coordinate action
+with partners picked with a heavy-tailed preference. A PEDP node and a
+DataFoundation node always exist, because the hypothetical generator
+attaches its hubs to them.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLORS = pd.DataFrame({
+    'name': ['red', 'green', 'blue', 'orange', 'purple', 'teal'],
+    'hex': ['#e74c3c', '#2ecc71', '#3498db', '#f39c12', '#9b59b6', '#1abc9c'],
+})
+
+# (category, colour, share of nodes)
+CATEGORIES = [
+    ('Funder', 'teal', 0.46),
+    ('Data Coordination/Standards', 'red', 0.17),
+    ('Capacity Building/Support', 'red', 0.18),
+    ('Data Preservation/Archiving', 'blue', 0.09),
+    ('Government/Agency', 'red', 0.04),
+    ('Research/Academic', 'red', 0.04),
+    ('Advocacy/Community Focus', 'green', 0.01),
+    ('Communication/Access', 'purple', 0.01),
+]
+STATUSES = {
+    'Funder': ['4. Approved', '2. Proposal submitted', '1. In conversation', '0. On our radar',
+               '5. Not Active / Skipped'],
+    None: ['Established', 'Emerging', 'Recently Launched'],
+}
+ISOLATED_SHARE = 0.6
+MEMBER_SHARE = 0.05        # connected non-funders that are PEDP members
+EDGES_PER_CONNECTED = 1.7  # edges per connected node, all relationship types
+
+
+def synthetic_tables(n_nodes, seed=0):
+    """Return {'nodes', 'edges', 'positions', 'colors'} DataFrames for `n_nodes` nodes."""
+    rng = np.random.default_rng(seed)
+    n_nodes = max(n_nodes, 4)
+    ids = np.array(['PEDP', 'DataFoundation'] + [f'ORG{i:07d}' for i in range(n_nodes - 2)])
+
+    shares = np.array([share for _, _, share in CATEGORIES])
+    category_index = rng.choice(len(CATEGORIES), n_nodes, p=shares / shares.sum())
+    category_index[:2] = 1   # PEDP and DataFoundation coordinate standards
+    categories = np.array([name for name, _, _ in CATEGORIES])[category_index]
+    colors = np.array([color for _, color, _ in CATEGORIES])[category_index]
+    funder = categories == 'Funder'
+
+    names = np.array(['Public Environmental Data Partners', 'Data Foundation']
+                     + [f'Organization {i}' for i in range(n_nodes - 2)], dtype=object)
+    status = np.where(funder, rng.choice(STATUSES['Funder'], n_nodes), rng.choice(STATUSES[None], n_nodes))
+    nodes_df = pd.DataFrame({
+        'id': ids,
+        'name': names,
+        'organization': names,
+        'contact': '',
+        'description': 'Synthetic organization',
+        'status': status,
+        'website': '',
+        'category': categories,
+        'timeline': np.where(status == 'Emerging', 'Emerging/Planned', 'Established/Long-running'),
+        'color': colors,
+    })
+
+    # Connected nodes; the two core nodes always are
+    connected = rng.random(n_nodes) >= ISOLATED_SHARE
+    connected[:2] = True
+    connected_ids = np.flatnonzero(connected)
+    connected_funders = connected_ids[funder[connected_ids]]
+    connected_others = connected_ids[~funder[connected_ids]]
+
+    # Heavy-tailed popularity for coordination partners
+    weight = rng.pareto(1.5, len(connected_ids)) + 1
+    weight /= weight.sum()
+
+    members = connected_others[rng.random(len(connected_others)) < MEMBER_SHARE]
+    members = members[members != 0]
+    n_funds = len(connected_funders)
+    n_coordinates = max(int(EDGES_PER_CONNECTED * len(connected_ids)) - len(members) - n_funds, 0)
+
+    # Every connected node is the source of at least one edge
+    coordinate_sources = np.concatenate([
+        connected_others[~np.isin(connected_others, members)],
+        rng.choice(connected_ids, max(n_coordinates - len(connected_others), 0)),
+    ])
+    sources = np.concatenate([members, connected_funders, coordinate_sources])
+    targets = np.concatenate([
+        np.zeros(len(members), dtype=np.int64),
+        rng.choice(connected_others, n_funds) if len(connected_others) else connected_funders,
+        rng.choice(connected_ids, len(coordinate_sources), p=weight),
+    ])
+    relationship = np.concatenate([
+        np.full(len(members), 'is a member of', dtype=object),
+        np.full(n_funds, 'funds', dtype=object),
+        np.full(len(coordinate_sources), 'coordinates action with', dtype=object),
+    ])
+    # Self-loops become coordination with PEDP
+    targets = np.where(sources == targets, 0, targets)
+    keep = sources != targets
+    edges_df = pd.DataFrame({
+        'source': ids[sources[keep]],
+        'target': ids[targets[keep]],
+        'relationship_type': relationship[keep],
+    }).drop_duplicates(ignore_index=True)
+
+    radius = 300 + 40 * np.sqrt(n_nodes)
+    positions_df = pd.DataFrame({
+        'id': ids,
+        'x': rng.integers(-radius, radius, n_nodes),
+        'y': rng.integers(-radius, radius, n_nodes),
+        'fixed': False,
+    })
+    return {'nodes': nodes_df, 'edges': edges_df, 'positions': positions_df, 'colors': COLORS.copy()}
+
+
+def write_dataset(data_dir, n_nodes, seed=0):
+    """Write the synthetic tables as nodes/edges/node_positions/colors CSVs in `data_dir`."""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    tables = synthetic_tables(n_nodes, seed)
+    tables['nodes'].to_csv(data_dir / 'nodes.csv', index=False)
+    tables['edges'].to_csv(data_dir / 'edges.csv', index=False)
+    tables['positions'].to_csv(data_dir / 'node_positions.csv', index=False)
+    tables['colors'].to_csv(data_dir / 'colors.csv', index=False)
+    return tables
@@ -0,0 +1,29 @@
+"""
+PEDP Network Map library.
+
+Shared building blocks for the scripts, notebooks and build entry point:
+- data: loads the processed tables into id-indexed lookups
+- artifact: memory-mapped binary copy of the processed CSVs
+- graph: typed CSR graph with zero-copy real/sizing/undirected views
+- render: writes the interactive PyVis maps
+- graphdata: content-hashed columnar node/edge file the map pages load
+- search: prefix/trigram search index and search box for the maps
+- delta: the hypothetical scenario as a delta the current map toggles on and off
+- overlays: banner/watermark/legend blocks added to pages as they are written
+- clusters: category/community level-of-detail clustering for large maps
+- centrality: degree/betweenness/closeness table (sampled, parallel, cached)
+- workbooks: cached streaming Excel ingestion and vectorized funder/attendee helpers
+- matching: trigram-indexed fuzzy organization-name matching and duplicate detection
+- scenarios: vectorized hypothetical hub scenarios from declarative specs
+- batch: process-pool rendering of many scenario maps plus an index page
+- rules: declarative derived-edge rules (approved funders → funds PEDP)
+- sheets: concurrent Google Sheets fetch with change detection
+- history: append-only node/edge history with point-in-time rebuilds and time-lapse counts
+- layout: offline force-directed node positions
+- cli: the `pedp-build` entry point
+- pipeline: the `pedp-pipeline` stage runner (hash-based skipping, parallel stages)
+- publish: the `pedp-publish` site assembler (shared hashed assets, minified, precompressed)
+- profiling: per-stage wall/CPU time, peak memory and counts (JSON report, Chrome trace)
+"""
+
+__version__ = "0.1.0"
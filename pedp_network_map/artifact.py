@@ -0,0 +1,170 @@
+"""
+Compact binary copy of the processed CSVs.
+
+`write_artifact()` stores every table of data/processed in one
+`network.arrays/` directory:
+- id columns (id, source, target) as int32 codes into one shared id list
+- other text columns as int32 codes into a per-column list of values
+- numeric and boolean columns as plain .npy arrays
+
+Code and numeric arrays are memory-mapped on load and no text is parsed.
+Only numeric and boolean columns stay zero-copy, though: id and text
+columns are rebuilt with one vectorized take per column into pandas
+object/string arrays, so they cost memory and time in proportion to the
+rows on every load.
+
+The CSVs stay the human-editable source. The manifest records each CSV's
+size, modification time and SHA-256. A CSV whose size and mtime both match
+is taken as unchanged without being read, so the check costs a stat() per
+table; only when the mtime moved is the file hashed. If any CSV changed,
+the artifact is stale and `read_frames()` parses the CSVs instead.
+Touching or copying a CSV without changing it keeps the artifact in use.
+"""
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ARTIFACT_DIR = 'network.arrays'
+ARTIFACT_VERSION = 3
+
+# read_frames() key -> CSV in data/processed
+CSV_FILES = {
+    'nodes': 'nodes.csv',
+    'edges': 'edges.csv',
+    'positions': 'node_positions.csv',
+    'colors': 'colors.csv',
+    'nodes_hypothetical': 'nodes_hypothetical.csv',
+    'edges_hypothetical': 'edges_hypothetical.csv',
+    'positions_hypothetical': 'node_positions_hypothetical.csv',
+}
+ID_COLUMNS = ('id', 'source', 'target')
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def _source(path):
+    """Size, mtime and SHA-256 of a CSV, as stored in the manifest."""
+    stat = Path(path).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': _digest(path)}
+
+
+def _source_changed(path, source):
+    """Whether the CSV at `path` differs from its manifest `source` entry."""
+    stat = path.stat()
+    if stat.st_size != source['size']:
+        return True
+    if stat.st_mtime_ns == source['mtime_ns']:
+        return False
+    return _digest(path) != source['sha256']
+
+
+def _lookup(values):
+    """Object array of `values` with a trailing NaN, so code -1 decodes to NaN."""
+    lookup = np.empty(len(values) + 1, dtype=object)
+    lookup[:-1] = values
+    lookup[-1] = np.nan
+    return lookup
+
+
+def write_artifact(data_dir):
+    """
+    Encode every CSV present in `data_dir` into `data_dir`/network.arrays.
+
+    The new directory is written next to the old one and swapped in at
+    the end, so readers never see a half-written artifact.
+    """
+    data_dir = Path(data_dir)
+    frames = {name: pd.read_csv(data_dir / csv) for name, csv in CSV_FILES.items()
+              if (data_dir / csv).exists()}
+    id_values = [frame[column] for frame in frames.values() for column in ID_COLUMNS if column in frame]
+    ids = pd.Index(pd.unique(pd.concat(id_values, ignore_index=True).dropna()) if id_values else [])
+
+    target = data_dir / ARTIFACT_DIR
+    tmp = data_dir / (ARTIFACT_DIR + '.tmp')
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+
+    strings = {'ids': ids.tolist()}
+    tables = {}
+    for name, frame in frames.items():
+        columns = []
+        for i, column in enumerate(frame.columns):
+            series = frame[column]
+            file_name = f'{name}.{i}.npy'
+            if column in ID_COLUMNS:
+                kind, array = 'id', ids.get_indexer(series).astype(np.int32)
+            elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                kind, array = 'array', series.to_numpy()
+            else:
+                codes, uniques = pd.factorize(series)
+                kind, array = 'text', codes.astype(np.int32)
+                strings[f'{name}.{i}'] = uniques.tolist()
+            np.save(tmp / file_name, array)
+            columns.append({'name': column, 'kind': kind, 'file': file_name, 'dtype': str(series.dtype)})
+        tables[name] = {
+            'csv': CSV_FILES[name],
+            'rows': len(frame),
+            'columns': columns,
+            'source': _source(data_dir / CSV_FILES[name]),
+        }
+
+    (tmp / 'strings.json').write_text(json.dumps(strings, ensure_ascii=False), encoding='utf-8')
+    manifest = {'version': ARTIFACT_VERSION, 'tables': tables}
+    (tmp / 'manifest.json').write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    shutil.rmtree(target, ignore_errors=True)
+    tmp.rename(target)
+    return target
+
+
+def artifact_status(data_dir, tables=None):
+    """'fresh', 'stale' (a CSV changed or a table is missing) or 'missing'."""
+    data_dir = Path(data_dir)
+    try:
+        manifest = json.loads((data_dir / ARTIFACT_DIR / 'manifest.json').read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return 'missing'
+    if manifest.get('version') != ARTIFACT_VERSION:
+        return 'stale'
+    for name in tables or manifest['tables']:
+        entry = manifest['tables'].get(name)
+        csv = data_dir / CSV_FILES[name]
+        if entry is None or not csv.exists() or _source_changed(csv, entry['source']):
+            return 'stale'
+    return 'fresh'
+
+
+def load_artifact(data_dir, tables=None):
+    """
+    Return {name: DataFrame} for `tables` (default: all) from the artifact,
+    or None when it is missing or stale.
+
+    Frames match what pd.read_csv returns for the same CSVs.
+    """
+    if artifact_status(data_dir, tables) != 'fresh':
+        return None
+    root = Path(data_dir) / ARTIFACT_DIR
+    manifest = json.loads((root / 'manifest.json').read_text(encoding='utf-8'))
+    strings = json.loads((root / 'strings.json').read_text(encoding='utf-8'))
+    ids = _lookup(strings['ids'])
+
+    frames = {}
+    for name in tables or manifest['tables']:
+        data = {}
+        for i, column in enumerate(manifest['tables'][name]['columns']):
+            # (asarray drops the memmap subclass but keeps the mapping)
+            array = np.asarray(np.load(root / column['file'], mmap_mode='r'))
+            if column['kind'] == 'array':
+                data[column['name']] = pd.Series(array, dtype=column['dtype'], copy=False)
+            else:
+                values = ids if column['kind'] == 'id' else _lookup(strings[f'{name}.{i}'])
+                data[column['name']] = pd.Series(values[array], dtype=column['dtype'])
+        frames[name] = pd.DataFrame(data, copy=False)
+    return frames
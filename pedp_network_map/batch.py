@@ -0,0 +1,137 @@
+"""
+Render many hypothetical scenarios as maps, on a process pool.
+
+The current network is loaded and indexed once. Each worker receives it
+once, through the pool initializer (under fork it is inherited
+copy-on-write), so memory grows with the number of workers and not the
+number of scenarios. A task only carries one scenario's small hub tables;
+the worker extends the shared base with them (data.extend_network),
+renders the page and returns a summary. An index page links all the maps.
+"""
+
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .data import extend_network
+from .graph import build_graph
+from .overlays import HYPOTHETICAL_OVERLAYS
+from .render import HYPOTHETICAL_BACKGROUND, render_network
+
+INDEX_TITLE = "PEDP Network - Hypothetical Scenarios"
+INDEX_FILENAME = 'index.html'
+# Slugs whose page would overwrite another file in the output directory
+RESERVED_SLUGS = {Path(INDEX_FILENAME).stem}
+
+
+@dataclass
+class ScenarioPage:
+    """One rendered scenario map."""
+
+    name: str
+    filename: str
+    nodes: int
+    edges: int
+    added_nodes: int
+    added_edges: int
+    hubs: list = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def slugify(name):
+    """File-name-safe version of a scenario name; reserved slugs get a '-scenario' suffix."""
+    slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'scenario'
+    return f'{slug}-scenario' if slug in RESERVED_SLUGS else slug
+
+
+_SHARED = None
+
+
+def _init_worker(base, output_dir, render_options):
+    global _SHARED
+    _SHARED = (base, output_dir, render_options)
+
+
+def _render_scenario(task):
+    name, filename, nodes_df, edges_df, positions_df = task
+    base, output_dir, render_options = _SHARED
+    start = time.perf_counter()
+    network = extend_network(base, nodes_df, edges_df, positions_df)
+    G = build_graph(network)
+    render_network(G, network, Path(output_dir) / filename, background=HYPOTHETICAL_BACKGROUND,
+                   overlays=HYPOTHETICAL_OVERLAYS, **render_options)
+    return ScenarioPage(name, filename, len(network.nodes), len(network.edges),
+                        network.added_nodes, network.added_edges,
+                        hubs=nodes_df['name'].tolist(), seconds=time.perf_counter() - start)
+
+
+def render_scenarios(base, scenarios, output_dir, workers=None, **render_options):
+    """
+    Render every Scenario in `scenarios` on top of the current network `base`.
+
+    Pages go to `output_dir`/<slug>.html; `render_options` are passed to
+    render_network(). Uses a process pool when workers > 1 (default: CPU
+    count). Returns the ScenarioPages in input order.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    filenames, tasks = set(), []
+    for scenario in scenarios:
+        filename = f'{slugify(scenario.name)}.html'
+        if filename in filenames:
+            raise ValueError(f"Scenario names collide as {filename!r}")
+        filenames.add(filename)
+        tasks.append((scenario.name, filename, scenario.nodes, scenario.edges, scenario.positions))
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(base, output_dir, render_options)) as pool:
+            return list(pool.map(_render_scenario, tasks))
+    _init_worker(base, output_dir, render_options)
+    return [_render_scenario(task) for task in tasks]
+
+
+def write_index(pages, output_dir, title=INDEX_TITLE):
+    """Write `output_dir`/INDEX_FILENAME linking every ScenarioPage; returns its path."""
+    rows = ''.join(
+        f"""
+        <tr>
+          <td><a href="{html.escape(page.filename)}">{html.escape(page.name)}</a></td>
+          <td>{html.escape(', '.join(page.hubs))}</td>
+          <td>{page.nodes} (+{page.added_nodes})</td>
+          <td>{page.edges} (+{page.added_edges})</td>
+        </tr>"""
+        for page in pages
+    )
+    index_path = Path(output_dir) / INDEX_FILENAME
+    index_path.write_text(f"""<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title>{html.escape(title)}</title>
+  <style>
+    body {{ font-family: Arial, sans-serif; margin: 40px; color: #333333; background: #f8f8f8; }}
+    table {{ border-collapse: collapse; background: #ffffff; }}
+    th, td {{ border: 1px solid #dddddd; padding: 8px 12px; text-align: left; }}
+    th {{ background: #eeeeee; }}
+  </style>
+</head>
+<body>
+  <h1>{html.escape(title)}</h1>
+  <p>⚠️ Every map below shows a potential future state, not current relationships.</p>
+  <table>
+    <thead>
+      <tr><th>Scenario</th><th>Hypothetical hubs</th><th>Nodes</th><th>Edges</th></tr>
+    </thead>
+    <tbody>{rows}
+    </tbody>
+  </table>
+</body>
+</html>
+""", encoding='utf-8')
+    return index_path
@@ -0,0 +1,317 @@
+"""
+Centrality metrics table for the network summary.
+
+Statistics are computed on the real (non-hypothetical) undirected graph;
+`Meaningful_Connections` uses the sizing edges that drive node size.
+
+Betweenness and closeness use Brandes' algorithm: one breadth-first search
+per source over the graph's CSR adjacency, run level by level in NumPy.
+Small graphs use every node as a source and agree with NetworkX up to
+rounding. Large graphs use a k-sample estimate instead. Sources are drawn
+per connected component in proportion to its size, and every node gets an
+error bound on its betweenness.
+
+Source batches can run on a process pool. Results can be cached on disk,
+keyed by a hash of the topology and the sampling settings.
+"""
+
+import hashlib
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .data import PROJECT_DIR
+from .graph import is_hypothetical, real_graph, sizing_graph
+
+CACHE_DIR = PROJECT_DIR / 'data' / 'cache' / 'centrality'
+CACHE_VERSION = 1          # bump when the algorithm or the estimator changes
+
+EXACT_NODE_LIMIT = 5000    # samples=None: exact up to this many nodes...
+DEFAULT_SAMPLES = 1000     # ...and this many sampled sources above it
+CONFIDENCE = 0.95          # per-node confidence of the betweenness error bound
+SOURCE_BATCH = 64          # sources per worker task
+
+
+@dataclass
+class PathCentrality:
+    """Betweenness and closeness per node, aligned with the graph's node order."""
+
+    betweenness: np.ndarray
+    closeness: np.ndarray
+    error: np.ndarray            # betweenness error bound, 0 where exact
+    sources: int                 # breadth-first searches run
+    exact: bool
+    cached: bool = False
+
+
+def connected_components(indptr, indices):
+    """Component label (its smallest node index) for every node."""
+    n = len(indptr) - 1
+    src = np.repeat(np.arange(n), np.diff(indptr))
+    labels = np.arange(n)
+    while True:
+        new = labels.copy()
+        np.minimum.at(new, src, labels[indices])
+        new = new[new]   # pointer jumping: follow labels to their own label
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def sample_sources(labels, samples=None, seed=0):
+    """
+    Choose breadth-first sources per component.
+
+    With samples=None every node is a source. Otherwise each component of
+    two or more nodes gets max(2, ceil(samples * size / n)) random sources,
+    capped at its size. Isolated nodes never need a search.
+
+    Returns (sources, quota, comp, size): sorted source indices, the source
+    count and size per component, and the component of every node.
+    """
+    n = len(labels)
+    _, comp, size = np.unique(labels, return_inverse=True, return_counts=True)
+    if samples is None or samples >= n:
+        quota = np.where(size > 1, size, 0)
+    else:
+        quota = np.ceil(samples * size / n).astype(np.int64)
+        quota = np.where(size > 1, np.minimum(size, np.maximum(2, quota)), 0)
+
+    # Rank nodes randomly within their component and keep the first `quota`
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(n), comp))
+    starts = np.cumsum(size) - size
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n) - starts[comp[order]]
+    return np.flatnonzero(rank < quota[comp]), quota, comp, size
+
+
+def _shortest_path_dag(indptr, indices, s, dist, sigma):
+    """
+    Level-synchronous BFS from s that fills `dist` and `sigma` (path counts).
+
+    Returns the DAG edges of every level as (parents, children, level nodes,
+    child → level node index) and all reached nodes with s first.
+    """
+    dist[s] = 0
+    sigma[s] = 1.0
+    frontier = np.array([s])
+    levels, reached = [], [frontier]
+    depth = 0
+    while True:
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = counts.sum()
+        if total == 0:
+            break
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        parents = np.repeat(frontier, counts)
+        children = indices[offsets]
+        # Every unvisited neighbour of this level is on the next one
+        unseen = dist[children] < 0
+        parents, children = parents[unseen], children[unseen]
+        if not len(children):
+            break
+        depth += 1
+        frontier, inverse = np.unique(children, return_inverse=True)
+        dist[frontier] = depth
+        sigma[frontier] = np.bincount(inverse, weights=sigma[parents])
+        levels.append((parents, frontier, inverse))
+        reached.append(frontier)
+    return levels, np.concatenate(reached)
+
+
+_ADJACENCY = None
+
+
+def _init_worker(indptr, indices):
+    global _ADJACENCY
+    _ADJACENCY = (indptr, indices)
+
+
+def _brandes_batch(sources):
+    """
+    Accumulate Brandes dependencies over a batch of sources.
+
+    Returns raw (unscaled) betweenness, the summed distance from the batch's
+    sources to every node, and each source's total distance to its component.
+    """
+    indptr, indices = _ADJACENCY
+    n = len(indptr) - 1
+    betweenness = np.zeros(n)
+    dist_sum = np.zeros(n, dtype=np.int64)
+    totals = np.zeros(len(sources), dtype=np.int64)
+
+    dist = np.full(n, -1, dtype=np.int64)
+    sigma = np.zeros(n)
+    delta = np.zeros(n)
+    for i, s in enumerate(sources):
+        levels, reached = _shortest_path_dag(indptr, indices, s, dist, sigma)
+        for parents, level, inverse in reversed(levels):
+            coeff = (1 + delta[level]) / sigma[level]
+            owners, owner = np.unique(parents, return_inverse=True)
+            delta[owners] += np.bincount(owner, weights=sigma[parents] * coeff[inverse])
+        betweenness[reached[1:]] += delta[reached[1:]]
+        dist_sum[reached] += dist[reached]
+        totals[i] = dist[reached].sum()
+
+        dist[reached] = -1
+        sigma[reached] = 0
+        delta[reached] = 0
+    return betweenness, dist_sum, totals
+
+
+def run_sources(indptr, indices, sources, workers=1):
+    """Run every source in SOURCE_BATCH batches, on a process pool when workers > 1."""
+    n = len(indptr) - 1
+    batches = [sources[i:i + SOURCE_BATCH] for i in range(0, len(sources), SOURCE_BATCH)]
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(indptr, indices)) as pool:
+            results = list(pool.map(_brandes_batch, batches))
+    else:
+        _init_worker(indptr, indices)
+        results = [_brandes_batch(batch) for batch in batches]
+
+    # Sum in batch order so the result does not depend on the worker count
+    betweenness = np.zeros(n)
+    dist_sum = np.zeros(n, dtype=np.int64)
+    for batch_betweenness, batch_dist_sum, _ in results:
+        betweenness += batch_betweenness
+        dist_sum += batch_dist_sum
+    totals = np.concatenate([r[2] for r in results]) if results else np.zeros(0, dtype=np.int64)
+    return betweenness, dist_sum, totals
+
+
+def estimate(n, sources, quota, comp, size, raw, dist_sum, totals, confidence=CONFIDENCE):
+    """
+    Scale the accumulated sums to normalized betweenness and closeness.
+
+    For a node in a component of size c with m sources other than itself,
+    both sums are scaled by (c - 1) / m; exact components have m = c - 1.
+    Sources use their own search for closeness. The betweenness bound is
+    Hoeffding's inequality with Serfling's correction for sampling the
+    c - 1 possible sources without replacement, at `confidence` per node.
+    """
+    reach = size[comp].astype(np.float64)
+    is_source = np.zeros(n, dtype=bool)
+    is_source[sources] = True
+    others = quota[comp] - is_source
+    sampled = (quota < size)[comp]
+    factor = np.divide(reach - 1, others, out=np.ones(n), where=sampled & (others > 0))
+
+    # Normalize by the (n - 1)(n - 2) ordered pairs, as NetworkX does
+    betweenness = raw * factor
+    if n > 2:
+        betweenness = betweenness * (1 / ((n - 1) * (n - 2)))
+
+    totsp = dist_sum * factor
+    totsp[sources] = totals
+    closeness = np.divide(reach - 1.0, totsp, out=np.zeros(n), where=totsp > 0)
+    if n > 1:
+        closeness = closeness * ((reach - 1.0) / (n - 1))
+
+    error = np.zeros(n)
+    if n > 2 and sampled.any():
+        span = (reach - 1) * (reach - 2) / ((n - 1) * (n - 2))
+        m = np.maximum(others, 1)
+        correction = np.clip(1 - (m - 1) / np.maximum(reach - 1, 1), 0, 1)
+        bound = span * np.sqrt(correction * math.log(2 / (1 - confidence)) / (2 * m))
+        error = np.where(sampled, bound, 0.0)
+    return betweenness, closeness, error
+
+
+def topology_key(ids, indptr, indices, samples, seed, confidence):
+    """Cache key: a hash of the node ids, the adjacency and the sampling settings."""
+    digest = hashlib.sha256()
+    digest.update(f'v{CACHE_VERSION}|{samples}|{seed}|{confidence}|{len(ids)}|'.encode())
+    digest.update('\0'.join(map(str, ids)).encode())
+    digest.update(np.asarray(indptr, dtype=np.int64).tobytes())
+    digest.update(np.asarray(indices, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def path_centrality(G_undirected, samples=None, workers=1, cache_dir=None, seed=0,
+                    confidence=CONFIDENCE):
+    """
+    Betweenness and closeness of every node of an undirected view.
+
+    samples=None is exact up to EXACT_NODE_LIMIT nodes and uses
+    DEFAULT_SAMPLES sources above it; samples=0 forces the exact result.
+    With `cache_dir`, results are read from and written to
+    <cache_dir>/<topology hash>.npz.
+    """
+    ids = G_undirected.nodes()
+    n = len(ids)
+    if samples is None:
+        samples = DEFAULT_SAMPLES if n > EXACT_NODE_LIMIT else 0
+    samples = samples or None
+    indptr, indices = G_undirected.undirected_adjacency()
+
+    cache_path = None
+    if cache_dir is not None:
+        key = topology_key(ids, indptr, indices, samples, seed, confidence)
+        cache_path = Path(cache_dir) / f'{key}.npz'
+        if cache_path.exists():
+            cached = np.load(cache_path)
+            return PathCentrality(cached['betweenness'], cached['closeness'], cached['error'],
+                                  int(cached['sources']), bool(cached['exact']), cached=True)
+
+    labels = connected_components(indptr, indices)
+    sources, quota, comp, size = sample_sources(labels, samples, seed)
+    raw, dist_sum, totals = run_sources(indptr, indices, sources, workers or os.cpu_count() or 1)
+    betweenness, closeness, error = estimate(n, sources, quota, comp, size,
+                                             raw, dist_sum, totals, confidence)
+    result = PathCentrality(betweenness, closeness, error, len(sources),
+                            exact=bool((quota == np.where(size > 1, size, 0)).all()))
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp.npz')
+        np.savez(tmp_path, betweenness=result.betweenness, closeness=result.closeness,
+                 error=result.error, sources=result.sources, exact=result.exact)
+        os.replace(tmp_path, cache_path)
+    return result
+
+
+def centrality_table(G, network, include_hypothetical=False, samples=None, workers=1,
+                     cache_dir=None, seed=0):
+    """
+    Return one row per node with degree, betweenness and closeness.
+
+    HYP-* nodes are skipped unless include_hypothetical=True. Rows are
+    sorted by degree centrality, highest first. `samples`, `workers`,
+    `cache_dir` and `seed` are passed to path_centrality(); when the
+    betweenness is sampled, a Betweenness_Error column holds its bound.
+    """
+    G_real = real_graph(G)
+    G_undirected = G_real.to_undirected()
+    G_sizing_undirected = sizing_graph(G).to_undirected()
+
+    paths = path_centrality(G_undirected, samples=samples, workers=workers,
+                            cache_dir=cache_dir, seed=seed)
+    degree_centrality = G_undirected.degree_centrality()
+
+    nodes = G.nodes()
+    table = pd.DataFrame({
+        'ID': nodes,
+        'Node': [network.name(node) for node in nodes],
+        'In-degree': G_real.in_degrees(),
+        'Out-degree': G_real.out_degrees(),
+        'Connections': G_undirected.degrees(),
+        'Meaningful_Connections': G_sizing_undirected.degrees(),
+        'Degree': [degree_centrality[node] for node in nodes],
+        'Betweenness': paths.betweenness,
+        'Closeness': paths.closeness,
+    })
+    if not paths.exact:
+        table['Betweenness_Error'] = paths.error
+    if not include_hypothetical:
+        table = table[[not is_hypothetical(node) for node in nodes]]
+
+    return table.sort_values('Degree', ascending=False)
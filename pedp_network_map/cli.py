@@ -0,0 +1,178 @@
+"""
+`pedp-build`: render both network maps in one process.
+
+Loads the processed CSVs once, builds the current and hypothetical
+graphs, and writes:
+- outputs/network_map.html (+ network_map.tooltips.js, the
+  network_map.search.js search index and the content-hashed
+  network_map.data.<hash>.js it loads through network_map.data.js,
+  see graphdata.py)
+- outputs/network_map.scenario.js: the hypothetical scenario as a delta
+  the current map toggles on and off (see delta.py)
+- outputs/network_map_hypothetical.html: a stub that opens the current map
+  in the scenario state, or with --hypothetical page a second full map
+  (+ its own sidecars)
+- outputs/centrality.csv
+
+This replaces executing the notebook in CI; the notebooks call the same
+functions for interactive previews.
+"""
+
+import argparse
+import sys
+import warnings
+from pathlib import Path
+
+from . import profiling
+from .centrality import CACHE_DIR, centrality_table
+from .data import PROCESSED_DIR, PROJECT_DIR, current_network, hypothetical_network, read_frames
+from .delta import scenario_sidecar_path, scenario_toggle, write_redirect, write_scenario_overlay
+from .graph import build_graph
+from .overlays import HYPOTHETICAL_OVERLAYS
+from .render import (
+    CURRENT_BACKGROUND, HYPOTHETICAL_BACKGROUND, RENDER_MODES, build_pyvis_network, render_network,
+)
+
+OUTPUT_DIR = PROJECT_DIR / 'outputs'
+CLUSTERING = {'auto': None, 'on': True, 'off': False}
+HYPOTHETICAL_OUTPUTS = ('overlay', 'page')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='pedp-build',
+        description='Render the current and hypothetical PEDP network maps.',
+    )
+    parser.add_argument('--data-dir', type=Path, default=PROCESSED_DIR,
+                        help='directory with the processed CSVs (default: data/processed)')
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR,
+                        help='directory for the HTML maps and centrality table (default: outputs)')
+    parser.add_argument('--skip-hypothetical', action='store_true',
+                        help='only render the current network')
+    parser.add_argument('--skip-current', action='store_true',
+                        help='only render the hypothetical network (no centrality table)')
+    parser.add_argument('--hypothetical', choices=HYPOTHETICAL_OUTPUTS, default='overlay',
+                        help='overlay: ship the scenario as a delta the current map toggles '
+                             '(default); page: render a second full map')
+    parser.add_argument('--inline-tooltips', action='store_true',
+                        help='embed hover text in the pages instead of a .tooltips.js sidecar')
+    parser.add_argument('--inline-data', action='store_true',
+                        help='embed the nodes and edges in the pages instead of a hashed .data.<hash>.js')
+    parser.add_argument('--render-mode', choices=RENDER_MODES, default='static',
+                        help='static: precomputed positions, physics off (default); '
+                             'settled: capped stabilization; physics: full in-browser stabilization')
+    parser.add_argument('--drag-physics', action='store_true',
+                        help='in static mode, run the physics while a node is dragged')
+    parser.add_argument('--clusters', choices=CLUSTERING, default='auto',
+                        help='open the maps with collapsed category/community clusters '
+                             '(default: auto, above 1000 nodes)')
+    parser.add_argument('--betweenness-samples', type=int, default=None, metavar='K',
+                        help='estimate betweenness from K sampled sources; 0 for exact '
+                             '(default: exact up to 5000 nodes, 1000 samples above)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='processes for the centrality searches (default: CPU count)')
+    parser.add_argument('--cache-dir', type=Path, default=CACHE_DIR,
+                        help='centrality cache directory (default: data/cache/centrality)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always recompute the centrality table')
+    parser.add_argument('--profile', type=Path, default=None, metavar='PATH',
+                        help='write per-stage wall/CPU time, peak memory and counts as JSON '
+                             '(default: $PEDP_PROFILE_DIR/pedp-build.json when that is set)')
+    parser.add_argument('--trace', type=Path, default=None, metavar='PATH',
+                        help='with --profile, also write a Chrome trace of the stages')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    warnings.filterwarnings('ignore')
+    profiling.start('pedp-build', report_path=args.profile, trace_path=args.trace)
+
+    print("="*60)
+    print("PEDP Network Map - Build")
+    print("="*60)
+
+    print("\n1. Loading data...")
+    with profiling.stage('load') as record:
+        frames = read_frames(args.data_dir, hypothetical=not args.skip_hypothetical)
+        current = current_network(frames)
+        record.count(nodes=len(current.nodes), edges=len(current.edges))
+    print(f"   Current: {len(current.nodes)} nodes, {len(current.edges)} edges")
+
+    current_path = args.output_dir / 'network_map.html'
+    overlay = args.hypothetical == 'overlay'
+    G = net = None
+    if not args.skip_current or overlay:
+        with profiling.stage('graph_build', nodes=len(current.nodes), edges=len(current.edges)):
+            G = build_graph(current)
+
+    if not args.skip_current:
+        print("\n2. Building current network...")
+        # In overlay mode the toggle is always there; it loads the scenario
+        # sidecar written below (or by a separate --skip-current run)
+        scripts = [scenario_toggle(scenario_sidecar_path(current_path).name)] if overlay else []
+        with profiling.stage('render_current', nodes=G.number_of_nodes(), edges=G.number_of_edges()):
+            # Built here so the scenario delta below diffs against the same Network
+            with profiling.stage('pyvis_build'):
+                net = build_pyvis_network(G, current, background=CURRENT_BACKGROUND,
+                                          inline_tooltips=args.inline_tooltips, mode=args.render_mode)
+            html_path = render_network(G, current, current_path, net=net,
+                                       background=CURRENT_BACKGROUND,
+                                       lazy_tooltips=not args.inline_tooltips,
+                                       mode=args.render_mode, drag_physics=args.drag_physics,
+                                       clustered=CLUSTERING[args.clusters], scripts=scripts,
+                                       data_file=not args.inline_data)
+        print(f"   ✓ Saved to: {html_path}")
+
+        with profiling.stage('centrality', nodes=G.number_of_nodes(), edges=G.number_of_edges()) as record:
+            centrality_df = centrality_table(G, current, samples=args.betweenness_samples,
+                                             workers=args.workers,
+                                             cache_dir=None if args.no_cache else args.cache_dir)
+            centrality_path = args.output_dir / 'centrality.csv'
+            centrality_df.to_csv(centrality_path, index=False)
+            record.count(rows=len(centrality_df))
+        print(f"   ✓ Saved centrality table to: {centrality_path}")
+        if 'Betweenness_Error' in centrality_df:
+            print(f"   ℹ️  Sampled betweenness, max error bound "
+                  f"±{centrality_df['Betweenness_Error'].max():.4f}")
+
+    if not args.skip_hypothetical:
+        print("\n3. Building hypothetical network...")
+        with profiling.stage('hypothetical_build') as record:
+            hypothetical = hypothetical_network(frames, base=current)
+            G_hyp = build_graph(hypothetical)
+            record.count(nodes=len(hypothetical.nodes), edges=len(hypothetical.edges),
+                         added_nodes=hypothetical.added_nodes, added_edges=hypothetical.added_edges)
+        print(f"   Hypothetical: {len(hypothetical.nodes)} nodes "
+              f"(+{hypothetical.added_nodes}), {len(hypothetical.edges)} edges "
+              f"(+{hypothetical.added_edges})")
+        hypothetical_path = args.output_dir / 'network_map_hypothetical.html'
+        if overlay:
+            with profiling.stage('scenario_overlay', nodes=G_hyp.number_of_nodes(),
+                                 edges=G_hyp.number_of_edges()):
+                args.output_dir.mkdir(parents=True, exist_ok=True)
+                sidecar_path = write_scenario_overlay(G, current, G_hyp, hypothetical, current_path,
+                                                      mode=args.render_mode, net=net)
+                write_redirect(current_path.name, hypothetical_path)
+            print(f"   ✓ Saved scenario delta to: {sidecar_path} "
+                  f"({sidecar_path.stat().st_size / 1024:.1f} KB)")
+            print(f"   ✓ Saved redirect to: {hypothetical_path}")
+        else:
+            with profiling.stage('render_hypothetical', nodes=G_hyp.number_of_nodes(),
+                                 edges=G_hyp.number_of_edges()):
+                html_path = render_network(G_hyp, hypothetical, hypothetical_path,
+                                           background=HYPOTHETICAL_BACKGROUND,
+                                           lazy_tooltips=not args.inline_tooltips,
+                                           mode=args.render_mode, drag_physics=args.drag_physics,
+                                           clustered=CLUSTERING[args.clusters],
+                                           overlays=HYPOTHETICAL_OVERLAYS,
+                                           data_file=not args.inline_data)
+            print(f"   ✓ Saved to: {html_path}")
+
+    print("\n✅ Build complete!")
+    profiling.finish()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
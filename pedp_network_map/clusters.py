@@ -0,0 +1,324 @@
+"""
+Level-of-detail clustering for large maps.
+
+Nodes are grouped by category and, within each category, into communities
+found by label propagation over the real edges between members of that
+category. The page opens with one node per category. Clicking a cluster,
+or zooming in on it, expands it into its communities and then into
+organizations; zooming back out collapses what the zoom opened.
+
+The hierarchy is computed at build time. The page only holds the full
+node and edge lists and swaps items in and out of the vis DataSets, so
+the browser draws the visible level instead of the whole graph.
+"""
+
+import json
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .graph import real_graph
+
+CLUSTER_NODE_LIMIT = 1000       # clustered=None clusters maps with more nodes than this
+MIN_COMMUNITY_SIZE = 5          # smaller communities show as plain nodes
+PROPAGATION_ROUNDS = 30
+
+# Zoom, relative to the opening view, that expands categories / communities
+EXPAND_ZOOM = (2.0, 4.0)
+
+CLUSTER_BASE_SIZE = 25
+AGGREGATE_EDGE_COLOR = '#b0b0b0'
+
+
+@dataclass
+class ClusterHierarchy:
+    """Category and community clusters for the nodes of a graph, in node order."""
+
+    clusters: list       # dicts: node (vis options), parent (cluster index or -1), x, y, radius
+    parent: np.ndarray   # innermost cluster index per node; -1 for nodes never clustered
+
+
+def label_propagation(indptr, indices, groups, rounds=PROPAGATION_ROUNDS, seed=0):
+    """
+    Community label per node from semi-synchronous label propagation.
+
+    Only edges between nodes of the same group count, so communities never
+    cross groups. Each round, a random half of the nodes that would change
+    adopt their most frequent neighbour label. A node keeps its label when
+    it is among the most frequent; other ties go to the smallest label.
+    """
+    n = len(indptr) - 1
+    src = np.repeat(np.arange(n), np.diff(indptr))
+    dst = np.asarray(indices)
+    same = groups[src] == groups[dst]
+    src, dst = src[same], dst[same]
+
+    labels = np.arange(n)
+    rng = np.random.default_rng(seed)
+    for _ in range(rounds):
+        # Count each (node, neighbour label) pair
+        neighbour = labels[dst]
+        order = np.lexsort((neighbour, src))
+        s, l = src[order], neighbour[order]
+        start = np.flatnonzero(np.r_[True, (s[1:] != s[:-1]) | (l[1:] != l[:-1])])
+        count = np.diff(np.r_[start, len(s)])
+        s, l = s[start], l[start]
+
+        # Best label: most frequent, then the current one, then the smallest
+        rank = np.lexsort((l, l != labels[s], -count, s))
+        s, l = s[rank], l[rank]
+        first = np.r_[True, s[1:] != s[:-1]]
+        best = labels.copy()
+        best[s[first]] = l[first]
+
+        changed = best != labels
+        if not changed.any():
+            break
+        update = changed & (rng.random(n) < 0.5)
+        labels = np.where(update if update.any() else changed, best, labels)
+    return labels
+
+
+def _cluster(cluster_id, label, title, members, xy, color, parent):
+    """Vis options and geometry for one cluster node."""
+    centre = xy[members].mean(axis=0)
+    radius = float(np.sqrt(((xy[members] - centre) ** 2).sum(axis=1)).max())
+    count = len(members)
+    return {
+        'node': {
+            'id': cluster_id,
+            'label': f"{label}\n{count:,} organizations",
+            'title': title,
+            'color': color,
+            'size': CLUSTER_BASE_SIZE + 6 * math.log2(count),
+            'shape': 'dot',
+            'borderWidth': 3,
+            'font': {'size': 18},
+            'x': round(float(centre[0])),
+            'y': round(float(centre[1])),
+        },
+        'parent': parent,
+        'radius': round(radius),
+    }
+
+
+def cluster_hierarchy(G, network, min_community=MIN_COMMUNITY_SIZE, seed=0):
+    """
+    Build category clusters, and community clusters inside them, for `G`.
+
+    Categories with a single node are left unclustered. Communities smaller
+    than `min_community`, or spanning the whole category, get no cluster of
+    their own. A community is named after its best-connected member.
+    """
+    ids = G.nodes()
+    records = [network.node(node) for node in ids]
+    codes, names = pd.factorize(pd.Series([record['category'] for record in records]), sort=False)
+    indptr, indices = real_graph(G).undirected_adjacency()
+    labels = label_propagation(indptr, indices, codes, seed=seed)
+    degree = np.diff(indptr)
+    xy = np.array([[network.positions[node]['x'], network.positions[node]['y']] for node in ids],
+                  dtype=np.float64).reshape(-1, 2)
+    colors = pd.Series([record['hex_color'] for record in records], dtype=object)
+
+    clusters = []
+    parent = np.full(len(ids), -1, dtype=np.int64)
+    frame = pd.DataFrame({'category': codes, 'community': labels})
+    for code, members in frame.groupby('category', sort=False).indices.items():
+        if code < 0 or len(members) < 2:
+            continue
+        category = names[code]
+        category_index = len(clusters)
+        clusters.append(_cluster(
+            f'category:{category}', category,
+            f"{category}: {len(members):,} organizations. Click or zoom in to expand.",
+            members, xy, colors.iloc[members].mode().iloc[0], -1,
+        ))
+        parent[members] = category_index
+
+        communities = frame.iloc[members].groupby('community', sort=False).indices
+        for local in communities.values():
+            if len(local) < min_community or len(local) == len(members):
+                continue
+            community = members[local]
+            hub = records[community[np.argmax(degree[community])]]['name']
+            parent[community] = len(clusters)
+            clusters.append(_cluster(
+                f'community:{category}:{len(clusters)}', f"{hub} and others",
+                f"{category} community around {hub}: {len(community):,} organizations. "
+                f"Click or zoom in to expand.",
+                community, xy, colors.iloc[community].mode().iloc[0], category_index,
+            ))
+    return ClusterHierarchy(clusters, parent)
+
+
+def collapse_clusters(net, hierarchy):
+    """
+    Replace the nodes and edges of a PyVis Network with the collapsed view.
+
+    The network keeps the top-level clusters and the nodes outside every
+    cluster. Edges are added by lod_script(). Returns the payload for
+    lod_script(): the full node and edge lists plus the hierarchy.
+    """
+    payload = {
+        'nodes': net.nodes,
+        'edges': net.edges,
+        'clusters': hierarchy.clusters,
+        'parent': hierarchy.parent.tolist(),
+        'expandZoom': list(EXPAND_ZOOM),
+    }
+    top = [cluster['node'] for cluster in hierarchy.clusters if cluster['parent'] < 0]
+    net.nodes = top + [node for node, p in zip(net.nodes, hierarchy.parent.tolist()) if p < 0]
+    net.edges = []
+    return payload
+
+
+def lod_script(payload, expression=None):
+    """
+    Script that shows the visible level of the hierarchy and expands
+    clusters on click or zoom.
+
+    Each node is drawn as its outermost collapsed ancestor. An edge is
+    drawn as itself when both ends are visible. Otherwise the edges
+    between two clusters merge into one grey edge, wider for more edges.
+    With `expression` (JavaScript that evaluates to the payload, e.g. from
+    the graph data file) the payload is not inlined and may be None.
+    """
+    data = expression or json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return f"""<script type="text/javascript">
+(function () {{
+    var lod = {data};
+    var open = new Set(), zoomOpened = new Set(), baseScale = null;
+    var nodeIndex = {{}}, clusterIndex = {{}};
+    lod.nodes.forEach(function (node, i) {{ nodeIndex[node.id] = i; }});
+    lod.clusters.forEach(function (cluster, k) {{ clusterIndex[cluster.node.id] = k; }});
+
+    function representative(i) {{
+        var rep = lod.nodes[i].id;
+        for (var k = lod.parent[i]; k >= 0; k = lod.clusters[k].parent) {{
+            if (!open.has(k)) rep = lod.clusters[k].node.id;
+        }}
+        return rep;
+    }}
+
+    function refresh() {{
+        var reps = lod.nodes.map(function (node, i) {{ return representative(i); }});
+        var wantNodes = {{}}, wantEdges = {{}};
+        reps.forEach(function (rep, i) {{
+            wantNodes[rep] = rep === lod.nodes[i].id ? lod.nodes[i] : lod.clusters[clusterIndex[rep]].node;
+        }});
+        lod.edges.forEach(function (edge, e) {{
+            var from = reps[nodeIndex[edge.from]], to = reps[nodeIndex[edge.to]];
+            if (from === edge.from && to === edge.to) {{
+                wantEdges['e' + e] = Object.assign({{id: 'e' + e}}, edge);
+                return;
+            }}
+            if (from === to) return;
+            var id = from < to ? 'a:' + from + '|' + to : 'a:' + to + '|' + from;
+            var merged = wantEdges[id] || (wantEdges[id] = {{id: id, from: from, to: to, count: 0}});
+            merged.count += 1;
+        }});
+        Object.keys(wantEdges).forEach(function (id) {{
+            var merged = wantEdges[id];
+            if (merged.count === undefined) return;
+            merged.width = Math.min(1 + Math.log2(merged.count), 10);
+            merged.color = {json.dumps(AGGREGATE_EDGE_COLOR)};
+            merged.title = merged.count + (merged.count === 1 ? ' relationship' : ' relationships');
+            delete merged.count;
+        }});
+
+        // Keep hover text picked up while a node was visible
+        var removeNodes = nodes.getIds().filter(function (id) {{ return !(id in wantNodes); }});
+        nodes.get(removeNodes).forEach(function (item) {{
+            if (item.title !== undefined && item.id in nodeIndex) lod.nodes[nodeIndex[item.id]].title = item.title;
+        }});
+        nodes.remove(removeNodes);
+        nodes.add(Object.keys(wantNodes).filter(function (id) {{ return nodes.get(id) === null; }})
+                        .map(function (id) {{ return wantNodes[id]; }}));
+        edges.remove(edges.getIds().filter(function (id) {{ return !(id in wantEdges); }}));
+        edges.add(Object.keys(wantEdges).filter(function (id) {{ return edges.get(id) === null; }})
+                        .map(function (id) {{ return wantEdges[id]; }}));
+    }}
+
+    function inView(cluster) {{
+        var container = document.getElementById('mynetwork');
+        var topLeft = network.DOMtoCanvas({{x: 0, y: 0}});
+        var bottomRight = network.DOMtoCanvas({{x: container.clientWidth, y: container.clientHeight}});
+        var x = cluster.node.x, y = cluster.node.y, r = cluster.radius;
+        return x + r >= topLeft.x && x - r <= bottomRight.x && y + r >= topLeft.y && y - r <= bottomRight.y;
+    }}
+
+    network.on('click', function (params) {{
+        if (!params.nodes.length || !(params.nodes[0] in clusterIndex)) return;
+        open.add(clusterIndex[params.nodes[0]]);
+        refresh();
+    }});
+
+    network.once('afterDrawing', function () {{ baseScale = network.getScale(); }});
+    network.on('zoom', function () {{
+        if (baseScale === null) return;
+        var zoom = network.getScale() / baseScale, changed = false;
+        lod.clusters.forEach(function (cluster, k) {{
+            var depth = cluster.parent < 0 ? 0 : 1;
+            if (zoom >= lod.expandZoom[depth]) {{
+                var parentOpen = cluster.parent < 0 || open.has(cluster.parent);
+                if (!open.has(k) && parentOpen && inView(cluster)) {{
+                    open.add(k);
+                    zoomOpened.add(k);
+                    changed = true;
+                }}
+            }} else if (zoomOpened.has(k)) {{
+                open.delete(k);
+                zoomOpened.delete(k);
+                changed = true;
+            }}
+        }});
+        if (changed) refresh();
+    }});
+
+    // Expand every cluster around a node, e.g. to show a search result
+    window.pedpRevealNode = function (id) {{
+        if (!(id in nodeIndex)) return;
+        for (var k = lod.parent[nodeIndex[id]]; k >= 0; k = lod.clusters[k].parent) open.add(k);
+        refresh();
+    }};
+
+    // Add nodes and edges to the full lists and take them back (e.g. the
+    // hypothetical scenario, see delta.py); added nodes stay outside every cluster
+    window.pedpLod = {{
+        add: function (addNodes, addEdges) {{
+            var mark = {{nodes: lod.nodes.length, edges: lod.edges.length}};
+            addNodes.forEach(function (node) {{
+                nodeIndex[node.id] = lod.nodes.length;
+                lod.nodes.push(node);
+                lod.parent.push(-1);
+            }});
+            Array.prototype.push.apply(lod.edges, addEdges);
+            refresh();
+            return mark;
+        }},
+        truncate: function (mark) {{
+            lod.nodes.slice(mark.nodes).forEach(function (node) {{ delete nodeIndex[node.id]; }});
+            lod.nodes.length = lod.parent.length = mark.nodes;
+            lod.edges.length = mark.edges;
+            refresh();
+        }},
+        // Change node attributes, visible or not; returns the previous values
+        update: function (updates) {{
+            return updates.map(function (update) {{
+                var node = lod.nodes[nodeIndex[update.id]], before = {{id: update.id}};
+                Object.keys(update).forEach(function (key) {{
+                    before[key] = node[key];
+                    node[key] = update[key];
+                }});
+                if (nodes.get(update.id) !== null) nodes.update(update);
+                return before;
+            }});
+        }}
+    }};
+
+    refresh();
+}})();
+</script>
+"""
@@ -0,0 +1,166 @@
+"""
+Load the processed network data once and index it by node id.
+
+Renderers used to look up each node with `nodes_df[nodes_df['id'] == node]`,
+which scans the whole table per node. `load_network()` builds the node
+store, position map and colour map up front so every per-node lookup is a
+dict access.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+from .artifact import CSV_FILES, load_artifact
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+PROCESSED_DIR = PROJECT_DIR / 'data' / 'processed'
+
+NODE_COLUMNS = ['id', 'name', 'organization', 'contact', 'description',
+                'status', 'website', 'category', 'timeline', 'color']
+EDGE_COLUMNS = ['source', 'target', 'relationship_type']
+
+
+@dataclass
+class NetworkData:
+    """Nodes, edges, positions and colours for one network state."""
+
+    nodes: pd.DataFrame          # indexed by id (id also kept as a column)
+    edges: pd.DataFrame
+    positions: dict              # id -> {'x', 'y', 'fixed'}
+    color_map: dict              # colour name -> hex
+    records: dict = field(default_factory=dict)  # id -> node attributes
+    added_nodes: int = 0         # new ids the *_hypothetical files added
+    added_edges: int = 0
+
+    def node(self, node_id):
+        """Return the attribute dict for a node id."""
+        return self.records[node_id]
+
+    def name(self, node_id):
+        """Return the display name for a node id."""
+        return self.records[node_id]['name']
+
+
+def index_nodes(nodes_df, color_map):
+    """
+    Index a node table by id and attach the mapped hex colour.
+
+    Duplicate ids keep their first row, matching the old `.iloc[0]` lookup.
+    """
+    nodes = nodes_df.copy()
+    nodes['hex_color'] = nodes['color'].map(color_map)
+    nodes = nodes.set_index('id', drop=False)
+    nodes.index.name = None
+    return nodes[~nodes.index.duplicated(keep='first')]
+
+
+def positions_from_frame(positions_df):
+    """Build the id -> {'x', 'y', 'fixed'} map without iterrows()."""
+    return {
+        node_id: {'x': x, 'y': y, 'fixed': fixed}
+        for node_id, x, y, fixed in zip(
+            positions_df['id'].tolist(),
+            positions_df['x'].tolist(),
+            positions_df['y'].tolist(),
+            positions_df['fixed'].tolist(),
+        )
+    }
+
+
+def node_records(nodes):
+    """Return id -> attribute dict for an id-indexed node table."""
+    columns = list(nodes.columns)
+    return {
+        node_id: dict(zip(columns, row))
+        for node_id, row in zip(nodes.index, nodes.itertuples(index=False, name=None))
+    }
+
+
+def build_network_data(nodes_df, edges_df, positions_df, colors_df,
+                       added_nodes=0, added_edges=0):
+    """Assemble a NetworkData from already-loaded frames."""
+    color_map = dict(zip(colors_df['name'], colors_df['hex']))
+    nodes = index_nodes(nodes_df, color_map)
+    return NetworkData(
+        nodes=nodes,
+        edges=edges_df.reset_index(drop=True),
+        positions=positions_from_frame(positions_df),
+        color_map=color_map,
+        records=node_records(nodes),
+        added_nodes=added_nodes,
+        added_edges=added_edges,
+    )
+
+
+def read_frames(data_dir=PROCESSED_DIR, hypothetical=False):
+    """
+    Read the processed tables from `data_dir` into a dict of DataFrames.
+
+    Keys: nodes, edges, positions, colors and, with hypothetical=True,
+    nodes_hypothetical, edges_hypothetical, positions_hypothetical.
+    Tables come from the binary artifact when it is up to date with the
+    CSVs (see pedp_network_map.artifact), otherwise from the CSVs.
+    """
+    data_dir = Path(data_dir)
+    names = ['nodes', 'edges', 'positions', 'colors']
+    if hypothetical:
+        names += ['nodes_hypothetical', 'edges_hypothetical', 'positions_hypothetical']
+    frames = load_artifact(data_dir, names)
+    if frames is None:
+        frames = {name: pd.read_csv(data_dir / CSV_FILES[name]) for name in names}
+    return frames
+
+
+def current_network(frames):
+    """Build the current-network NetworkData from `read_frames()` output."""
+    return build_network_data(frames['nodes'], frames['edges'],
+                              frames['positions'], frames['colors'])
+
+
+def extend_network(base, nodes_df, edges_df, positions_df):
+    """
+    `base` plus added nodes, edges and positions (e.g. one scenario's hubs).
+
+    Only the added rows are indexed; the base's node table, records and
+    positions are reused, so many scenarios can share one base network.
+    Ids already in the base keep their base row, like index_nodes(), and
+    are not counted in added_nodes.
+    """
+    added = index_nodes(nodes_df, base.color_map)
+    added = added[~added.index.isin(base.nodes.index)]
+    return NetworkData(
+        nodes=pd.concat([base.nodes, added]),
+        edges=pd.concat([base.edges, edges_df], ignore_index=True),
+        positions={**base.positions, **positions_from_frame(positions_df)},
+        color_map=base.color_map,
+        records={**base.records, **node_records(added)},
+        added_nodes=len(added),
+        added_edges=len(edges_df),
+    )
+
+
+def hypothetical_network(frames, base=None):
+    """
+    Build the current + hypothetical NetworkData from `read_frames()` output.
+
+    Pass the current network as `base` to reuse it instead of rebuilding it.
+    """
+    if base is None:
+        base = current_network(frames)
+    return extend_network(base, frames['nodes_hypothetical'], frames['edges_hypothetical'],
+                          frames['positions_hypothetical'])
+
+
+def load_network(data_dir=PROCESSED_DIR, hypothetical=False):
+    """
+    Load nodes, edges, positions and colours from `data_dir`.
+
+    With hypothetical=True the *_hypothetical.csv additions are appended
+    to the current network, as the hypothetical renderer expects.
+    """
+    frames = read_frames(data_dir, hypothetical=hypothetical)
+    if hypothetical:
+        return hypothetical_network(frames)
+    return current_network(frames)
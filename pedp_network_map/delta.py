@@ -0,0 +1,256 @@
+"""
+The hypothetical scenario as a delta on the current map.
+
+A full hypothetical page repeats the whole current network. Only the HYP-*
+hubs, their edges and the node sizes (degree centrality is normalised by
+the node count) differ. scenario_delta() diffs the two PyVis networks once,
+and the result is written next to the current page as `<name>.scenario.js`:
+a JSON payload wrapped in a callback, like the tooltip sidecar, so it also
+loads when the page is opened from disk.
+
+scenario_toggle() adds a button to the current page. The first click
+fetches the delta. After that the button switches the page between the
+current and the scenario state in place: it adds or removes the hubs and
+their edges, swaps the sizes, and shows or hides the hypothetical
+background, banner, watermark and legend. On clustered maps the delta goes
+into the level-of-detail node and edge lists (window.pedpLod, see
+clusters.py), so the hubs and their edges survive cluster expansion and
+edges to collapsed nodes attach to their cluster.
+
+Opening the page as `network_map.html#scenario` starts in the scenario
+state. write_redirect() writes network_map_hypothetical.html as a stub that
+goes there, so links to the old page keep working.
+"""
+
+import html
+import json
+from collections import Counter
+from pathlib import Path
+
+from . import profiling
+from .overlays import HYPOTHETICAL_OVERLAYS, HYPOTHETICAL_TITLE
+from .render import HYPOTHETICAL_BACKGROUND, build_pyvis_network
+
+SCENARIO_SIDECAR_SUFFIX = '.scenario.js'
+SCENARIO_CALLBACK = 'pedpScenarioLoaded'
+SCENARIO_HASH = '#scenario'
+# Marks the stub write_redirect() writes, so page patchers can tell it apart
+REDIRECT_MARKER = '<meta name="pedp-scenario-redirect">'
+
+
+def _edge_key(edge):
+    return edge['from'], edge['to'], edge.get('title')
+
+
+def scenario_delta(net_current, net_scenario):
+    """
+    Diff two PyVis networks built from the same base.
+
+    Returns {'nodes': [added node dicts], 'edges': [added edge dicts],
+    'updates': [{'id': ..., <changed attributes>}]}. Scenarios only add to
+    the current network, so a node or edge that is missing from
+    `net_scenario` raises ValueError. Hover text of current nodes is never
+    updated: it counts real edges only, and the current page may load it
+    from the tooltip sidecar instead.
+    """
+    current = {node['id']: node for node in net_current.nodes}
+    added, updates = [], []
+    for node in net_scenario.nodes:
+        before = current.pop(node['id'], None)
+        if before is None:
+            added.append(node)
+            continue
+        changed = {key: value for key, value in node.items()
+                   if key != 'title' and before.get(key) != value}
+        if changed:
+            updates.append({'id': node['id'], **changed})
+    if current:
+        raise ValueError(f"Scenario drops {len(current)} current node(s), e.g. {next(iter(current))!r}")
+
+    remaining = Counter(_edge_key(edge) for edge in net_current.edges)
+    edges = []
+    for edge in net_scenario.edges:
+        key = _edge_key(edge)
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            edges.append(edge)
+    if sum(remaining.values()):
+        raise ValueError(f"Scenario drops {sum(remaining.values())} current edge(s)")
+    return {'nodes': added, 'edges': edges, 'updates': updates}
+
+
+def scenario_payload(delta, background=HYPOTHETICAL_BACKGROUND, overlays=HYPOTHETICAL_OVERLAYS):
+    """The delta plus the page styling the toggle swaps in: background, title and overlay HTML."""
+    return {
+        **delta,
+        'background': background,
+        'title': next((overlay.title for overlay in overlays if overlay.title), None),
+        'head': ''.join(overlay.head for overlay in overlays),
+        'body_start': ''.join(overlay.body_start for overlay in overlays),
+        'body_end': ''.join(overlay.body_end for overlay in overlays),
+    }
+
+
+def scenario_sidecar_path(page_path):
+    """`outputs/network_map.html` → `outputs/network_map.scenario.js`."""
+    page_path = Path(page_path)
+    return page_path.with_name(page_path.stem + SCENARIO_SIDECAR_SUFFIX)
+
+
+def write_scenario_sidecar(payload, sidecar_path):
+    """Write the compact JSON payload wrapped in the toggle's callback."""
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    Path(sidecar_path).write_text(f"{SCENARIO_CALLBACK}({data});\n", encoding='utf-8')
+    return sidecar_path
+
+
+def write_scenario_overlay(G, network, G_scenario, scenario, page_path, mode='physics',
+                           background=HYPOTHETICAL_BACKGROUND, overlays=HYPOTHETICAL_OVERLAYS,
+                           net=None):
+    """
+    Diff the scenario against the current network and write the sidecar
+    for the current page at `page_path`; returns the sidecar path.
+
+    `net` is the current page's PyVis Network as render_network() built it
+    (pass the same Network in there); without it the current network is
+    built here. The scenario is built with inline tooltips, so added hubs
+    carry their hover text.
+    """
+    with profiling.stage('delta') as record:
+        if net is None:
+            net = build_pyvis_network(G, network, mode=mode)
+        delta = scenario_delta(net, build_pyvis_network(G_scenario, scenario, background=background, mode=mode))
+        record.count(added_nodes=len(delta['nodes']), added_edges=len(delta['edges']),
+                     updated_nodes=len(delta['updates']))
+    with profiling.stage('sidecar_write') as record:
+        sidecar_path = write_scenario_sidecar(scenario_payload(delta, background, overlays),
+                                              scenario_sidecar_path(page_path))
+        record.count(bytes=sidecar_path.stat().st_size)
+    return sidecar_path
+
+
+def scenario_toggle(sidecar_name):
+    """
+    Script for the current page: a button that loads the scenario sidecar
+    on first use and then applies or reverts it. Follows `#scenario` in
+    the URL on load and on hash changes.
+    """
+    return f"""<script type="text/javascript">
+(function () {{
+    var scenario = null, requested = false, active = false, wanted = false;
+    var saved = [], edgeIds = [], mark = null, blocks = [];
+    var container = document.getElementById('mynetwork');
+    var original = {{title: document.title, background: container.style.backgroundColor}};
+    var labels = {{current: '🔮 Show hypothetical scenario', scenario: '↩ Show current network'}};
+    var button = document.createElement('button');
+    button.textContent = labels.current;
+    button.style.cssText = 'position: fixed; top: 10px; right: 10px; z-index: 10000; padding: 8px 14px; '
+        + 'font: bold 14px Arial, sans-serif; color: #ffffff; background: #764ba2; border: 0; '
+        + 'border-radius: 6px; cursor: pointer; box-shadow: 0 2px 8px rgba(0,0,0,0.25);';
+    document.body.appendChild(button);
+
+    function insert(markup, atStart) {{
+        var block = document.createElement('div');
+        block.innerHTML = markup;
+        document.body.insertBefore(block, atStart ? document.body.firstChild : null);
+        blocks.push(block);
+    }}
+    // Clustered maps swap nodes in and out of the DataSets (see clusters.py),
+    // so the delta goes into the full node and edge lists there
+    function apply() {{
+        var lod = window.pedpLod;
+        if (lod) {{
+            saved = lod.update(scenario.updates);
+            mark = lod.add(scenario.nodes, scenario.edges);
+        }} else {{
+            saved = scenario.updates.map(function (update) {{
+                var node = nodes.get(update.id), before = {{id: update.id}};
+                Object.keys(update).forEach(function (key) {{ before[key] = node[key]; }});
+                return before;
+            }});
+            nodes.add(scenario.nodes);
+            edgeIds = edges.add(scenario.edges);
+            nodes.update(scenario.updates);
+        }}
+        container.style.backgroundColor = scenario.background;
+        insert(scenario.head + scenario.body_start, true);
+        insert(scenario.body_end, false);
+        if (scenario.title) document.title = scenario.title;
+    }}
+    function revert() {{
+        var lod = window.pedpLod;
+        if (lod) {{
+            lod.truncate(mark);
+            lod.update(saved);
+        }} else {{
+            edges.remove(edgeIds);
+            nodes.remove(scenario.nodes.map(function (node) {{ return node.id; }}));
+            nodes.update(saved);
+        }}
+        container.style.backgroundColor = original.background;
+        blocks.forEach(function (block) {{ block.remove(); }});
+        blocks = [];
+        document.title = original.title;
+    }}
+    function show(state) {{
+        if (state !== active) {{
+            if (state) apply(); else revert();
+            active = state;
+        }}
+        button.textContent = active ? labels.scenario : labels.current;
+        history.replaceState(null, '', active ? {json.dumps(SCENARIO_HASH)} : location.pathname + location.search);
+    }}
+    function request(state) {{
+        wanted = state;
+        if (scenario !== null) {{
+            show(state);
+            return;
+        }}
+        if (requested) return;
+        requested = true;
+        button.textContent = 'Loading scenario…';
+        var script = document.createElement('script');
+        script.src = {json.dumps(sidecar_name)};
+        script.onerror = function () {{
+            button.textContent = 'Scenario unavailable';
+            button.disabled = true;
+        }};
+        document.head.appendChild(script);
+    }}
+    window.{SCENARIO_CALLBACK} = function (data) {{
+        scenario = data;
+        show(wanted);
+    }};
+    button.addEventListener('click', function () {{ request(!wanted); }});
+    window.addEventListener('hashchange', function () {{ request(location.hash === {json.dumps(SCENARIO_HASH)}); }});
+    if (location.hash === {json.dumps(SCENARIO_HASH)}) request(true);
+}})();
+</script>
+"""
+
+
+def write_redirect(page_name, redirect_path, title=HYPOTHETICAL_TITLE):
+    """Write a stub page at `redirect_path` that opens `page_name` in the scenario state."""
+    target = json.dumps(page_name + SCENARIO_HASH)
+    redirect_path = Path(redirect_path)
+    redirect_path.write_text(f"""<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  {REDIRECT_MARKER}
+  <title>{html.escape(title)}</title>
+  <script type="text/javascript">location.replace({target});</script>
+</head>
+<body>
+  <p><a href={target}>Open the hypothetical scenario</a></p>
+</body>
+</html>
+""", encoding='utf-8')
+    return redirect_path
+
+
+def is_redirect(path):
+    """True when `path` is a stub written by write_redirect()."""
+    with open(path, encoding='utf-8') as f:
+        return REDIRECT_MARKER in f.read(4096)
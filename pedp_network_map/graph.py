@@ -0,0 +1,324 @@
+"""
+Typed graph core built from a NetworkData.
+
+Edges are stored once, in CSR arrays grouped by relationship type.
+Everything the renderers and metrics need is a zero-copy view over those
+arrays:
+- real edges: everything except 'hypothetical connection'
+- sizing edges: real edges except 'Interested in solving the problem'
+- undirected views of either
+
+A view only records which relationship types it includes and whether it
+is undirected. Degree and neighbour queries read straight from the shared
+arrays. Use `to_networkx()` when a NetworkX algorithm is needed.
+
+Edge semantics match a NetworkX DiGraph: a repeated (source, target)
+pair is one edge that keeps the last relationship type, and edges are
+iterated by source node, then by first insertion.
+"""
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+HYPOTHETICAL_PREFIX = 'HYP-'
+HYPOTHETICAL_RELATIONSHIP = 'hypothetical connection'
+NON_SIZING_RELATIONSHIP = 'Interested in solving the problem'
+
+
+def is_hypothetical(node_id):
+    """Return True for the scenario's intermediary nodes (HYP-*)."""
+    return node_id.startswith(HYPOTHETICAL_PREFIX)
+
+
+class TypedGraph:
+    """
+    Directed edges stored once as per-relationship-type CSR arrays.
+
+    Edges are sorted by (type, source, insertion) for the outgoing arrays
+    and by (type, target, insertion) for the incoming ones. Type t
+    therefore owns the contiguous block type_start[t]:type_start[t + 1]
+    of each array, and out_indptr[t] / in_indptr[t] index into it by node.
+    """
+
+    def __init__(self, ids, sources, targets, types, type_names):
+        self.ids = np.asarray(ids, dtype=object)
+        self.index = {node: i for i, node in enumerate(self.ids.tolist())}
+        self.type_names = list(type_names)
+        self.type_index = {name: t for t, name in enumerate(self.type_names)}
+        n, n_types = len(self.ids), len(self.type_names)
+
+        # One edge per (source, target): first insertion fixes the order,
+        # the last occurrence sets the type (DiGraph.add_edge semantics)
+        pairs = pd.DataFrame({'s': sources, 't': targets, 'type': types})
+        # (ngroup numbers pairs in order of first appearance)
+        rank = pairs.groupby(['s', 't'], sort=False).ngroup().to_numpy()
+        last = ~pd.Series(rank).duplicated(keep='last').to_numpy()
+        src = pairs['s'].to_numpy()[last]
+        dst = pairs['t'].to_numpy()[last]
+        etype = pairs['type'].to_numpy()[last]
+        order_rank = rank[last]
+
+        out_order = np.lexsort((order_rank, src, etype))
+        self.src = src[out_order].astype(np.int64)
+        self.dst = dst[out_order].astype(np.int64)
+        self.etype = etype[out_order].astype(np.int64)
+        self.rank = order_rank[out_order]
+        self.type_start = np.searchsorted(self.etype, np.arange(n_types + 1))
+
+        in_order = np.lexsort((self.rank, self.dst, self.etype))
+        self.in_src = self.src[in_order]
+        in_dst = self.dst[in_order]
+
+        self.out_indptr = np.zeros((n_types, n + 1), dtype=np.int64)
+        self.in_indptr = np.zeros((n_types, n + 1), dtype=np.int64)
+        for t in range(n_types):
+            block = slice(self.type_start[t], self.type_start[t + 1])
+            self.out_indptr[t] = self.type_start[t] + np.searchsorted(self.src[block], np.arange(n + 1))
+            self.in_indptr[t] = self.type_start[t] + np.searchsorted(in_dst[block], np.arange(n + 1))
+
+    @classmethod
+    def from_network(cls, network):
+        """Build from a NetworkData; edge endpoints missing from the nodes are appended."""
+        edges = network.edges
+        ids = network.nodes['id'].tolist()
+        known = set(ids)
+        endpoints = np.column_stack([edges['source'].to_numpy(dtype=object),
+                                     edges['target'].to_numpy(dtype=object)]).ravel()
+        ids += [node for node in pd.unique(endpoints) if node not in known]
+        index = pd.Series(np.arange(len(ids)), index=ids)
+        index = index[~index.index.duplicated()]
+
+        type_names = pd.unique(edges['relationship_type'])
+        type_index = pd.Series(np.arange(len(type_names)), index=type_names)
+        return cls(
+            ids,
+            edges['source'].map(index).to_numpy(),
+            edges['target'].map(index).to_numpy(),
+            edges['relationship_type'].map(type_index).to_numpy(),
+            type_names,
+        )
+
+    def view(self, types=None, undirected=False):
+        """Zero-copy GraphView over `types` (names; default: all)."""
+        if types is None:
+            selected = tuple(range(len(self.type_names)))
+        else:
+            selected = tuple(sorted(self.type_index[name] for name in types if name in self.type_index))
+        return GraphView(self, selected, undirected)
+
+
+class GraphView:
+    """A relationship-type filter, optionally undirected, over a TypedGraph."""
+
+    def __init__(self, graph, types, undirected=False):
+        self.graph = graph
+        self.types = types
+        self.undirected = undirected
+
+    # -- derived views ---------------------------------------------------
+
+    def without(self, excluded):
+        """View without edges whose relationship type is in `excluded`."""
+        names = [self.graph.type_names[t] for t in self.types if self.graph.type_names[t] not in excluded]
+        return self.graph.view(names, self.undirected)
+
+    def only(self, included):
+        """View restricted to the relationship types in `included`."""
+        names = [self.graph.type_names[t] for t in self.types if self.graph.type_names[t] in included]
+        return self.graph.view(names, self.undirected)
+
+    def to_undirected(self):
+        return GraphView(self.graph, self.types, undirected=True)
+
+    # -- nodes and edges -------------------------------------------------
+
+    def nodes(self):
+        return self.graph.ids.tolist()
+
+    def number_of_nodes(self):
+        return len(self.graph.ids)
+
+    def __contains__(self, node):
+        return node in self.graph.index
+
+    def __len__(self):
+        return self.number_of_nodes()
+
+    def edge_positions(self):
+        """Positions (into the graph's outgoing arrays) of the view's directed edges."""
+        g = self.graph
+        if not self.types:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([np.arange(g.type_start[t], g.type_start[t + 1]) for t in self.types])
+
+    def edge_arrays(self):
+        """(source, target, type) index arrays of the directed edges, in DiGraph iteration order."""
+        g = self.graph
+        pos = self.edge_positions()
+        pos = pos[np.lexsort((g.rank[pos], g.src[pos]))]
+        return g.src[pos], g.dst[pos], g.etype[pos]
+
+    def undirected_pairs(self):
+        """Unique (low, high) node index pairs of the undirected view."""
+        src, dst, _ = self.edge_arrays()
+        pairs = np.unique(np.sort(np.column_stack([src, dst]), axis=1), axis=0)
+        return pairs[:, 0], pairs[:, 1]
+
+    def undirected_adjacency(self):
+        """
+        CSR (indptr, indices) of each node's distinct neighbours, ignoring
+        direction and self-loops. Neighbours are sorted by node index.
+        """
+        n = len(self.graph.ids)
+        low, high = self.undirected_pairs()
+        keep = low != high
+        src = np.concatenate([low[keep], high[keep]])
+        dst = np.concatenate([high[keep], low[keep]])
+        order = np.lexsort((dst, src))
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=n))])
+        return indptr, dst[order]
+
+    def number_of_edges(self):
+        if self.undirected:
+            return len(self.undirected_pairs()[0])
+        return int(sum(self.graph.type_start[t + 1] - self.graph.type_start[t] for t in self.types))
+
+    def edges(self, data=False):
+        """
+        Iterate edges as ids. Directed views yield (source, target) or, with
+        data=True, (source, target, {'relationship_type': ...}) like NetworkX.
+        """
+        ids, names = self.graph.ids, self.graph.type_names
+        if self.undirected:
+            low, high = self.undirected_pairs()
+            yield from zip(ids[low].tolist(), ids[high].tolist())
+            return
+        src, dst, etype = self.edge_arrays()
+        if data:
+            for s, t, e in zip(ids[src].tolist(), ids[dst].tolist(), etype.tolist()):
+                yield s, t, {'relationship_type': names[e]}
+        else:
+            yield from zip(ids[src].tolist(), ids[dst].tolist())
+
+    # -- degrees and neighbours -----------------------------------------
+
+    def _counts(self, indptr):
+        if not self.types:
+            return np.zeros(len(self.graph.ids), dtype=np.int64)
+        rows = indptr[list(self.types)]
+        return (rows[:, 1:] - rows[:, :-1]).sum(axis=0)
+
+    def out_degrees(self):
+        return self._counts(self.graph.out_indptr)
+
+    def in_degrees(self):
+        return self._counts(self.graph.in_indptr)
+
+    def degrees(self):
+        """
+        Degree of every node, in node order. Directed: in + out.
+        Undirected: distinct neighbours, with a self-loop counting twice.
+        """
+        if not self.undirected:
+            return self.out_degrees() + self.in_degrees()
+        n = len(self.graph.ids)
+        low, high = self.undirected_pairs()
+        return np.bincount(low, minlength=n) + np.bincount(high, minlength=n)
+
+    def degree(self, node=None):
+        """Degree of `node`, or a {node: degree} dict for all nodes."""
+        if node is None:
+            return dict(zip(self.nodes(), self.degrees().tolist()))
+        if not self.undirected:
+            return self.in_degree(node) + self.out_degree(node)
+        i = self.graph.index[node]
+        neighbours = self._neighbour_indices(i, out=True, into=True)
+        loops = int((neighbours == i).any())
+        return len(np.unique(neighbours)) + loops
+
+    def out_degree(self, node):
+        i = self.graph.index[node]
+        g = self.graph
+        return int(sum(g.out_indptr[t, i + 1] - g.out_indptr[t, i] for t in self.types))
+
+    def in_degree(self, node):
+        i = self.graph.index[node]
+        g = self.graph
+        return int(sum(g.in_indptr[t, i + 1] - g.in_indptr[t, i] for t in self.types))
+
+    def _neighbour_indices(self, i, out=True, into=False):
+        g = self.graph
+        parts = []
+        if out:
+            # Outgoing edges keep insertion order across types, like DiGraph
+            pos = np.concatenate([np.arange(g.out_indptr[t, i], g.out_indptr[t, i + 1]) for t in self.types]
+                                 or [np.zeros(0, dtype=np.int64)])
+            parts.append(g.dst[pos[np.argsort(g.rank[pos], kind='stable')]])
+        if into:
+            parts.extend(g.in_src[g.in_indptr[t, i]:g.in_indptr[t, i + 1]] for t in self.types)
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def successors(self, node):
+        i = self.graph.index[node]
+        return self.graph.ids[self._neighbour_indices(i, out=True)].tolist()
+
+    def predecessors(self, node):
+        i = self.graph.index[node]
+        return self.graph.ids[self._neighbour_indices(i, out=False, into=True)].tolist()
+
+    def neighbors(self, node):
+        """Successors (directed) or all distinct neighbours (undirected)."""
+        if not self.undirected:
+            return self.successors(node)
+        i = self.graph.index[node]
+        neighbours = pd.unique(self._neighbour_indices(i, out=True, into=True))
+        return self.graph.ids[neighbours].tolist()
+
+    # -- summary metrics -------------------------------------------------
+
+    def density(self):
+        n = self.number_of_nodes()
+        if n <= 1:
+            return 0.0
+        m = self.number_of_edges()
+        return (2 * m if self.undirected else m) / (n * (n - 1))
+
+    def degree_centrality(self):
+        """{node: degree / (n - 1)}, as nx.degree_centrality."""
+        n = self.number_of_nodes()
+        if n <= 1:
+            return {node: 1 for node in self.nodes()}
+        return dict(zip(self.nodes(), (self.degrees() * (1.0 / (n - 1))).tolist()))
+
+    def to_networkx(self):
+        """Materialize the view as an attribute-light nx.DiGraph / nx.Graph."""
+        G = nx.Graph() if self.undirected else nx.DiGraph()
+        G.add_nodes_from(self.nodes())
+        if self.undirected:
+            src, dst, _ = self.edge_arrays()
+            ids = self.graph.ids
+            G.add_edges_from(zip(ids[src].tolist(), ids[dst].tolist()))
+        else:
+            G.add_edges_from(self.edges(data=True))
+        return G
+
+
+def build_graph(network):
+    """Build the typed graph for `network` and return a view of all its edges."""
+    return TypedGraph.from_network(network).view()
+
+
+def without_relationships(G, excluded):
+    """View of G (all nodes kept) without edges whose type is in `excluded`."""
+    return G.without(excluded)
+
+
+def real_graph(G):
+    """G without hypothetical connections."""
+    return without_relationships(G, {HYPOTHETICAL_RELATIONSHIP})
+
+
+def sizing_graph(G):
+    """Real edges that count towards node size."""
+    return without_relationships(G, {HYPOTHETICAL_RELATIONSHIP, NON_SIZING_RELATIONSHIP})
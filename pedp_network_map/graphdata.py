@@ -0,0 +1,189 @@
+"""
+The map's nodes and edges as a separate, content-hashed columnar data file.
+
+PyVis writes every node and edge into the page as an object literal, so any
+data change also changes the page and evicts it from browser and CDN
+caches. With a data file, render_network() leaves the page as a shell and
+writes the graph next to it as `<name>.data.<sha256 prefix>.js`, plus a
+small unhashed pointer `<name>.data.js` that names the current data file:
+
+- nodes are stored per attribute (ids, labels, colours, x/y, ...). An
+  attribute that every node shares is stored once, and one with few
+  distinct values (colour, shape, font) as codes into a value list.
+- edges are integer `from`/`to` indices into the node ids plus a `type`
+  index into one style object per distinct edge style.
+- a clustered map also stores the cluster hierarchy (`lod`); the page
+  then opens with the collapsed view, as collapse_clusters() leaves it.
+
+The shell loads the pointer with a plain <script> tag (JSONP style, like
+the tooltip sidecar, so the page still works from disk). The pointer
+writes a parser-blocking <script> tag for the data file, so the data is
+in place before PyVis draws the network, and the shell rebuilds the
+vis.js node and edge objects from the columns. When the data changes
+only the pointer (a few dozen bytes, meant to be cached briefly) and the
+data file change: the shell stays byte-identical and keeps its cache
+entry, and the data file never changes under its name, so it can be
+cached indefinitely.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .overlays import Overlay
+
+DATA_SIDECAR_SUFFIX = '.data'
+DATA_POINTER_SUFFIX = '.data.js'
+DATA_CALLBACK = 'pedpGraphLoaded'
+POINTER_CALLBACK = 'pedpGraphSource'
+DATA_GLOBAL = 'pedpGraph'
+HASH_LENGTH = 12
+ENDPOINTS = ('from', 'to')
+
+
+def _key(value):
+    return json.dumps(value, sort_keys=True)
+
+
+def _column(values):
+    """One attribute for every row: a shared value, codes into distinct values, or a plain list."""
+    keys = [_key(value) for value in values]
+    distinct = dict.fromkeys(keys)
+    if len(distinct) == 1:
+        return {'value': values[0]}
+    if len(distinct) * 2 <= len(values):
+        index = {key: i for i, key in enumerate(distinct)}
+        return {'values': [json.loads(key) for key in distinct], 'codes': [index[key] for key in keys]}
+    return {'list': values}
+
+
+def columnar_payload(nodes, edges, **extra):
+    """
+    Encode PyVis node and edge dicts as columns.
+
+    Node attributes a node does not have are stored as null and left out
+    again when the page rebuilds the objects. `extra` entries are added
+    to the payload as they are (e.g. the cluster hierarchy).
+    """
+    ids = [node['id'] for node in nodes]
+    attributes = dict.fromkeys(key for node in nodes for key in node if key != 'id')
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    styles, types = {}, []
+    for edge in edges:
+        style = {key: value for key, value in edge.items() if key not in ENDPOINTS}
+        types.append(styles.setdefault(_key(style), len(styles)))
+    return {
+        'ids': ids,
+        'nodes': {key: _column([node.get(key) for node in nodes]) for key in attributes},
+        'edges': {
+            'from': [index[edge['from']] for edge in edges],
+            'to': [index[edge['to']] for edge in edges],
+            'type': types,
+        },
+        'edgeTypes': [json.loads(key) for key in styles],
+        **extra,
+    }
+
+
+def data_sidecar_path(page_path, data):
+    """`outputs/network_map.html` → `outputs/network_map.data.<hash>.js` for `data` (bytes)."""
+    page_path = Path(page_path)
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return page_path.with_name(f'{page_path.stem}{DATA_SIDECAR_SUFFIX}.{digest}.js')
+
+
+def write_graph_data(payload, page_path):
+    """
+    Write `payload` wrapped in the loader callback under its hashed name;
+    returns the path. Data files of earlier builds of the same page are
+    removed.
+    """
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    content = f"{DATA_CALLBACK}({data});\n".encode('utf-8')
+    sidecar_path = data_sidecar_path(page_path, content)
+    for old in sidecar_path.parent.glob(f'{Path(page_path).stem}{DATA_SIDECAR_SUFFIX}.*.js'):
+        if old != sidecar_path:
+            old.unlink()
+    sidecar_path.write_bytes(content)
+    return sidecar_path
+
+
+def pointer_content(data_name):
+    """The pointer file's text naming the data file `data_name` (relative to the page)."""
+    return f"{POINTER_CALLBACK}({json.dumps(data_name)});\n"
+
+
+def write_data_pointer(data_path, page_path):
+    """
+    Write `<page name>.data.js`, which loads the data file at `data_path`;
+    returns its path. Its name does not change, so the page that loads it
+    does not either.
+    """
+    page_path = Path(page_path)
+    pointer_path = page_path.with_name(page_path.stem + DATA_POINTER_SUFFIX)
+    pointer_path.write_text(pointer_content(Path(data_path).name), encoding='utf-8')
+    return pointer_path
+
+
+def data_loader(pointer_name):
+    """
+    Overlay for the end of <head>: defines the callback that rebuilds the
+    node and edge objects into window.pedpGraph, then loads the pointer,
+    which loads the data file.
+    """
+    return Overlay('graph-data', head=f"""<script type="text/javascript">
+window.{POINTER_CALLBACK} = function (src) {{
+    // Written while the page is parsed, so the data file runs before the
+    // network is drawn (an appended or async script would run after)
+    document.write('<script type="text/javascript" src=' + JSON.stringify(src) + '><\\/script>');
+}};
+window.{DATA_CALLBACK} = function (data) {{
+    function column(spec, i) {{
+        if ('value' in spec) return spec.value;
+        if ('codes' in spec) return spec.values[spec.codes[i]];
+        return spec.list[i];
+    }}
+    var keys = Object.keys(data.nodes);
+    var nodes = data.ids.map(function (id, i) {{
+        var node = {{id: id}};
+        keys.forEach(function (key) {{
+            var value = column(data.nodes[key], i);
+            if (value !== null) node[key] = value;
+        }});
+        return node;
+    }});
+    var edges = data.edges.type.map(function (type, e) {{
+        return Object.assign({{from: data.ids[data.edges.from[e]], to: data.ids[data.edges.to[e]]}},
+                             data.edgeTypes[type]);
+    }});
+    var graph = {{nodes: nodes, edges: edges, data: data}};
+    if (data.lod) {{
+        // Clustered map: open with the top-level clusters and the
+        // unclustered nodes; lod_script() draws the edges
+        // (copies, as the DataSet and the hierarchy had separate literals)
+        graph.lod = Object.assign({{nodes: nodes, edges: edges}}, data.lod);
+        graph.nodes = data.lod.clusters
+            .filter(function (cluster) {{ return cluster.parent < 0; }})
+            .map(function (cluster) {{ return cluster.node; }})
+            .concat(nodes.filter(function (node, i) {{ return data.lod.parent[i] < 0; }}))
+            .map(function (node) {{ return Object.assign({{}}, node); }});
+        graph.edges = [];
+    }}
+    window.{DATA_GLOBAL} = graph;
+}};
+</script>
+<script type="text/javascript" src={json.dumps(pointer_name)}></script>""")
+
+
+def shell_dumps(net):
+    """
+    JSON encoder for PyVis's template that writes references to the
+    loaded data instead of the node and edge literals of `net`.
+    """
+    def dumps(obj, **kwargs):
+        if obj is net.nodes:
+            return f'{DATA_GLOBAL}.nodes'
+        if obj is net.edges:
+            return f'{DATA_GLOBAL}.edges'
+        return json.dumps(obj, **kwargs)
+    return dumps
@@ -0,0 +1,259 @@
+"""
+Append-only history of the synced node and edge tables.
+
+Every sync used to overwrite nodes.csv and edges.csv, so past states were
+lost. `record_sync()` diffs the new tables against the rows that are
+currently open in data/history and appends only the difference to a log
+per table:
+
+    at,op,id,name,...          (nodes.log.csv)
+    2026-03-01T06:00:12+00:00,open,AGU,American Geophysical Union,...
+    2026-04-11T06:00:09+00:00,close,AGU,American Geophysical Union,...
+    2026-04-11T06:00:09+00:00,open,AGU,American Geophysical Union,...
+
+A row is one version of a node or edge: any attribute change closes the old
+row and opens the new one. Storage therefore grows with the number of
+changes, not the number of syncs, and existing lines are never rewritten.
+
+`load_history()` pairs each open with its close into a
+[valid_from, valid_to) interval (open rows have no valid_to) and keeps the
+intervals sorted by valid_from. The state at any time comes from a
+centered interval tree (IntervalTree): O(log n) nodes are visited and each
+contributes a contiguous slice of its start- or end-sorted intervals, so
+a snapshot costs the rows it returns plus a few binary searches, however
+long the history is. Node and edge counts over a whole time series come
+from two binary searches per point, so a time-lapse of growth never
+replays snapshots.
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .data import EDGE_COLUMNS, NODE_COLUMNS, PROJECT_DIR
+
+HISTORY_DIR = PROJECT_DIR / 'data' / 'history'
+# table -> (log file, columns)
+TABLES = {
+    'nodes': ('nodes.log.csv', NODE_COLUMNS),
+    'edges': ('edges.log.csv', EDGE_COLUMNS),
+}
+OPEN, CLOSE = 'open', 'close'
+_OPEN_END = np.iinfo(np.int64).max
+
+
+def _timestamp(when):
+    """UTC pd.Timestamp for a datetime/string; naive values are taken as UTC."""
+    when = pd.Timestamp(when)
+    return when.tz_localize('UTC') if when.tzinfo is None else when.tz_convert('UTC')
+
+
+def _as_text(frame, columns):
+    """`columns` of `frame` as strings, missing values and columns as ''."""
+    return pd.DataFrame({
+        column: frame[column].fillna('').astype(str).to_numpy() if column in frame else ''
+        for column in columns
+    }, index=range(len(frame)))
+
+
+def _occurrence(frame, columns):
+    """Number each row among identical rows, so duplicate rows stay distinct versions."""
+    return frame.groupby(columns, sort=False).cumcount()
+
+
+def read_log(history_dir, table):
+    """The raw log of `table` ('nodes' or 'edges'); empty if nothing was recorded yet."""
+    file_name, columns = TABLES[table]
+    path = Path(history_dir) / file_name
+    if not path.exists():
+        return pd.DataFrame(columns=['at', 'op', *columns])
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def intervals(log, columns):
+    """
+    Pair the opens and closes of a log into intervals.
+
+    Returns `columns` plus valid_from / valid_to (UTC, NaT while open),
+    sorted by valid_from. The k-th close of a row ends its k-th open.
+    """
+    log = log.copy()
+    log['at'] = pd.to_datetime(log['at'], utc=True)
+    log['_n'] = log.groupby([*columns, 'op'], sort=False).cumcount()
+    opens = log[log['op'] == OPEN].rename(columns={'at': 'valid_from'}).drop(columns='op')
+    closes = log[log['op'] == CLOSE][[*columns, '_n', 'at']].rename(columns={'at': 'valid_to'})
+    merged = opens.merge(closes, on=[*columns, '_n'], how='left')
+    return (merged.drop(columns='_n')
+                  .sort_values('valid_from', kind='stable')
+                  .reset_index(drop=True))
+
+
+def _append(path, rows):
+    header = not path.exists() or path.stat().st_size == 0
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        rows.to_csv(f, header=header, index=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def record_table(history_dir, table, frame, at):
+    """Append the opens/closes that turn the open rows of `table` into `frame`; returns (opened, closed)."""
+    file_name, columns = TABLES[table]
+    log = read_log(history_dir, table)
+    current = intervals(log, columns)
+    current = current.loc[current['valid_to'].isna(), columns].reset_index(drop=True)
+    current['_n'] = _occurrence(current, columns)
+    new = _as_text(frame, columns)
+    new['_n'] = _occurrence(new, columns)
+
+    diff = current.merge(new, on=[*columns, '_n'], how='outer', indicator=True)
+    closed = diff.loc[diff['_merge'] == 'left_only', columns]
+    opened = diff.loc[diff['_merge'] == 'right_only', columns]
+    if len(closed) or len(opened):
+        stamp = at.isoformat(timespec='seconds')
+        rows = pd.concat([closed.assign(op=CLOSE), opened.assign(op=OPEN)], ignore_index=True)
+        rows.insert(0, 'at', stamp)
+        _append(Path(history_dir) / file_name, rows[['at', 'op', *columns]])
+    return len(opened), len(closed)
+
+
+def record_sync(nodes_df, edges_df, history_dir=HISTORY_DIR, at=None):
+    """
+    Record one sync in the history; returns {table: (opened, closed)}.
+
+    `at` defaults to now. Recording the same tables twice appends nothing.
+    """
+    history_dir = Path(history_dir)
+    history_dir.mkdir(parents=True, exist_ok=True)
+    at = _timestamp(at if at is not None else datetime.now(timezone.utc))
+    return {
+        'nodes': record_table(history_dir, 'nodes', nodes_df, at),
+        'edges': record_table(history_dir, 'edges', edges_df, at),
+    }
+
+
+class IntervalTree:
+    """
+    Centered interval tree over half-open [start, end) int64 intervals.
+
+    Each node keeps the intervals that contain its center, sorted by start
+    and by end; intervals that end by the center go left, those that start
+    after it go right. The center is the median start, so the depth is
+    O(log n), and stab() returns the k intervals containing a point in
+    O(log n + k).
+    """
+
+    def __init__(self, starts, ends):
+        self.starts, self.ends = starts, ends
+        # (center, by start, sorted starts, by end, sorted ends, left, right)
+        self.nodes = []
+        self.root = self._build(np.flatnonzero(starts < ends))
+
+    def _build(self, index):
+        if not len(index):
+            return -1
+        starts, ends = self.starts[index], self.ends[index]
+        center = np.partition(starts, len(index) // 2)[len(index) // 2]
+        here = (starts <= center) & (ends > center)
+        left = self._build(index[ends <= center])
+        right = self._build(index[starts > center])
+        by_start = np.argsort(starts[here], kind='stable')
+        by_end = np.argsort(ends[here], kind='stable')
+        self.nodes.append((center, index[here][by_start], starts[here][by_start],
+                           index[here][by_end], ends[here][by_end], left, right))
+        return len(self.nodes) - 1
+
+    def stab(self, t):
+        """Sorted indices of the intervals with start <= t < end."""
+        found = []
+        node = self.root
+        while node >= 0:
+            center, by_start, starts, by_end, ends, left, right = self.nodes[node]
+            if t < center:
+                # Every interval here ends after the center, so after t
+                found.append(by_start[:np.searchsorted(starts, t, side='right')])
+                node = left
+            else:
+                # ... and starts by the center, so by t
+                found.append(by_end[np.searchsorted(ends, t, side='right'):])
+                node = right
+        return np.sort(np.concatenate(found)) if found else np.empty(0, dtype=np.intp)
+
+
+@dataclass
+class TableHistory:
+    """Intervals of one table, with the sorted arrays and interval tree used for lookups."""
+
+    rows: pd.DataFrame
+    starts: np.ndarray         # int64 ns, ascending (rows are sorted by valid_from)
+    ends: np.ndarray           # int64 ns per row, _OPEN_END while open
+    sorted_ends: np.ndarray
+    tree: IntervalTree
+
+    @classmethod
+    def from_intervals(cls, rows):
+        starts = rows['valid_from'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        valid_to = rows['valid_to']
+        ends = np.where(valid_to.isna(), _OPEN_END,
+                        valid_to.to_numpy(dtype='datetime64[ns]').astype(np.int64))
+        return cls(rows, starts, ends, np.sort(ends), IntervalTree(starts, ends))
+
+    def at(self, when):
+        """The rows valid at `when`: started at or before it, not yet ended."""
+        alive = self.tree.stab(_timestamp(when).value)
+        return self.rows.iloc[alive].reset_index(drop=True)
+
+
+@dataclass
+class History:
+    """Node and edge intervals loaded from a history directory."""
+
+    nodes: TableHistory
+    edges: TableHistory
+
+    @property
+    def first(self):
+        """Time of the first recorded sync, or None."""
+        return self.nodes.rows['valid_from'].min() if len(self.nodes.rows) else None
+
+    @property
+    def last(self):
+        """Time of the last recorded change, or None."""
+        times = pd.concat([self.nodes.rows['valid_from'], self.nodes.rows['valid_to'],
+                           self.edges.rows['valid_from'], self.edges.rows['valid_to']]).dropna()
+        return times.max() if len(times) else None
+
+    def snapshot(self, when):
+        """(nodes_df, edges_df) as synced at `when`, in the sync's column order."""
+        return (self.nodes.at(when)[NODE_COLUMNS],
+                self.edges.at(when)[EDGE_COLUMNS])
+
+    def timelapse(self, times):
+        """
+        Network size at each of `times`.
+
+        Returns one row per time with node/edge counts and how many
+        node/edge versions opened and closed since the previous time.
+        """
+        times = pd.DatetimeIndex([_timestamp(t) for t in times])
+        ns = times.as_unit('ns').asi8
+        frame = pd.DataFrame({'at': times})
+        for table, history in (('nodes', self.nodes), ('edges', self.edges)):
+            opened = np.searchsorted(history.starts, ns, side='right')
+            closed = np.searchsorted(history.sorted_ends, ns, side='right')
+            frame[table] = opened - closed
+            frame[f'{table}_opened'] = np.diff(opened, prepend=0)
+            frame[f'{table}_closed'] = np.diff(closed, prepend=0)
+        return frame
+
+
+def load_history(history_dir=HISTORY_DIR):
+    """Load the node and edge intervals recorded in `history_dir`."""
+    return History(*(
+        TableHistory.from_intervals(intervals(read_log(history_dir, table), columns))
+        for table, (_, columns) in TABLES.items()
+    ))
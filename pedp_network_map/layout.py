@@ -0,0 +1,219 @@
+"""
+Offline force-directed layout for node_positions.csv.
+
+Connected nodes are laid out with a NumPy-vectorized Fruchterman-Reingold
+simulation. Small graphs use exact pairwise repulsion; large graphs use
+a one-level Barnes-Hut grid, where distant nodes act through their cell's
+centre of mass. A weak pull towards per-category anchors keeps connected
+funders slightly bottom-right and everyone else slightly top-left.
+
+Isolated nodes keep their regional blocks: funders bottom-right, and
+non-funders top-left. Both blocks sit just outside the connected core.
+
+PyVis uses pixel coordinates with the origin at the centre of the canvas
+and +y pointing down.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Nodes above this count use the Barnes-Hut grid instead of exact repulsion
+EXACT_REPULSION_LIMIT = 3000
+BLOCK_SIZE = 1024          # rows per chunk of the pairwise distance matrix
+
+DEFAULT_ITERATIONS = 300
+ANCHOR_STRENGTH = 0.05     # pull towards the category anchors (0 disables)
+
+# Connected core: half-width in pixels, grown with sqrt(n) for big graphs
+MIN_CORE_RADIUS = 250
+CORE_SPACING = 40
+
+# Category bias for connected nodes, as a fraction of the core radius
+FUNDER_ANCHOR = (0.3, 0.2)        # centre-right, centre-bottom
+NON_FUNDER_ANCHOR = (-0.3, -0.2)  # centre-left, centre-top
+
+# Isolated blocks: rows of 5 with 30px spacing, as before
+BLOCK_COLUMNS = 5
+BLOCK_SPACING = 30
+ISOLATED_FUNDER_CORNER = (450, 250)
+ISOLATED_NON_FUNDER_CORNER = (-500, -300)
+CORE_MARGIN = 100
+
+
+def _repulsion_exact(pos, k2):
+    """Sum of k²/d repulsion from every other node, in row chunks."""
+    n = len(pos)
+    x, y = pos[:, 0], pos[:, 1]
+    disp = np.zeros_like(pos)
+    for start in range(0, n, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, n)
+        dx = x[start:stop, None] - x[None, :]
+        dy = y[start:stop, None] - y[None, :]
+        inv = dx * dx + dy * dy
+        np.maximum(inv, 1e-9, out=inv)
+        np.divide(k2, inv, out=inv)
+        inv[np.arange(stop - start), np.arange(start, stop)] = 0
+        disp[start:stop, 0] = (dx * inv).sum(axis=1)
+        disp[start:stop, 1] = (dy * inv).sum(axis=1)
+    return disp
+
+
+def _repulsion_grid(pos, k2, cells):
+    """
+    One-level Barnes-Hut: exact repulsion inside each node's own cell,
+    centre-of-mass repulsion from every other cell.
+
+    Cells are balanced rather than uniform: nodes are split into `cells`
+    equal slabs by x, and each slab into `cells` equal runs by y, so
+    outliers cannot crowd everyone else into a single cell.
+    """
+    n = len(pos)
+    rank_x = np.empty(n, dtype=np.int64)
+    rank_x[np.argsort(pos[:, 0], kind='stable')] = np.arange(n)
+    slab = rank_x * cells // n
+    order = np.lexsort((pos[:, 1], slab))
+    slab_size = np.bincount(slab, minlength=cells)
+    slab_start = np.concatenate([[0], np.cumsum(slab_size)[:-1]])
+    rank_y = np.empty(n, dtype=np.int64)
+    rank_y[order] = np.arange(n) - slab_start[slab[order]]
+    cell = slab * cells + rank_y * cells // slab_size[slab]
+
+    _, cell_of_node, mass = np.unique(cell, return_inverse=True, return_counts=True)
+    centroid = np.stack([
+        np.bincount(cell_of_node, weights=pos[:, 0]) / mass,
+        np.bincount(cell_of_node, weights=pos[:, 1]) / mass,
+    ], axis=1)
+
+    # Far field: every node against every other cell's centre of mass
+    disp = np.zeros_like(pos)
+    for start in range(0, n, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, n)
+        dx = pos[start:stop, 0, None] - centroid[None, :, 0]
+        dy = pos[start:stop, 1, None] - centroid[None, :, 1]
+        weight = dx * dx + dy * dy
+        np.maximum(weight, 1e-9, out=weight)
+        np.divide(mass * k2, weight, out=weight)
+        weight[np.arange(stop - start), cell_of_node[start:stop]] = 0
+        disp[start:stop, 0] = (dx * weight).sum(axis=1)
+        disp[start:stop, 1] = (dy * weight).sum(axis=1)
+
+    # Near field: exact pairs within each cell
+    order = np.argsort(cell_of_node, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(mass)])
+    for c in np.flatnonzero(mass > 1):
+        members = order[bounds[c]:bounds[c + 1]]
+        disp[members] += _repulsion_exact(pos[members], k2)
+    return disp
+
+
+def force_layout(n_nodes, sources, targets, anchors=None, iterations=DEFAULT_ITERATIONS,
+                 anchor_strength=ANCHOR_STRENGTH, seed=0):
+    """
+    Fruchterman-Reingold layout of `n_nodes` nodes with undirected edges
+    given as index arrays `sources` / `targets`.
+
+    Works in units of the ideal edge length (k = 1) and returns an
+    (n_nodes, 2) array centred on the origin. `anchors` is an optional
+    (n_nodes, 2) array of per-node attraction points in the same units.
+    """
+    rng = np.random.default_rng(seed)
+    if n_nodes == 0:
+        return np.zeros((0, 2))
+
+    radius = np.sqrt(n_nodes)
+    pos = rng.uniform(-radius / 2, radius / 2, size=(n_nodes, 2))
+    if anchors is not None:
+        pos += anchors
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    # ~sqrt(n) cells balances far-field (n × cells) and near-field (n² / cells) work
+    cells = max(2, int(round(n_nodes ** 0.25)))
+
+    temperature = radius / 4
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if n_nodes > EXACT_REPULSION_LIMIT:
+            disp = _repulsion_grid(pos, 1.0, cells)
+        else:
+            disp = _repulsion_exact(pos, 1.0)
+
+        # Attraction d²/k along every edge, accumulated per endpoint
+        delta = pos[sources] - pos[targets]
+        dist = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        pull = delta * dist[:, None]
+        for axis in range(2):
+            disp[:, axis] -= np.bincount(sources, weights=pull[:, axis], minlength=n_nodes)
+            disp[:, axis] += np.bincount(targets, weights=pull[:, axis], minlength=n_nodes)
+
+        # Gravity: towards the anchors, or the centre, so components stay together
+        centre = anchors if anchors is not None else 0.0
+        disp += anchor_strength * (centre - pos)
+
+        # Move at most `temperature` per step
+        length = np.maximum(np.sqrt(np.einsum('ij,ij->i', disp, disp)), 1e-9)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return pos - pos.mean(axis=0)
+
+
+def _block(count, corner, step_x, step_y):
+    """Rows of BLOCK_COLUMNS nodes starting at `corner`, growing by step_x / step_y."""
+    i = np.arange(count)
+    return np.stack([corner[0] + (i % BLOCK_COLUMNS) * step_x,
+                     corner[1] + (i // BLOCK_COLUMNS) * step_y], axis=1)
+
+
+def calculate_positions(nodes_df, edges_df, iterations=DEFAULT_ITERATIONS, seed=0):
+    """
+    Return a positions frame (id, x, y, fixed) for every node in `nodes_df`.
+
+    A node counts as connected if it appears in any edge. Connected nodes
+    get force-directed coordinates scaled to the core radius; isolated
+    funders and non-funders get the bottom-right / top-left blocks.
+    """
+    ids = nodes_df['id'].to_numpy()
+    is_funder = (nodes_df['category'] == 'Funder').to_numpy()
+    connected = np.isin(ids, pd.concat([edges_df['source'], edges_df['target']]).unique())
+
+    # Index the connected subgraph; undirected, without self-loops or repeats
+    core_ids = ids[connected]
+    index = pd.Series(np.arange(len(core_ids)), index=core_ids)
+    index = index[~index.index.duplicated()]
+    pairs = pd.DataFrame({'s': edges_df['source'].map(index), 't': edges_df['target'].map(index)})
+    pairs = pairs.dropna().astype(np.int64)
+    pairs = pairs[pairs['s'] != pairs['t']]
+    pairs = pd.DataFrame(np.sort(pairs.to_numpy(), axis=1), columns=['s', 't']).drop_duplicates()
+
+    n_core = len(core_ids)
+    core_radius = max(MIN_CORE_RADIUS, CORE_SPACING * np.sqrt(n_core))
+    unit_radius = np.sqrt(max(n_core, 1))
+    anchors = np.where(is_funder[connected][:, None],
+                       np.array(FUNDER_ANCHOR), np.array(NON_FUNDER_ANCHOR)) * unit_radius
+    core = force_layout(n_core, pairs['s'], pairs['t'], anchors=anchors,
+                        iterations=iterations, seed=seed)
+    if n_core:
+        extent = np.abs(core).max()
+        core = core * (core_radius / extent if extent > 0 else 0)
+
+    # Isolated blocks start at the old corners, pushed out past the core
+    funder_corner = (max(ISOLATED_FUNDER_CORNER[0], core_radius + CORE_MARGIN),
+                     max(ISOLATED_FUNDER_CORNER[1], core_radius + CORE_MARGIN))
+    non_funder_corner = (min(ISOLATED_NON_FUNDER_CORNER[0], -core_radius - CORE_MARGIN),
+                         min(ISOLATED_NON_FUNDER_CORNER[1], -core_radius - CORE_MARGIN))
+    isolated_funders = ~connected & is_funder
+    isolated_non_funders = ~connected & ~is_funder
+
+    xy = np.zeros((len(ids), 2))
+    xy[connected] = core
+    xy[isolated_funders] = _block(isolated_funders.sum(), funder_corner,
+                                  BLOCK_SPACING, BLOCK_SPACING)
+    xy[isolated_non_funders] = _block(isolated_non_funders.sum(), non_funder_corner,
+                                      -BLOCK_SPACING, -BLOCK_SPACING)
+
+    return pd.DataFrame({
+        'id': ids,
+        'x': np.rint(xy[:, 0]).astype(np.int64),
+        'y': np.rint(xy[:, 1]).astype(np.int64),
+        'fixed': False,
+    })
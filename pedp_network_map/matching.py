@@ -0,0 +1,208 @@
+"""
+Fuzzy organization-name matching over a trigram inverted index.
+
+Names are normalized (case, accents, punctuation, "&", legal suffixes)
+and split into tokens; each token padded with spaces contributes its
+character trigrams. Two names score the Dice coefficient of their trigram
+sets, 2·|A∩B| / (|A|+|B|), so word order does not matter and a short name
+inside a longer one ("Data" in "Open Data Foundation") scores low instead
+of matching outright.
+
+Lookups use prefix filtering: a name can only reach `threshold` if it
+shares one of the query's rarest trigrams, so only those posting lists are
+read and the candidates are then scored exactly.
+"""
+
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+MATCH_THRESHOLD = 0.5       # lowest score returned as a candidate
+KNOWN_THRESHOLD = 0.8       # extract_new_orgs treats an affiliation as known from here
+DUPLICATE_THRESHOLD = 0.75  # find_duplicates reports pairs from here
+
+LEGAL_SUFFIXES = {'inc', 'incorporated', 'llc', 'ltd', 'co', 'corp', 'corporation'}
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name):
+    """Lowercase ASCII words of `name`, without 'the' and legal suffixes."""
+    if name is None or (isinstance(name, float) and math.isnan(name)):
+        return ''
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    tokens = _NON_WORD.sub(' ', text.lower().replace('&', ' and ')).split()
+    if tokens and tokens[0] == 'the':
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def trigrams(normalized):
+    """Set of character trigrams of each space-padded token."""
+    grams = set()
+    for token in normalized.split():
+        padded = f' {token} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@dataclass
+class Match:
+    """One ranked candidate for a query name."""
+
+    query: str
+    key: str
+    name: str
+    score: float
+
+
+class NameIndex:
+    """
+    Trigram index over names, each with a key (e.g. the node id).
+
+    A key may appear under several names (a node's name and its
+    organization); results keep the best-scoring name per key.
+    """
+
+    def __init__(self, names, keys=None):
+        names = [str(name) for name in names]
+        keys = names if keys is None else [str(key) for key in keys]
+        normalized = [normalize_name(name) for name in names]
+        keep = [i for i, norm in enumerate(normalized) if norm]
+        self.names = [names[i] for i in keep]
+        self.keys = [keys[i] for i in keep]
+        self.normalized = [normalized[i] for i in keep]
+
+        self.gram_ids = {}
+        entry_grams = [sorted(self.gram_ids.setdefault(g, len(self.gram_ids)) for g in trigrams(norm))
+                       for norm in self.normalized]
+        sizes = np.array([len(grams) for grams in entry_grams], dtype=np.int64)
+        # Entry -> sorted gram ids, and gram -> entries (postings), both CSR
+        self.entry_ptr = np.r_[0, np.cumsum(sizes)]
+        self.entry_grams = (np.concatenate(entry_grams).astype(np.int64) if entry_grams
+                            else np.empty(0, dtype=np.int64))
+        entries = np.repeat(np.arange(len(entry_grams)), sizes)
+        order = np.argsort(self.entry_grams, kind='stable')
+        self.postings = entries[order]
+        self.frequency = np.bincount(self.entry_grams, minlength=len(self.gram_ids))
+        self.posting_ptr = np.r_[0, np.cumsum(self.frequency)]
+        self.sizes = sizes
+        # Scratch masks reused by every lookup
+        self._query_mask = np.zeros(len(self.gram_ids), dtype=bool)
+        self._candidate_mask = np.zeros(len(self.names), dtype=bool)
+
+        self.exact = {}
+        for i, norm in enumerate(self.normalized):
+            self.exact.setdefault(norm, []).append(i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _scores(self, query_grams, threshold):
+        """(entry indices, Dice scores) of entries that can reach `threshold`."""
+        known = np.array(sorted(self.gram_ids[g] for g in query_grams if g in self.gram_ids),
+                         dtype=np.int64)
+        n_query = len(query_grams)
+        if not len(known):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # Dice >= t needs an overlap of at least t·|q| / (2 - t) trigrams,
+        # so a match must contain one of the |q| - that + 1 rarest ones
+        min_overlap = max(1, math.ceil(threshold * n_query / (2 - threshold) - 1e-9))
+        prefix = n_query - min_overlap + 1
+        if prefix <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        rarest = known[np.argsort(self.frequency[known], kind='stable')[:prefix]]
+        for g in rarest:
+            self._candidate_mask[self.postings[self.posting_ptr[g]:self.posting_ptr[g + 1]]] = True
+        candidates = np.flatnonzero(self._candidate_mask)
+        self._candidate_mask[candidates] = False
+
+        # Exact overlap of every candidate's trigrams with the query's
+        starts = self.entry_ptr[candidates]
+        lengths = self.sizes[candidates]
+        offsets = np.cumsum(lengths) - lengths
+        gather = np.repeat(starts - offsets, lengths) + np.arange(offsets[-1] + lengths[-1])
+        self._query_mask[known] = True
+        hits = self._query_mask[self.entry_grams[gather]]
+        self._query_mask[known] = False
+        overlap = np.add.reduceat(hits.astype(np.int64), offsets)
+        scores = 2 * overlap / (n_query + self.sizes[candidates])
+        keep = scores >= threshold
+        return candidates[keep], scores[keep]
+
+    def search(self, name, limit=5, threshold=MATCH_THRESHOLD):
+        """Up to `limit` Matches for `name`, best first, one per key."""
+        normalized = normalize_name(name)
+        if not normalized:
+            return []
+        entries, scores = self._scores(trigrams(normalized), threshold)
+        for i in self.exact.get(normalized, ()):
+            scores = np.r_[scores, 1.0]
+            entries = np.r_[entries, i]
+
+        best = {}
+        for i in np.argsort(-scores, kind='stable'):
+            key = self.keys[entries[i]]
+            if key not in best:
+                best[key] = Match(str(name), key, self.names[entries[i]], round(float(scores[i]), 4))
+                if len(best) == limit:
+                    break
+        return list(best.values())
+
+    def match_all(self, names, limit=3, threshold=MATCH_THRESHOLD):
+        """
+        DataFrame of ranked candidates for every name: query, rank, key,
+        name, score. Names without a candidate get one row with rank 0.
+        """
+        rows = []
+        cache = {}
+        for query in names:
+            normalized = normalize_name(query)
+            if normalized not in cache:
+                cache[normalized] = self.search(query, limit=limit, threshold=threshold)
+            matches = cache[normalized]
+            if not matches:
+                rows.append({'query': query, 'rank': 0, 'key': None, 'name': None, 'score': 0.0})
+            for rank, match in enumerate(matches, start=1):
+                rows.append({'query': query, 'rank': rank, 'key': match.key,
+                             'name': match.name, 'score': match.score})
+        return pd.DataFrame(rows, columns=['query', 'rank', 'key', 'name', 'score'])
+
+
+def node_index(*frames):
+    """NameIndex over the `name` and `organization` of node-shaped frames, keyed by id."""
+    names, keys = [], []
+    for frame in frames:
+        for column in ('name', 'organization'):
+            present = frame[column].notna().to_numpy()
+            names.extend(frame[column].to_numpy()[present])
+            keys.extend(frame['id'].to_numpy()[present])
+    return NameIndex(names, keys)
+
+
+def find_duplicates(nodes_df, threshold=DUPLICATE_THRESHOLD, limit=5):
+    """
+    Likely duplicate rows in a node table: pairs of different ids whose
+    names or organizations score at least `threshold`, best first.
+    """
+    index = node_index(nodes_df)
+    pairs = {}
+    for key, name in zip(index.keys, index.names):
+        for match in index.search(name, limit=limit + 1, threshold=threshold):
+            if match.key == key:
+                continue
+            (a, name_a), (b, name_b) = sorted([(key, name), (match.key, match.name)])
+            if match.score > pairs.get((a, b), (0,))[0]:
+                pairs[a, b] = (match.score, name_a, name_b)
+
+    rows = [{'id_a': a, 'id_b': b, 'name_a': name_a, 'name_b': name_b, 'score': score}
+            for (a, b), (score, name_a, name_b) in pairs.items()]
+    columns = ['id_a', 'id_b', 'name_a', 'name_b', 'score']
+    return (pd.DataFrame(rows, columns=columns)
+            .sort_values(['score', 'id_a', 'id_b'], ascending=[False, True, True], ignore_index=True))
@@ -0,0 +1,229 @@
+"""
+Page overlays (title, banner, watermark, legend) added to rendered maps.
+
+An overlay is a block of HTML for the end of <head>, the start of <body>
+and/or the end of <body>. Every inserted block is wrapped in marker
+comments on their own lines:
+
+    <!-- pedp-overlay:banner -->
+    ...
+    <!-- /pedp-overlay:banner -->
+
+Patching first drops any existing block of the same overlay, so applying
+overlays twice gives the same page. Pages are patched line by line, with
+no parsing, so a file can be streamed through patch_file().
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+MARKER_PREFIX = 'pedp-overlay:'
+_MARKER = re.compile(r'^\s*<!-- (/?)pedp-overlay:([\w-]+) -->\s*$')
+_TITLE = re.compile(r'<title>.*?</title>')
+_BODY_TAG = re.compile(r'<body\b[^>]*>')
+
+
+@dataclass(frozen=True)
+class Overlay:
+    """HTML inserted into a page; `title` also replaces the page's <title>."""
+
+    name: str
+    head: str = ''
+    body_start: str = ''
+    body_end: str = ''
+    title: str = None
+
+
+def _block(name, content):
+    content = content.strip('\n')
+    return f"<!-- {MARKER_PREFIX}{name} -->\n{content}\n<!-- /{MARKER_PREFIX}{name} -->\n"
+
+
+def _insert_before(line, anchor, block):
+    """Put `block` before the first `anchor` in `line`, starting on a line of its own."""
+    before, _, after = line.partition(anchor)
+    if before.strip():
+        return f"{before}\n{block}{anchor}{after}"
+    return f"{block}{before}{anchor}{after}"
+
+
+def _insert_after(line, match, block):
+    """Put `block` right after `match` in `line`, on lines of its own."""
+    head, rest = line[:match.end()], line[match.end():]
+    if rest.strip():
+        return f"{head}\n{block}{rest}"
+    return f"{head}{rest}{block}" if rest.endswith('\n') else f"{head}\n{block}"
+
+
+def patch_lines(lines, overlays):
+    """
+    Yield the lines of a page with `overlays` applied.
+
+    Existing blocks of the same overlays are dropped. If an overlay has a
+    title, any unmarked <title> on a single line is removed.
+    """
+    names = {overlay.name for overlay in overlays}
+    title = next((overlay.title for overlay in overlays if overlay.title), None)
+    head = ''.join(_block(o.name, o.head) for o in overlays if o.head)
+    if title:
+        head = _block('title', f"<title>{title}</title>") + head
+        names.add('title')
+    body_start = ''.join(_block(o.name, o.body_start) for o in overlays if o.body_start)
+    body_end = ''.join(_block(o.name, o.body_end) for o in overlays if o.body_end)
+
+    skipping = None
+    for line in lines:
+        marker = _MARKER.match(line)
+        if skipping is not None:
+            if marker and marker.group(1) == '/' and marker.group(2) == skipping:
+                skipping = None
+            continue
+        if marker and not marker.group(1) and marker.group(2) in names:
+            skipping = marker.group(2)
+            continue
+
+        if title and '<title>' in line:
+            line = _TITLE.sub('', line, count=1)
+            if not line.strip():
+                continue
+        if head and '</head>' in line:
+            line = _insert_before(line, '</head>', head)
+            head = ''
+        if body_start:
+            match = _BODY_TAG.search(line)
+            if match:
+                line = _insert_after(line, match, body_start)
+                body_start = ''
+        if body_end and '</body>' in line:
+            line = _insert_before(line, '</body>', body_end)
+            body_end = ''
+        yield line
+
+
+def apply_overlays(html, overlays):
+    """Return `html` with `overlays` applied (see patch_lines)."""
+    if not overlays:
+        return html
+    return ''.join(patch_lines(html.splitlines(keepends=True), overlays))
+
+
+def patch_file(path, overlays):
+    """Apply `overlays` to the page at `path`, streaming it through a temporary file."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(path, encoding='utf-8') as source, open(tmp_path, 'w', encoding='utf-8') as out:
+        out.writelines(patch_lines(source, overlays))
+    os.replace(tmp_path, path)
+    return path
+
+
+HYPOTHETICAL_TITLE = "PEDP Network - Hypothetical Future State (Scenario Analysis)"
+
+HYPOTHETICAL_BANNER = Overlay('banner', body_start="""
+<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 15px;
+            text-align: center;
+            font-size: 18px;
+            font-weight: bold;
+            border-bottom: 3px solid #999;
+            margin: 0;
+            position: sticky;
+            top: 0;
+            z-index: 9999;">
+    🔮 HYPOTHETICAL FUTURE STATE - NOT CURRENT NETWORK
+    <div style="font-size: 14px; margin-top: 5px; font-weight: normal;">
+        Scenario analysis showing potential network connectivity through intermediary organizations
+    </div>
+</div>
+""", title=HYPOTHETICAL_TITLE)
+
+HYPOTHETICAL_WATERMARK = Overlay('watermark', head="""
+<style>
+/* Watermark overlay */
+body::before {
+    content: "SCENARIO ANALYSIS";
+    position: fixed;
+    top: 50%;
+    left: 50%;
+    transform: translate(-50%, -50%) rotate(-45deg);
+    font-size: 120px;
+    color: rgba(150, 150, 150, 0.1);
+    z-index: -1;
+    pointer-events: none;
+    font-weight: bold;
+    white-space: nowrap;
+}
+
+/* Update canvas background to light grey */
+#mynetwork {
+    background-color: #f8f8f8 !important;
+}
+</style>
+""")
+
+HYPOTHETICAL_LEGEND = Overlay('legend', head="""
+<style>
+/* Legend for hypothetical edges */
+.hypothetical-legend {
+    position: absolute;
+    bottom: 20px;
+    right: 20px;
+    background: rgba(255, 255, 255, 0.95);
+    padding: 15px;
+    border: 2px solid #999;
+    border-radius: 8px;
+    font-family: Arial, sans-serif;
+    font-size: 14px;
+    z-index: 1000;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.15);
+}
+
+.hypothetical-legend h4 {
+    margin: 0 0 10px 0;
+    font-size: 16px;
+    color: #333;
+}
+
+.hypothetical-legend .legend-item {
+    margin: 5px 0;
+    display: flex;
+    align-items: center;
+}
+
+.hypothetical-legend .legend-line {
+    width: 40px;
+    height: 2px;
+    margin-right: 10px;
+    border-top: 2px dashed;
+}
+
+.hypothetical-legend .real-line {
+    border-color: #3498db;
+    border-style: solid;
+}
+
+.hypothetical-legend .hyp-line {
+    border-color: #999999;
+}
+</style>
+""", body_end="""
+<div class="hypothetical-legend">
+    <h4>Edge Types</h4>
+    <div class="legend-item">
+        <div class="legend-line real-line"></div>
+        <span>Current relationships</span>
+    </div>
+    <div class="legend-item">
+        <div class="legend-line hyp-line"></div>
+        <span>Hypothetical connections</span>
+    </div>
+    <div style="margin-top: 10px; padding-top: 10px; border-top: 1px solid #ddd; font-size: 12px; color: #666;">
+        Grey dashed lines = potential future partnerships
+    </div>
+</div>
+""")
+
+HYPOTHETICAL_OVERLAYS = (HYPOTHETICAL_BANNER, HYPOTHETICAL_WATERMARK, HYPOTHETICAL_LEGEND)
@@ -0,0 +1,311 @@
+"""
+`pedp-pipeline`: run the build stages that are out of date.
+
+Each stage declares the files it reads and writes. A stage depends on the
+stages that write its inputs, which gives the DAG:
+
+    sync → positions → hypothetical → render-hypothetical
+              └──────────────────────→ render-current
+
+After a stage succeeds, the SHA-256 of its command, inputs and outputs is
+recorded in data/cache/pipeline.json. On the next run a stage is skipped
+when that digest is unchanged and its outputs are still the files it
+wrote. Stages whose dependencies are done run in parallel, so the two
+renders overlap. The sync has no file inputs and always runs; it exits
+with EXIT_NO_CHANGE when the sheet did not change, which leaves its
+outputs, and so everything downstream, untouched.
+
+The hypothetical scenario is written as a delta on the current page
+(outputs/network_map.scenario.js, see delta.py), which carries the
+banner/watermark overlays, so there is no separate watermark stage.
+
+With --profile-dir, every stage writes its own per-stage profile there
+(see profiling.py) and the pipeline adds pipeline.json with the wall time
+of each stage; --trace also merges all the Chrome traces into
+build.trace.json.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import profiling
+from .data import PROJECT_DIR
+from .sheets import EXIT_NO_CHANGE
+
+STATE_FILE = PROJECT_DIR / 'data' / 'cache' / 'pipeline.json'
+STATE_VERSION = 1
+HASH_CHUNK = 1024 * 1024
+
+PROCESSED = 'data/processed/'
+PACKAGE = ['pedp_network_map/*.py']
+
+
+@dataclass
+class Stage:
+    """One pipeline step: a command run from the project directory."""
+
+    name: str
+    command: list
+    inputs: list = field(default_factory=list)    # paths or globs, relative to the project
+    outputs: list = field(default_factory=list)
+    ok_codes: tuple = (0,)
+
+
+STAGES = [
+    Stage('sync', [sys.executable, 'scripts/sync_from_sheets.py'],
+          outputs=[PROCESSED + 'nodes.csv', PROCESSED + 'edges.csv', PROCESSED + 'colors.csv'],
+          ok_codes=(0, EXIT_NO_CHANGE)),
+    Stage('positions', [sys.executable, 'scripts/calculate_node_positions.py'],
+          inputs=[PROCESSED + 'nodes.csv', PROCESSED + 'edges.csv', 'scripts/calculate_node_positions.py',
+                  *PACKAGE],
+          outputs=[PROCESSED + 'node_positions.csv']),
+    Stage('hypothetical', [sys.executable, 'scripts/generate_hypothetical_network.py'],
+          inputs=[PROCESSED + 'nodes.csv', PROCESSED + 'edges.csv', PROCESSED + 'node_positions.csv',
+                  PROCESSED + 'colors.csv', 'scripts/generate_hypothetical_network.py', *PACKAGE],
+          outputs=[PROCESSED + 'nodes_hypothetical.csv', PROCESSED + 'edges_hypothetical.csv',
+                   PROCESSED + 'node_positions_hypothetical.csv']),
+    Stage('render-current', [sys.executable, '-m', 'pedp_network_map.cli', '--skip-hypothetical'],
+          inputs=[PROCESSED + 'nodes.csv', PROCESSED + 'edges.csv', PROCESSED + 'node_positions.csv',
+                  PROCESSED + 'colors.csv', *PACKAGE],
+          outputs=['outputs/network_map.html', 'outputs/network_map.tooltips.js',
+                   'outputs/network_map.search.js', 'outputs/network_map.data.js',
+                   'outputs/network_map.data.*.js',
+                   'outputs/centrality.csv']),
+    Stage('render-hypothetical', [sys.executable, '-m', 'pedp_network_map.cli', '--skip-current'],
+          inputs=[PROCESSED + 'nodes.csv', PROCESSED + 'edges.csv', PROCESSED + 'node_positions.csv',
+                  PROCESSED + 'colors.csv', PROCESSED + 'nodes_hypothetical.csv',
+                  PROCESSED + 'edges_hypothetical.csv', PROCESSED + 'node_positions_hypothetical.csv',
+                  *PACKAGE],
+          outputs=['outputs/network_map.scenario.js', 'outputs/network_map_hypothetical.html']),
+]
+
+
+def expand(patterns, root=PROJECT_DIR):
+    """Files matching `patterns`, sorted, as paths relative to `root`."""
+    paths = set()
+    for pattern in patterns:
+        if any(char in pattern for char in '*?['):
+            paths.update(path.relative_to(root).as_posix() for path in root.glob(pattern) if path.is_file())
+        else:
+            paths.add(pattern)
+    return sorted(paths)
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def digests(patterns, root=PROJECT_DIR):
+    """{relative path: digest or None} for the files matching `patterns`."""
+    return {path: file_digest(root / path) for path in expand(patterns, root)}
+
+
+def input_key(stage, root=PROJECT_DIR):
+    """Digest of a stage's command and input contents."""
+    payload = json.dumps({'command': stage.command[1:], 'inputs': digests(stage.inputs, root)},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def dependencies(stages):
+    """{stage name: names of the stages that write its inputs}."""
+    writers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            writers[path] = stage.name
+    return {stage.name: sorted({writers[path] for path in stage.inputs
+                                if path in writers and writers[path] != stage.name})
+            for stage in stages}
+
+
+def load_state(path=STATE_FILE):
+    try:
+        state = json.loads(path.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return state.get('stages', {}) if state.get('version') == STATE_VERSION else {}
+
+
+def save_state(stages_state, path=STATE_FILE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps({'version': STATE_VERSION, 'stages': stages_state}, indent=2),
+                        encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def up_to_date(stage, recorded, root=PROJECT_DIR):
+    """
+    True if the stage's inputs and outputs match the last successful run.
+    Stages without inputs (the sync) are never up to date.
+    """
+    if not recorded or not stage.inputs or recorded.get('inputs') != input_key(stage, root):
+        return False
+    outputs = digests(stage.outputs, root)
+    return None not in outputs.values() and outputs == recorded.get('outputs')
+
+
+def run_stage(stage, root=PROJECT_DIR, env=None):
+    """Run a stage's command; returns (return code, seconds, combined output)."""
+    start = time.perf_counter()
+    result = subprocess.run(stage.command, cwd=root, capture_output=True, text=True, env=env)
+    return result.returncode, time.perf_counter() - start, result.stdout + result.stderr
+
+
+def profile_env(stage, profile_dir, trace=False):
+    """Environment that makes the stage's script profile itself into `profile_dir`."""
+    return {**os.environ, profiling.ENV_DIR: str(Path(profile_dir).resolve()),
+            profiling.ENV_NAME: stage.name, profiling.ENV_TRACE: '1' if trace else '0'}
+
+
+def run_pipeline(stages=STAGES, only=None, skip=(), force=False, jobs=None, dry_run=False,
+                 root=PROJECT_DIR, state_file=STATE_FILE, verbose=False, profile_dir=None, trace=False):
+    """
+    Run the out-of-date stages of `stages` in dependency order.
+
+    `only` restricts the run to the named stages (their dependencies are
+    not added); `skip` leaves stages out. With `profile_dir`, the stages
+    and the pipeline itself write profiles there (`trace` adds Chrome
+    traces). Returns {name: status}, where status is 'ran',
+    'up to date', 'would run', 'failed' or 'blocked'.
+    """
+    selected = [stage for stage in stages
+                if (only is None or stage.name in only) and stage.name not in skip]
+    names = {stage.name for stage in selected}
+    deps = {name: [dep for dep in stage_deps if dep in names]
+            for name, stage_deps in dependencies(selected).items()}
+    by_name = {stage.name: stage for stage in selected}
+    state = load_state(state_file)
+    status = {}
+
+    def ready():
+        return [name for name in names - set(status) - running
+                if all(status.get(dep) in ('ran', 'up to date', 'would run') for dep in deps[name])]
+
+    def blocked():
+        return [name for name in names - set(status) - running
+                if any(status.get(dep) in ('failed', 'blocked') for dep in deps[name])]
+
+    running = set()
+    futures = {}
+    started = {}
+    profiler = profiling.Profiler('pipeline', memory=False) if profile_dir else None
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        while len(status) < len(names):
+            for name in blocked():
+                status[name] = 'blocked'
+                print(f"⏭️  {name}: skipped, a dependency failed")
+            for name in sorted(ready()):
+                stage = by_name[name]
+                upstream_pending = any(status[dep] == 'would run' for dep in deps[name])
+                if not force and not upstream_pending and up_to_date(stage, state.get(name), root):
+                    status[name] = 'up to date'
+                    print(f"✓  {name}: up to date")
+                elif dry_run:
+                    status[name] = 'would run'
+                    print(f"▶️  {name}: would run")
+                else:
+                    print(f"▶️  {name}: running {' '.join(stage.command[1:])}")
+                    running.add(name)
+                    env = profile_env(stage, profile_dir, trace) if profile_dir else None
+                    started[name] = time.time()
+                    futures[pool.submit(run_stage, stage, root, env)] = name
+            if not futures:
+                if len(status) < len(names) and not ready() and not blocked():
+                    raise RuntimeError(f"stages depend on each other: {sorted(names - set(status))}")
+                continue
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures.pop(future)
+                running.discard(name)
+                stage = by_name[name]
+                code, seconds, output = future.result()
+                if profiler:
+                    profiler.add(name, started[name], seconds, tid=len(profiler.records) + 1,
+                                 exit_code=code)
+                if verbose or code not in stage.ok_codes:
+                    print(output.rstrip())
+                if code not in stage.ok_codes:
+                    status[name] = 'failed'
+                    print(f"❌ {name}: failed with exit code {code} after {seconds:.1f}s")
+                    continue
+                status[name] = 'ran'
+                note = ", no changes" if code == EXIT_NO_CHANGE else ""
+                print(f"✅ {name}: done in {seconds:.1f}s{note}")
+                state[name] = {'inputs': input_key(stage, root), 'outputs': digests(stage.outputs, root)}
+                save_state(state, state_file)
+
+    if profiler:
+        profile_dir = Path(profile_dir)
+        profiler.write(profile_dir / 'pipeline.json', profile_dir / 'pipeline.trace.json' if trace else None)
+        if trace:
+            traces = [profile_dir / 'pipeline.trace.json'] + [
+                profile_dir / f'{name}.trace.json' for name in sorted(status)
+                if status[name] in ('ran', 'failed') and (profile_dir / f'{name}.trace.json').exists()]
+            profiling.merge_traces(traces, profile_dir / 'build.trace.json')
+        print(f"📊 Stage profiles saved to: {profile_dir}")
+    return status
+
+
+def parse_args(argv=None):
+    names = [stage.name for stage in STAGES]
+    parser = argparse.ArgumentParser(
+        prog='pedp-pipeline',
+        description='Run the PEDP build stages whose inputs changed.',
+    )
+    parser.add_argument('--only', nargs='+', choices=names, metavar='STAGE',
+                        help=f"run only these stages ({', '.join(names)})")
+    parser.add_argument('--skip', nargs='+', choices=names, default=[], metavar='STAGE',
+                        help='leave these stages out (e.g. --skip sync to work offline)')
+    parser.add_argument('--force', action='store_true',
+                        help='run the selected stages even if they are up to date')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='stages to run at once (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='show which stages would run')
+    parser.add_argument('--verbose', action='store_true',
+                        help="print each stage's output, not only on failure")
+    parser.add_argument('--profile-dir', type=Path, default=None, metavar='DIR',
+                        help='write per-stage timing/memory reports to DIR (one JSON per stage)')
+    parser.add_argument('--trace', action='store_true',
+                        help='with --profile-dir, also write Chrome traces, merged into build.trace.json')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("="*60)
+    print("PEDP Network Map - Pipeline")
+    print("="*60)
+    start = time.perf_counter()
+    status = run_pipeline(only=args.only, skip=args.skip, force=args.force, jobs=args.jobs,
+                          dry_run=args.dry_run, verbose=args.verbose,
+                          profile_dir=args.profile_dir, trace=args.trace)
+    failed = [name for name, result in status.items() if result in ('failed', 'blocked')]
+    ran = sum(result == 'ran' for result in status.values())
+    print(f"\n{'❌' if failed else '✅'} {ran} stage(s) ran, "
+          f"{sum(result == 'up to date' for result in status.values())} up to date"
+          f"{', failed: ' + ', '.join(failed) if failed else ''} "
+          f"({time.perf_counter() - start:.1f}s)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+Per-stage timing, CPU and memory instrumentation for the build.
+
+A run is a sequence of named stages:
+
+    profiling.start('positions')
+    with profiling.stage('load') as record:
+        frames = read_frames(DATA_DIR)
+        record.count(nodes=len(frames['nodes']), edges=len(frames['edges']))
+
+Each stage records wall time, CPU time (this process, all threads, plus
+waited-for child processes such as the centrality workers), the peak
+tracemalloc memory while it ran and any row/edge counts it reports.
+Stages nest; a parent's peak includes its children's. When no run is
+active, stage() records nothing, so library code can be instrumented
+unconditionally.
+
+At the end of the run the stages are written as a JSON report and,
+optionally, as a Chrome trace (chrome://tracing or ui.perfetto.dev).
+Timestamps are wall-clock microseconds, so traces from several processes
+line up when merged (merge_traces).
+
+Scripts start a run from the environment: with PEDP_PROFILE_DIR set,
+the report goes to <dir>/<run>.json (PEDP_PROFILE_NAME overrides the run
+name) and PEDP_PROFILE_TRACE=1 adds <dir>/<run>.trace.json. tracemalloc
+slows allocation-heavy code down, so runs are only profiled on request.
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+ENV_DIR = 'PEDP_PROFILE_DIR'
+ENV_NAME = 'PEDP_PROFILE_NAME'
+ENV_TRACE = 'PEDP_PROFILE_TRACE'
+REPORT_VERSION = 1
+
+
+def _children_cpu():
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _count(value):
+    return int(value) if isinstance(value, (int, float)) and float(value).is_integer() else value
+
+
+@dataclass
+class StageRecord:
+    """Measurements for one stage; count() attaches row/edge counts."""
+
+    name: str
+    depth: int
+    start: float                        # wall clock, seconds since the epoch
+    seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    child_cpu_seconds: float = 0.0
+    peak_bytes: int = None
+    counts: dict = field(default_factory=dict)
+    tid: int = None                     # trace row; defaults to the profiling thread
+
+    def count(self, **counts):
+        self.counts.update({key: _count(value) for key, value in counts.items()})
+
+    def as_dict(self, origin):
+        return {
+            'name': self.name,
+            'depth': self.depth,
+            'start_offset': round(self.start - origin, 6),
+            'seconds': round(self.seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'child_cpu_seconds': round(self.child_cpu_seconds, 6),
+            'peak_mb': None if self.peak_bytes is None else round(self.peak_bytes / 2**20, 3),
+            'counts': self.counts,
+        }
+
+
+class Profiler:
+    """Records the stages of one run (see the module docstring)."""
+
+    def __init__(self, run, memory=True):
+        self.run = run
+        self.records = []
+        self.start_time = time.time()
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_children = _children_cpu()
+        self._stack = []               # [record, peak seen so far] for the open stages
+        self._owns_tracing = memory and not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        self.memory = memory
+        self._peak = 0
+
+    def _checkpoint_peak(self):
+        """Fold the traced peak since the last reset into every open stage."""
+        peak = tracemalloc.get_traced_memory()[1]
+        for entry in self._stack:
+            entry[1] = max(entry[1], peak)
+        self._peak = max(self._peak, peak)
+        tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def stage(self, name, **counts):
+        """Time the enclosed block as stage `name`; yields its StageRecord."""
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            self._checkpoint_peak()
+        record = StageRecord(name, len(self._stack), time.time())
+        record.count(**counts)
+        entry = [record, 0]
+        self._stack.append(entry)
+        self.records.append(record)
+        start_children = _children_cpu()
+        start_cpu = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            record.cpu_seconds = time.process_time() - start_cpu
+            record.child_cpu_seconds = _children_cpu() - start_children
+            if tracing:
+                self._checkpoint_peak()
+                record.peak_bytes = entry[1]
+            self._stack.remove(entry)
+
+    def add(self, name, start, seconds, tid=None, **counts):
+        """Record a stage timed elsewhere, e.g. a subprocess started at `start` (epoch seconds)."""
+        record = StageRecord(name, len(self._stack), start, seconds=seconds, tid=tid)
+        record.count(**counts)
+        self.records.append(record)
+        return record
+
+    def report(self):
+        """The run as a JSON-serializable dict."""
+        if self.memory and tracemalloc.is_tracing():
+            self._checkpoint_peak()
+        return {
+            'version': REPORT_VERSION,
+            'run': self.run,
+            'argv': sys.argv,
+            'pid': os.getpid(),
+            'started_at': datetime.fromtimestamp(self.start_time, timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seconds': round(time.perf_counter() - self._start_wall, 6),
+            'cpu_seconds': round(time.process_time() - self._start_cpu, 6),
+            'child_cpu_seconds': round(_children_cpu() - self._start_children, 6),
+            'peak_mb': round(self._peak / 2**20, 3) if self.memory else None,
+            'stages': [record.as_dict(self.start_time) for record in self.records],
+        }
+
+    def trace(self):
+        """The stages as Chrome trace-event JSON ('X' complete events)."""
+        pid, tid = os.getpid(), threading.get_native_id()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                   'args': {'name': self.run}}]
+        for record in self.records:
+            events.append({
+                'name': record.name,
+                'cat': self.run,
+                'ph': 'X',
+                'ts': round(record.start * 1e6),
+                'dur': round(record.seconds * 1e6),
+                'pid': pid,
+                'tid': tid if record.tid is None else record.tid,
+                'args': {key: value for key, value in record.as_dict(self.start_time).items()
+                         if key not in ('name', 'depth', 'start_offset')},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, report_path, trace_path=None):
+        """Write the JSON report (and the Chrome trace, if a path is given)."""
+        _write_json(report_path, self.report())
+        if trace_path:
+            _write_json(trace_path, self.trace())
+
+    def close(self):
+        if self._owns_tracing:
+            tracemalloc.stop()
+
+
+def _write_json(path, payload):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps(payload, indent=2) + '\n', encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+_active = None
+_paths = None
+
+
+def start(run, report_path=None, trace_path=None, memory=True):
+    """
+    Start profiling the run `run`, written out by finish() or at exit.
+
+    Without `report_path` the run is only profiled when PEDP_PROFILE_DIR
+    is set. Returns the Profiler, or None when profiling is off.
+    """
+    global _active, _paths
+    if report_path is None:
+        directory = os.environ.get(ENV_DIR)
+        if not directory:
+            return None
+        run = os.environ.get(ENV_NAME) or run
+        report_path = Path(directory) / f'{run}.json'
+        if os.environ.get(ENV_TRACE, '') not in ('', '0'):
+            trace_path = Path(directory) / f'{run}.trace.json'
+    if _active is not None:
+        finish()
+    _active = Profiler(run, memory=memory)
+    _paths = (report_path, trace_path)
+    atexit.register(finish)
+    return _active
+
+
+def finish():
+    """Write the active run's report and stop profiling; returns the report path."""
+    global _active, _paths
+    if _active is None:
+        return None
+    profiler, (report_path, trace_path) = _active, _paths
+    _active = _paths = None
+    atexit.unregister(finish)
+    profiler.write(report_path, trace_path)
+    profiler.close()
+    print(f"📊 Profile saved to: {report_path}" + (f" (trace: {trace_path})" if trace_path else ""))
+    return report_path
+
+
+def active():
+    """The running Profiler, or None."""
+    return _active
+
+
+@contextlib.contextmanager
+def stage(name, **counts):
+    """Profiler.stage() on the active run; a no-op record when none is active."""
+    if _active is None:
+        yield StageRecord(name, 0, 0.0)
+        return
+    with _active.stage(name, **counts) as record:
+        yield record
+
+
+def merge_traces(paths, output_path):
+    """Concatenate Chrome trace files (e.g. one per pipeline stage) into one."""
+    events = []
+    for path in paths:
+        events.extend(json.loads(Path(path).read_text(encoding='utf-8'))['traceEvents'])
+    _write_json(output_path, {'traceEvents': events, 'displayTimeUnit': 'ms'})
+    return output_path
@@ -0,0 +1,273 @@
+"""
+`pedp-publish`: assemble the GitHub Pages site from the rendered maps.
+
+Both pages reference the same JavaScript and CSS: PyVis's bindings/utils.js,
+vis-network (from cdnjs, or ./lib when rendered with local resources) and
+each page's tooltip sidecar. The publisher copies every local or vendored
+asset a page uses (including the graph data file, whose name the renderer
+already hashed) into one shared `assets/` directory under a
+content-hashed name (`vis-network.min.3f2a9c1e04b7.js`) and rewrites the
+pages to point there, so both maps share one cached copy and a changed
+file always gets a new URL. Links between the pages (the hypothetical
+stub that opens `network_map.html#scenario`) follow the published names.
+The exception are each page's own data sidecars (tooltips, search index,
+scenario and the graph data pointer, e.g. `index.data.js`): they stay
+unhashed next to the page, and the pointer names the hashed data file in
+assets/, so a rebuild that only changes the data leaves the page itself
+byte-identical and cached.
+
+Pages and assets are minified conservatively, line by line: indentation,
+blank lines and whole-line `//` comments go, and nothing else inside a
+line is touched. Strings, regexes and the embedded JSON that sit on one
+line therefore survive; the minifier does not parse JavaScript, so text
+inside a multi-line string or template literal loses its indentation,
+blank lines and lines starting with `//` like any other. Every published file gets a `.gz` sibling and, when the optional
+`brotli` module is installed, a `.br` sibling, for hosts that serve
+precompressed files (GitHub Pages compresses on the fly and ignores them).
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pyvis
+
+from .data import PROJECT_DIR
+from .graphdata import DATA_POINTER_SUFFIX
+
+SITE_DIR = PROJECT_DIR / '_site'
+OUTPUT_DIR = PROJECT_DIR / 'outputs'
+ASSET_DIR = 'assets'
+HASH_LENGTH = 12
+# (rendered page, published name)
+PAGES = [
+    ('network_map.html', 'index.html'),
+    ('network_map_hypothetical.html', 'hypothetical.html'),
+]
+PYVIS_LIB = Path(pyvis.__file__).parent / 'templates' / 'lib'
+# CDN files PyVis links to, and the identical release it ships in templates/lib
+VENDORED = {
+    'https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/vis-network.min.js':
+        PYVIS_LIB / 'vis-9.1.2' / 'vis-network.min.js',
+    'https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/dist/vis-network.min.css':
+        PYVIS_LIB / 'vis-9.1.2' / 'vis-network.css',
+}
+HASHED = re.compile(r'\.[0-9a-f]{%d}\.\w+$' % HASH_LENGTH)
+COMPRESSIBLE = ('.html', '.js', '.css', '.json', '.svg')
+
+# A quoted .js/.css reference: src="...", href='...', script.src = "..."
+ASSET_REFERENCE = re.compile(r'''(["'])([^"'\s<>]+\.(?:js|css))\1''')
+# Subresource-integrity attributes only hold for the CDN copy
+CDN_ATTRIBUTES = re.compile(r'''\s+(?:integrity|crossorigin|referrerpolicy)=(["'])[^"']*\1''')
+TAG = re.compile(r'<(?:script|link)\b[^>]*>')
+
+
+@dataclass
+class Published:
+    """One file written to the site, with its raw and compressed sizes."""
+
+    path: Path
+    size: int
+    gzip_size: int
+    brotli_size: int = None
+
+
+def minify_lines(text):
+    """
+    Strip indentation, blank lines and lines starting with //.
+
+    Lines are not parsed, so this also applies inside multi-line strings
+    and template literals; only use it on text without any.
+    """
+    lines = (line.strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//')) + '\n'
+
+
+def minify_css(text):
+    """Drop comments and collapse whitespace around CSS punctuation."""
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    return re.sub(r'\s*([{};,])\s*', r'\1', text).strip() + '\n'
+
+
+def minify_asset(name, data):
+    """Minified bytes for an asset; files that are already minified are kept as they are."""
+    if '.min.' in name:
+        return data
+    if name.endswith('.css'):
+        return minify_css(data.decode('utf-8')).encode('utf-8')
+    if name.endswith('.js'):
+        return minify_lines(data.decode('utf-8')).encode('utf-8')
+    return data
+
+
+def hashed_name(name, data):
+    """
+    `vis-network.min.js` → `vis-network.min.<sha256 prefix>.js`. Names the
+    renderer already hashed (the graph data file) are kept.
+    """
+    if HASHED.search(name):
+        return name
+    stem, suffix = os.path.splitext(name)
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{suffix}'
+
+
+def resolve_asset(reference, page_dir, vendor=True):
+    """Local file for an asset reference in a page, or None for references left alone."""
+    if reference in VENDORED:
+        return VENDORED[reference] if vendor else None
+    if '://' in reference or reference.startswith(('/', '//', 'data:')):
+        return None
+    for candidate in (page_dir / reference, PROJECT_DIR / reference):
+        if candidate.is_file():
+            return candidate
+    # PyVis links ./lib, which it copies next to the working directory
+    if reference.startswith('lib/') and (PYVIS_LIB / reference[4:]).is_file():
+        return PYVIS_LIB / reference[4:]
+    return None
+
+
+def write_compressed(path, data, compress=True):
+    """Write `data` to `path` with .gz (and .br) siblings; returns a Published."""
+    path.write_bytes(data)
+    published = Published(path, len(data), len(data))
+    if not compress or path.suffix not in COMPRESSIBLE:
+        return published
+    # mtime=0 keeps the .gz byte-identical across builds
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    path.with_name(path.name + '.gz').write_bytes(gz)
+    published.gzip_size = len(gz)
+    try:
+        import brotli
+    except ImportError:
+        return published
+    br = brotli.compress(data, quality=11)
+    path.with_name(path.name + '.br').write_bytes(br)
+    published.brotli_size = len(br)
+    return published
+
+
+def publish_pages(pages, site_dir=SITE_DIR, vendor=True, minify=True, compress=True):
+    """
+    Publish `pages` ((rendered page path, site name) pairs) into `site_dir`.
+
+    Assets the pages share are written once to `site_dir`/assets; each
+    page's own sidecars go next to it, unhashed. Stale hashed files from
+    earlier publishes are removed. Returns the list of Published files.
+    """
+    site_dir = Path(site_dir)
+    asset_dir = site_dir / ASSET_DIR
+    asset_dir.mkdir(parents=True, exist_ok=True)
+    assets = {}            # local source path -> hashed name
+    sidecars = set()       # pages' own sidecars already published
+    published = []
+    page_names = {Path(page_path).name: site_name for page_path, site_name in pages}
+    page_link = re.compile(r'''(["'])(%s)(#[^"'\s<>]*)?\1''' % '|'.join(map(re.escape, page_names)))
+
+    def publish_asset(source, name):
+        if source not in assets:
+            data = minify_asset(source.name, source.read_bytes()) if minify else source.read_bytes()
+            assets[source] = hashed_name(name, data)
+            published.append(write_compressed(asset_dir / assets[source], data, compress))
+        return f'{ASSET_DIR}/{assets[source]}'
+
+    def publish_sidecar(source, page_path, site_name):
+        """A page's own sidecar, unhashed next to the published page; the data pointer is rewritten."""
+        name = Path(site_name).stem + source.name[len(page_path.stem):]
+        if source not in sidecars:
+            if source.name.endswith(DATA_POINTER_SUFFIX):
+                data = ASSET_REFERENCE.sub(lambda match: rewrite_reference(match, page_path, site_name),
+                                           source.read_text(encoding='utf-8')).encode('utf-8')
+            else:
+                data = minify_asset(source.name, source.read_bytes()) if minify else source.read_bytes()
+            sidecars.add(source)
+            published.append(write_compressed(site_dir / name, data, compress))
+        return name
+
+    def rewrite_reference(match, page_path, site_name):
+        quote, reference = match.groups()
+        source = resolve_asset(reference, page_path.parent, vendor)
+        if source is None:
+            return match.group(0)
+        if (source.parent == page_path.parent and source.name.startswith(page_path.stem + '.')
+                and not HASHED.search(source.name)):
+            return f'{quote}{publish_sidecar(source, page_path, site_name)}{quote}'
+        return f'{quote}{publish_asset(source, Path(reference).name)}{quote}'
+
+    for page_path, site_name in pages:
+        page_path = Path(page_path)
+        html = page_path.read_text(encoding='utf-8')
+
+        def rewrite(match):
+            return rewrite_reference(match, page_path, site_name)
+
+        def rewrite_tag(match):
+            tag = ASSET_REFERENCE.sub(rewrite, match.group(0))
+            return CDN_ATTRIBUTES.sub('', tag) if tag != match.group(0) else tag
+
+        html = TAG.sub(rewrite_tag, html)
+        # References built in scripts (the tooltip and scenario sidecar loaders)
+        html = ASSET_REFERENCE.sub(rewrite, html)
+        html = page_link.sub(lambda m: f'{m[1]}{page_names[m[2]]}{m[3] or ""}{m[1]}', html)
+        if minify:
+            html = minify_lines(html)
+        published.append(write_compressed(site_dir / site_name, html.encode('utf-8'), compress))
+
+    current = set(assets.values())
+    for path in asset_dir.iterdir():
+        if path.name.removesuffix('.gz').removesuffix('.br') not in current:
+            path.unlink()
+    return published
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='pedp-publish',
+        description='Assemble the GitHub Pages site from the rendered maps.',
+    )
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR,
+                        help='directory with the rendered maps (default: outputs)')
+    parser.add_argument('--site-dir', type=Path, default=SITE_DIR,
+                        help='site directory to write (default: _site)')
+    parser.add_argument('--cdn', action='store_true',
+                        help='keep vis-network on cdnjs instead of publishing the bundled copy')
+    parser.add_argument('--no-minify', action='store_true',
+                        help='publish pages and assets as rendered')
+    parser.add_argument('--no-compress', action='store_true',
+                        help='skip the .gz/.br siblings')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("="*60)
+    print("PEDP Network Map - Publish")
+    print("="*60)
+
+    pages = [(args.output_dir / page, name) for page, name in PAGES if (args.output_dir / page).exists()]
+    if not pages:
+        print(f"❌ No rendered maps in {args.output_dir} - run pedp-build first")
+        return 1
+    published = publish_pages(pages, args.site_dir, vendor=not args.cdn,
+                              minify=not args.no_minify, compress=not args.no_compress)
+
+    for item in published:
+        sizes = f"{item.size / 1024:8.1f} KB"
+        if not args.no_compress and item.gzip_size != item.size:
+            sizes += f"  gz {item.gzip_size / 1024:7.1f} KB"
+            if item.brotli_size is not None:
+                sizes += f"  br {item.brotli_size / 1024:7.1f} KB"
+        print(f"  {item.path.relative_to(args.site_dir).as_posix():<56s} {sizes}")
+    if not args.no_compress and all(item.brotli_size is None for item in published):
+        print("  ℹ️  brotli not installed - wrote .gz siblings only")
+    print(f"\n✅ Published {len(pages)} page(s) to: {args.site_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""
+Render a network graph to an interactive PyVis HTML page.
+
+Both published maps go through `build_pyvis_network()`; the only
+differences between the current and hypothetical pages are the data,
+the background colour and the styling of HYP-* intermediary nodes.
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyvis
+from pyvis.network import Network
+
+from . import profiling
+from .clusters import CLUSTER_NODE_LIMIT, cluster_hierarchy, collapse_clusters, lod_script
+from .graph import is_hypothetical, real_graph, sizing_graph
+from .graphdata import (
+    DATA_GLOBAL, columnar_payload, data_loader, shell_dumps, write_data_pointer, write_graph_data,
+)
+from .overlays import apply_overlays
+from .search import SEARCH_SIDECAR_SUFFIX, search_index, search_script, write_search_sidecar
+
+# Edge styling by relationship type
+EDGE_STYLES = {
+    'is a member of': {'color': '#8e44ad', 'width': 2.5, 'arrows': 'to'},
+    'funds': {'color': '#27ae60', 'width': 3, 'arrows': 'to'},
+    'coordinates action with': {'color': '#3498db', 'width': 2, 'arrows': 'to;from'},
+    'hypothetical connection': {'color': '#999999', 'width': 1.5, 'arrows': 'to', 'dashes': True}
+}
+
+# SPATIAL LAYOUT: low gravity lets the precomputed positions dominate,
+# stronger springs keep connected nodes together despite the spatial bias
+PHYSICS = {
+    'gravity': -3000,
+    'central_gravity': 0.1,
+    'spring_length': 150,
+    'spring_strength': 0.01,
+    'damping': 0.2,
+    'overlap': 0,
+}
+
+# Render modes:
+# - physics: Barnes-Hut stabilizes the layout in every viewer's browser
+# - settled: same physics, but stabilization is capped because the
+#   node_positions.csv coordinates are already (nearly) converged
+# - static: physics off; nodes stay exactly at their precomputed positions
+RENDER_MODES = ('physics', 'settled', 'static')
+SETTLED_ITERATIONS = 100
+
+CURRENT_BACKGROUND = '#ffffff'
+HYPOTHETICAL_BACKGROUND = '#f8f8f8'
+
+# Tooltip sections in display order: (key, heading)
+TOOLTIP_SECTIONS = [
+    ('member_of', 'Member of:'),
+    ('has_members', 'Has members:'),
+    ('funds', 'Funds:'),
+    ('funded_by', 'Funded by:'),
+    ('coordinates', 'Coordinates with:'),
+]
+SECTION_ORDER = {key: i for i, (key, _) in enumerate(TOOLTIP_SECTIONS)}
+
+# Which section an edge lands in, seen from its source / its target
+OUTGOING_SECTIONS = {
+    'is a member of': 'member_of',
+    'funds': 'funds',
+    'coordinates action with': 'coordinates',
+}
+INCOMING_SECTIONS = {
+    'is a member of': 'has_members',
+    'funds': 'funded_by',
+    'coordinates action with': 'coordinates',
+}
+
+# Hover text is written next to the page and loaded on first hover
+TOOLTIP_SIDECAR_SUFFIX = '.tooltips.js'
+TOOLTIP_CALLBACK = 'pedpTooltipsLoaded'
+
+
+def connection_sections(G_real, names):
+    """
+    Group every real edge by (node, tooltip section) in one pass.
+
+    Returns {node: {section_key: [sorted other-node names]}}. Each edge
+    counts once from its source and once from its target; bidirectional
+    "coordinates" pairs collapse to a single name. `names` maps node id
+    to display name.
+    """
+    src, dst, etype = G_real.edge_arrays()
+    ids = G_real.graph.ids
+    relationship = pd.Series(G_real.graph.type_names, dtype=object).to_numpy()[etype]
+    edges = pd.DataFrame({'source': ids[src], 'target': ids[dst], 'relationship_type': relationship})
+    rows = pd.concat([
+        pd.DataFrame({'node': edges['source'],
+                      'section': edges['relationship_type'].map(OUTGOING_SECTIONS),
+                      'other': edges['target']}),
+        pd.DataFrame({'node': edges['target'],
+                      'section': edges['relationship_type'].map(INCOMING_SECTIONS),
+                      'other': edges['source']}),
+    ], ignore_index=True).dropna(subset=['section'])
+    rows['name'] = rows['other'].map(names)
+    rows['order'] = rows['section'].map(SECTION_ORDER)
+    rows = (rows.drop_duplicates(['node', 'section', 'name'])
+                .sort_values(['node', 'order', 'name'], kind='stable'))
+
+    sections = {}
+    for node, section, name in zip(rows['node'], rows['section'], rows['name']):
+        sections.setdefault(node, {}).setdefault(section, []).append(name)
+    return sections
+
+
+def node_tooltip(node, node_data, degree, connections):
+    """Build the connection-focused hover text for one node."""
+    tooltip_lines = [node_data['name'], f"Category: {node_data['category']}", ""]
+
+    if is_hypothetical(node):
+        tooltip_lines.append("⚠️ HYPOTHETICAL ORGANIZATION (NOT REAL)")
+        tooltip_lines.append("")
+        tooltip_lines.append(node_data['description'])
+    elif degree == 0:
+        # Isolated node - add contextual status
+        if node_data['category'] == 'Funder':
+            tooltip_lines.append("Interested in working in this space")
+        else:
+            tooltip_lines.append("Actively working in this space")
+    else:
+        for key, heading in TOOLTIP_SECTIONS:
+            if connections.get(key):
+                tooltip_lines.append(heading)
+                for org in connections[key]:
+                    tooltip_lines.append(f"• {org}")
+                tooltip_lines.append("")
+
+    return "\n".join(tooltip_lines).rstrip()
+
+
+def node_tooltips(G, network):
+    """Hover text for every node in `G`, counting real edges only."""
+    G_real = real_graph(G)
+    names = pd.Series({node: record['name'] for node, record in network.records.items()}, dtype=object)
+    sections = connection_sections(G_real, names)
+    return {
+        node: node_tooltip(node, network.node(node), degree, sections.get(node, {}))
+        for node, degree in zip(G.nodes(), G_real.degrees().tolist())
+    }
+
+
+def tooltip_loader(sidecar_name):
+    """
+    Script that fetches the tooltip sidecar the first time the pointer
+    moves over the map and then sets each node's title as it is hovered.
+
+    The sidecar is loaded with a <script> tag (JSONP style) rather than
+    fetch() so the page still works when opened straight from disk.
+    """
+    return f"""<script type="text/javascript">
+(function () {{
+    var tooltips = null, requested = false, lastNode = null, titled = {{}};
+    function applyTitle(node) {{
+        if (tooltips === null || node === null || node === undefined || titled[node]) return;
+        if (Object.prototype.hasOwnProperty.call(tooltips, node)) {{
+            nodes.update({{id: node, title: tooltips[node]}});
+        }}
+        titled[node] = true;
+    }}
+    window.{TOOLTIP_CALLBACK} = function (data) {{
+        tooltips = data;
+        applyTitle(lastNode);
+    }};
+    var container = document.getElementById('mynetwork');
+    container.addEventListener('mousemove', function (event) {{
+        if (!requested) {{
+            requested = true;
+            var script = document.createElement('script');
+            script.src = {json.dumps(sidecar_name)};
+            document.head.appendChild(script);
+        }}
+        var rect = container.getBoundingClientRect();
+        lastNode = network.getNodeAt({{x: event.clientX - rect.left, y: event.clientY - rect.top}});
+        applyTitle(lastNode);
+    }});
+}})();
+</script>
+"""
+
+
+def write_tooltip_sidecar(tooltips, sidecar_path):
+    """Write the compact JSON tooltip payload wrapped in the loader callback."""
+    payload = json.dumps(tooltips, ensure_ascii=False, separators=(',', ':'))
+    Path(sidecar_path).write_text(f"{TOOLTIP_CALLBACK}({payload});\n", encoding='utf-8')
+
+
+def node_size(node, node_data, sizing_centrality):
+    """Funders get a fixed size; everyone else scales with sizing-edge degree."""
+    if node_data['category'] == 'Funder':
+        return 20
+    if is_hypothetical(node):
+        return 30
+    return 15 + (sizing_centrality.get(node, 0) * 200)
+
+
+def drag_physics_script():
+    """Script that runs the physics only while a node is being dragged."""
+    return """<script type="text/javascript">
+(function () {
+    network.on('dragStart', function (params) {
+        if (params.nodes.length) network.setOptions({physics: {enabled: true}});
+    });
+    network.on('dragEnd', function (params) {
+        if (params.nodes.length) network.setOptions({physics: {enabled: false}});
+    });
+})();
+</script>
+"""
+
+
+def apply_render_mode(net, mode):
+    """Configure physics on a PyVis Network for one of RENDER_MODES."""
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {mode!r} (expected one of {', '.join(RENDER_MODES)})")
+    net.barnes_hut(**PHYSICS)
+    if mode == 'settled':
+        net.options.physics.stabilization.iterations = SETTLED_ITERATIONS
+    elif mode == 'static':
+        net.toggle_physics(False)
+
+
+def build_pyvis_network(G, network, background=CURRENT_BACKGROUND, notebook=False,
+                        inline_tooltips=True, mode='physics'):
+    """
+    Build the PyVis Network for graph `G` using lookups from `network`.
+
+    Sizes and tooltips only count real edges, so hypothetical connections
+    never change how existing nodes look. With inline_tooltips=False nodes
+    get no title; render_network() ships the hover text in a sidecar.
+    `mode` is one of RENDER_MODES.
+    """
+    tooltips = node_tooltips(G, network) if inline_tooltips else {}
+    sizing_centrality = sizing_graph(G).to_undirected().degree_centrality()
+
+    net = Network(
+        height='800px',
+        width='100%',
+        bgcolor=background,
+        font_color='#333333',
+        notebook=notebook,
+        directed=True
+    )
+    apply_render_mode(net, mode)
+
+    for node in G.nodes():
+        node_data = network.node(node)
+        # Lazily loaded tooltips leave the title out of the page entirely
+        tooltip = {'title': tooltips[node]} if node in tooltips else {}
+        size = node_size(node, node_data, sizing_centrality)
+        pos = network.positions[node]
+
+        if is_hypothetical(node):
+            net.add_node(
+                node,
+                label=f"[HYPOTHETICAL]\n{node_data['name']}",
+                **tooltip,
+                color=node_data['hex_color'],
+                size=size,
+                borderWidth=3,
+                shape='box',
+                font={'color': '#666666'},
+                x=pos['x'],
+                y=pos['y'],
+                fixed=pos['fixed']
+            )
+        else:
+            net.add_node(
+                node,
+                label=node_data['name'],
+                **tooltip,
+                color=node_data['hex_color'],
+                size=size,
+                borderWidth=2,
+                borderWidthSelected=4,
+                x=pos['x'],
+                y=pos['y'],
+                fixed=pos['fixed']
+            )
+
+    for source, target, edge_data in G.edges(data=True):
+        rel_type = edge_data['relationship_type']
+        style = EDGE_STYLES[rel_type]
+
+        edge_config = {
+            'color': style['color'],
+            'width': style['width'],
+            'arrows': style['arrows'],
+            'title': rel_type,
+            'smooth': {'type': 'continuous'},
+            'arrowStrikethrough': False
+        }
+        if style.get('dashes'):
+            edge_config['dashes'] = True
+
+        net.add_edge(source, target, **edge_config)
+
+    return net
+
+
+def write_page(net, output_path, scripts=(), overlays=(), shell=False):
+    """
+    Write the PyVis page with `scripts` and `overlays` added, in one pass.
+
+    With shell=True the page references the nodes and edges loaded from
+    the graph data file (see graphdata.py) instead of inlining them.
+    Like Network.save_graph(), this copies PyVis's local JavaScript
+    libraries into ./lib when the network uses cdn_resources='local'.
+    """
+    if shell:
+        net.templateEnv.policies['json.dumps_function'] = shell_dumps(net)
+    html = net.generate_html()
+    if scripts:
+        html = html.replace('</body>', ''.join(scripts) + '</body>', 1)
+    html = apply_overlays(html, overlays)
+
+    if net.cdn_resources == 'local':
+        templates = Path(pyvis.__file__).parent / 'templates' / 'lib'
+        for lib in ('bindings', 'tom-select', 'vis-9.1.2'):
+            if not Path('lib', lib).exists():
+                # (another render may be copying the same files)
+                shutil.copytree(templates / lib, Path('lib', lib), dirs_exist_ok=True)
+    Path(output_path).write_text(html, encoding='utf-8')
+    return output_path
+
+
+def render_network(G, network, output_path, background=CURRENT_BACKGROUND, lazy_tooltips=True,
+                   mode='physics', drag_physics=False, clustered=None, overlays=(), scripts=(),
+                   data_file=True, search=True, net=None):
+    """
+    Build the PyVis page for `G` and write it to `output_path`.
+
+    With lazy_tooltips the hover text goes to `<name>.tooltips.js` next to
+    the page instead of being inlined into every node. With data_file the
+    nodes and edges go to a content-hashed `<name>.data.<hash>.js` and the
+    page is a shell that loads it through the unhashed pointer
+    `<name>.data.js` (see graphdata.py). With search the page gets a search
+    box backed by a prebuilt `<name>.search.js` index (see search.py). In
+    static mode, drag_physics turns the physics on only while a node is
+    dragged.
+    `clustered` opens the map with collapsed category clusters; the
+    default (None) does so above CLUSTER_NODE_LIMIT nodes. `overlays`
+    (see overlays.py) and extra `scripts` are added to the page as it is
+    written. `net` is a Network build_pyvis_network() already built for
+    `G` (with inline tooltips unless lazy_tooltips); it is used instead of
+    building one and keeps its full node and edge lists, e.g. for
+    delta.write_scenario_overlay().
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if net is None:
+        with profiling.stage('pyvis_build'):
+            net = build_pyvis_network(G, network, background=background,
+                                      inline_tooltips=not lazy_tooltips, mode=mode)
+
+    scripts = list(scripts)
+    nodes, edges, lod = net.nodes, net.edges, None
+    if clustered is None:
+        clustered = G.number_of_nodes() > CLUSTER_NODE_LIMIT
+    if clustered:
+        with profiling.stage('clusters'):
+            payload = collapse_clusters(net, cluster_hierarchy(G, network))
+            if data_file:
+                lod = {key: payload[key] for key in ('clusters', 'parent', 'expandZoom')}
+                scripts.append(lod_script(None, expression=f'{DATA_GLOBAL}.lod'))
+            else:
+                scripts.append(lod_script(payload))
+    if lazy_tooltips:
+        with profiling.stage('tooltips', nodes=G.number_of_nodes()):
+            sidecar_path = output_path.with_name(output_path.stem + TOOLTIP_SIDECAR_SUFFIX)
+            write_tooltip_sidecar(node_tooltips(G, network), sidecar_path)
+            scripts.append(tooltip_loader(sidecar_path.name))
+    if search:
+        with profiling.stage('search_index', nodes=G.number_of_nodes()) as record:
+            sidecar_path = output_path.with_name(output_path.stem + SEARCH_SIDECAR_SUFFIX)
+            write_search_sidecar(search_index(network, list(G.nodes())), sidecar_path)
+            scripts.append(search_script(sidecar_path.name))
+            record.count(bytes=sidecar_path.stat().st_size)
+    if drag_physics and mode == 'static':
+        scripts.append(drag_physics_script())
+    overlays = list(overlays)
+    if data_file:
+        with profiling.stage('data_write', nodes=len(nodes), edges=len(edges)) as record:
+            extra = {'lod': lod} if lod is not None else {}
+            data_path = write_graph_data(columnar_payload(nodes, edges, **extra), output_path)
+            overlays.append(data_loader(write_data_pointer(data_path, output_path).name))
+            record.count(bytes=data_path.stat().st_size)
+    with profiling.stage('html_write') as record:
+        write_page(net, output_path, scripts, overlays, shell=data_file)
+        record.count(bytes=output_path.stat().st_size)
+    net.nodes, net.edges = nodes, edges
+    return output_path
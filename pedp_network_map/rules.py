@@ -0,0 +1,175 @@
+"""
+Declarative rules that derive edges from node attributes.
+
+A rule is a set of column conditions plus the edge to emit for every
+matching node, e.g. "category == Funder AND status matches approved →
+funds PEDP". Rules are evaluated as vectorized column operations, all
+derived edges are built in one DataFrame, and edges already present in
+the Edges tab are dropped.
+
+Rules can also be loaded from JSON:
+
+    [{"name": "approved funders fund PEDP",
+      "when": {"category": {"equals": "Funder"},
+               "status": {"matches": "4|approved"}},
+      "edge": {"relationship_type": "funds", "target": "PEDP"}}]
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .data import EDGE_COLUMNS
+
+OPERATORS = ('equals', 'not_equals', 'matches', 'in', 'not_empty')
+
+
+@dataclass(frozen=True)
+class Condition:
+    """One column test. `matches` is a case-sensitive regex search."""
+
+    column: str
+    op: str
+    value: object = None
+
+    def __post_init__(self):
+        if self.op not in OPERATORS:
+            raise ValueError(f"Unknown operator {self.op!r} (expected one of {', '.join(OPERATORS)})")
+
+    def key(self):
+        value = tuple(self.value) if isinstance(self.value, (list, tuple, set)) else self.value
+        return (self.column, self.op, value)
+
+    def evaluate(self, nodes_df):
+        """Boolean mask (numpy array) of rows satisfying the condition."""
+        if self.column not in nodes_df.columns:
+            return np.zeros(len(nodes_df), dtype=bool)
+        column = nodes_df[self.column]
+        if self.op == 'equals':
+            mask = column.eq(self.value)
+        elif self.op == 'not_equals':
+            mask = column.ne(self.value) & column.notna()
+        elif self.op == 'matches':
+            mask = column.astype('string').str.contains(self.value, regex=True, na=False)
+        elif self.op == 'in':
+            mask = column.isin(list(self.value))
+        else:  # not_empty
+            mask = column.notna() & column.astype('string').str.strip().ne('')
+        return mask.to_numpy(dtype=bool, na_value=False)
+
+
+@dataclass(frozen=True)
+class EdgeRule:
+    """
+    Emit one edge per node matching all `conditions`.
+
+    The edge runs from the node's `source_column` value to either a fixed
+    `target` id or the node's `target_column` value.
+    """
+
+    name: str
+    conditions: tuple
+    relationship_type: str
+    target: str = None
+    target_column: str = None
+    source_column: str = 'id'
+
+    def __post_init__(self):
+        if (self.target is None) == (self.target_column is None):
+            raise ValueError(f"Rule {self.name!r} needs exactly one of target / target_column")
+
+
+# Rule: category="Funder" AND status contains "4" or "approved" → funds PEDP
+FUNDING_RULE = EdgeRule(
+    name='approved funders fund PEDP',
+    conditions=(
+        Condition('category', 'equals', 'Funder'),
+        Condition('status', 'matches', '4|approved'),
+    ),
+    relationship_type='funds',
+    target='PEDP',
+)
+
+DEFAULT_RULES = [FUNDING_RULE]
+
+
+def rule_from_dict(spec):
+    """Build an EdgeRule from its JSON form (see module docstring)."""
+    conditions = []
+    for column, tests in spec.get('when', {}).items():
+        for op, value in tests.items():
+            conditions.append(Condition(column, op, value))
+    edge = spec['edge']
+    return EdgeRule(
+        name=spec.get('name', edge['relationship_type']),
+        conditions=tuple(conditions),
+        relationship_type=edge['relationship_type'],
+        target=edge.get('target'),
+        target_column=edge.get('target_column'),
+        source_column=edge.get('source_column', 'id'),
+    )
+
+
+def load_rules(path):
+    """Load a list of rules from a JSON file."""
+    return [rule_from_dict(spec) for spec in json.loads(Path(path).read_text())]
+
+
+def rule_masks(nodes_df, rules):
+    """
+    Evaluate every rule to a boolean row mask.
+
+    Conditions shared between rules are only evaluated once per run.
+    """
+    cache = {}
+    masks = []
+    for rule in rules:
+        mask = np.ones(len(nodes_df), dtype=bool)
+        for condition in rule.conditions:
+            key = condition.key()
+            if key not in cache:
+                cache[key] = condition.evaluate(nodes_df)
+            mask &= cache[key]
+        masks.append(mask)
+    return masks
+
+
+def derive_edges(nodes_df, rules=DEFAULT_RULES, existing_edges=None):
+    """
+    Return the edges produced by `rules`, minus any already in `existing_edges`.
+
+    The result has the standard edge columns plus `rule` (the name of the
+    first rule that produced each edge) and is free of duplicates.
+    """
+    frames = []
+    for rule, mask in zip(rules, rule_masks(nodes_df, rules)):
+        if not mask.any():
+            continue
+        matched = nodes_df.loc[mask]
+        if rule.target_column is not None:
+            target = matched[rule.target_column].to_numpy()
+        else:
+            target = np.full(len(matched), rule.target, dtype=object)
+        frames.append(pd.DataFrame({
+            'source': matched[rule.source_column].to_numpy(),
+            'target': target,
+            'relationship_type': rule.relationship_type,
+            'rule': rule.name,
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=EDGE_COLUMNS + ['rule'])
+
+    derived = pd.concat(frames, ignore_index=True)
+    derived = derived.dropna(subset=['source', 'target'])
+    derived = derived.drop_duplicates(subset=EDGE_COLUMNS, keep='first')
+
+    if existing_edges is not None and len(existing_edges) and set(EDGE_COLUMNS) <= set(existing_edges.columns):
+        existing = existing_edges[EDGE_COLUMNS].astype(object).drop_duplicates()
+        merged = derived.merge(existing, on=EDGE_COLUMNS, how='left', indicator=True)
+        derived = merged.loc[merged['_merge'] == 'left_only'].drop(columns='_merge')
+
+    return derived.reset_index(drop=True)
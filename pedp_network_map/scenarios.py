@@ -0,0 +1,256 @@
+"""
+Hypothetical scenarios: intermediary hubs that connect the isolated nodes.
+
+A scenario is a set of hubs plus the core nodes they link to. Each hub
+claims the isolated nodes of some categories (the first hub that lists a
+category wins; a hub with attach=None takes whatever is left) and has a
+flow direction:
+
+- 'in':  isolated node → hub → core   (e.g. funders pooling through a collaborative)
+- 'out': core → hub → isolated node   (e.g. a coordination hub reaching practitioners)
+
+The base network is analysed once (BaseNetwork): node degrees come from
+one bincount over the edge endpoints, so isolation and category splits
+are array masks. Any number of scenarios are then generated from it
+without re-reading the data. Edges are emitted in flow order: isolated →
+hub, hub → core, core → hub, hub → isolated.
+
+Scenarios can also be loaded from JSON:
+
+    [{"name": "two hubs", "core": ["PEDP", "DataFoundation"],
+      "hubs": [{"id": "HYP-HUB1", "name": "Regional Data Coordination Hub",
+                "category": "Data Coordination/Standards", "color": "red",
+                "attach": null, "flow": "out"},
+               {"id": "HYP-HUB2", "name": "Funder Collaborative Network",
+                "category": "Funder", "color": "teal",
+                "attach": ["Funder"], "flow": "in"}]}]
+
+Hubs without x/y are spread on a ring around the core, starting top-left.
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .data import EDGE_COLUMNS, NODE_COLUMNS
+from .graph import HYPOTHETICAL_PREFIX, HYPOTHETICAL_RELATIONSHIP
+
+FLOWS = ('in', 'out')
+CORE = ('PEDP', 'DataFoundation')
+HUB_RADIUS = 180 * math.sqrt(2)   # the original hubs sat at (±180, ±180)
+HUB_START_ANGLE = 225             # degrees; canvas y grows downward, so top-left
+POSITION_COLUMNS = ['id', 'x', 'y', 'fixed']
+
+
+@dataclass(frozen=True)
+class Hub:
+    """One hypothetical intermediary node and the isolated nodes it claims."""
+
+    id: str
+    name: str
+    category: str
+    color: str
+    description: str = ''         # default: "[HYPOTHETICAL] <name>"
+    attach: tuple = None          # categories of isolated nodes; None = all unclaimed
+    flow: str = 'out'
+    x: float = None
+    y: float = None
+    status: str = 'Hypothetical'
+    timeline: str = 'Emerging/Planned'
+
+    def __post_init__(self):
+        if not self.id.startswith(HYPOTHETICAL_PREFIX):
+            raise ValueError(f"Hub id {self.id!r} must start with {HYPOTHETICAL_PREFIX!r}")
+        if self.flow not in FLOWS:
+            raise ValueError(f"Hub {self.id!r}: unknown flow {self.flow!r} (expected one of {', '.join(FLOWS)})")
+        if (self.x is None) != (self.y is None):
+            raise ValueError(f"Hub {self.id!r} needs both x and y, or neither")
+
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    """Hubs plus the core nodes every hub links to."""
+
+    name: str
+    hubs: tuple
+    core: tuple = CORE
+
+    def __post_init__(self):
+        ids = [hub.id for hub in self.hubs]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Scenario {self.name!r} repeats a hub id")
+
+
+@dataclass
+class Scenario:
+    """The *_hypothetical tables for one scenario."""
+
+    name: str
+    nodes: pd.DataFrame
+    edges: pd.DataFrame
+    positions: pd.DataFrame
+    attached: dict = field(default_factory=dict)   # hub id -> isolated nodes it connects
+
+
+DEFAULT_SCENARIO = ScenarioSpec(
+    name='default',
+    hubs=(
+        Hub('HYP-HUB1', 'Regional Data Coordination Hub', 'Data Coordination/Standards', 'red',
+            description='[HYPOTHETICAL] Regional organization coordinating data initiatives '
+                        'and connecting funders with practitioners',
+            attach=None, flow='out'),
+        Hub('HYP-HUB2', 'Funder Collaborative Network', 'Funder', 'teal',
+            description='[HYPOTHETICAL] Funder collaborative pooling resources and coordinating '
+                        'grants in the environmental data space',
+            attach=('Funder',), flow='in'),
+    ),
+)
+
+
+class BaseNetwork:
+    """Degree, isolation and category arrays for the current network, computed once."""
+
+    def __init__(self, nodes_df, edges_df):
+        nodes = nodes_df.drop_duplicates('id', keep='first')
+        self.ids = nodes['id'].to_numpy(dtype=object)
+        self.categories = nodes['category'].to_numpy(dtype=object)
+        index = pd.Index(self.ids)
+        endpoints = np.concatenate([index.get_indexer(edges_df['source']),
+                                    index.get_indexer(edges_df['target'])])
+        self.degree = np.bincount(endpoints[endpoints >= 0], minlength=len(self.ids))
+        self.isolated = self.degree == 0
+
+    def isolated_ids(self, categories=None):
+        """Isolated node ids, optionally only those in `categories`."""
+        mask = self.isolated
+        if categories is not None:
+            mask = mask & np.isin(self.categories, list(categories))
+        return self.ids[mask]
+
+
+def hub_positions(hubs):
+    """(x, y) per hub: the hub's own, or evenly spaced on a ring around the core."""
+    step = 360 / max(len(hubs), 1)
+    positions = []
+    for i, hub in enumerate(hubs):
+        if hub.x is not None:
+            positions.append((hub.x, hub.y))
+            continue
+        angle = math.radians(HUB_START_ANGLE + i * step)
+        positions.append((round(HUB_RADIUS * math.cos(angle)), round(HUB_RADIUS * math.sin(angle))))
+    return positions
+
+
+def _edges(sources, targets):
+    return pd.DataFrame({'source': sources, 'target': targets,
+                         'relationship_type': HYPOTHETICAL_RELATIONSHIP}, columns=EDGE_COLUMNS)
+
+
+def generate_scenario(base, spec):
+    """Build the Scenario for `spec` from an analysed BaseNetwork."""
+    hubs = spec.hubs
+    nodes = pd.DataFrame({
+        'id': [hub.id for hub in hubs],
+        'name': [hub.name for hub in hubs],
+        'organization': [hub.name for hub in hubs],
+        'contact': '',
+        'description': [hub.description or f'[HYPOTHETICAL] {hub.name}' for hub in hubs],
+        'status': [hub.status for hub in hubs],
+        'website': '',
+        'category': [hub.category for hub in hubs],
+        'timeline': [hub.timeline for hub in hubs],
+        'color': [hub.color for hub in hubs],
+    }, columns=NODE_COLUMNS)
+    xy = hub_positions(hubs)
+    positions = pd.DataFrame({
+        'id': nodes['id'],
+        'x': [x for x, _ in xy],
+        'y': [y for _, y in xy],
+        'fixed': True,
+    }, columns=POSITION_COLUMNS)
+
+    # Each isolated node goes to the first hub that lists its category;
+    # the first hub with attach=None then takes what is left
+    unclaimed = base.isolated.copy()
+    claimed = {}
+    for hub in sorted(hubs, key=lambda hub: hub.attach is None):
+        mask = unclaimed if hub.attach is None else unclaimed & np.isin(base.categories, list(hub.attach))
+        claimed[hub.id] = base.ids[mask]
+        unclaimed &= ~mask
+
+    core = np.array(spec.core, dtype=object)
+    inflow = [hub for hub in hubs if hub.flow == 'in']
+    outflow = [hub for hub in hubs if hub.flow == 'out']
+    phases = [
+        [_edges(claimed[hub.id], hub.id) for hub in inflow],                            # isolated → hub
+        [_edges(np.full(len(core), hub.id, dtype=object), core) for hub in inflow],     # hub → core
+        [_edges(core, np.full(len(core), hub.id, dtype=object)) for hub in outflow],    # core → hub
+        [_edges(np.full(len(claimed[hub.id]), hub.id, dtype=object), claimed[hub.id])   # hub → isolated
+         for hub in outflow],
+    ]
+    frames = [frame for phase in phases for frame in phase if len(frame)]
+    edges = pd.concat(frames, ignore_index=True) if frames else _edges([], [])
+    return Scenario(spec.name, nodes, edges, positions,
+                    attached={hub_id: len(ids) for hub_id, ids in claimed.items()})
+
+
+def generate_scenarios(nodes_df, edges_df, specs):
+    """{spec name: Scenario} for every spec, analysing the base network once."""
+    base = BaseNetwork(nodes_df, edges_df)
+    return {spec.name: generate_scenario(base, spec) for spec in specs}
+
+
+def write_scenario(scenario, data_dir, suffix='hypothetical'):
+    """Write nodes_/edges_/node_positions_<suffix>.csv to `data_dir`; returns the paths."""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    paths = [data_dir / f'nodes_{suffix}.csv', data_dir / f'edges_{suffix}.csv',
+             data_dir / f'node_positions_{suffix}.csv']
+    for frame, path in zip((scenario.nodes, scenario.edges, scenario.positions), paths):
+        frame.to_csv(path, index=False)
+    return paths
+
+
+def read_scenario(data_dir, name=None, suffix='hypothetical'):
+    """Read a Scenario written by write_scenario(); the name defaults to the directory name."""
+    data_dir = Path(data_dir)
+    nodes = pd.read_csv(data_dir / f'nodes_{suffix}.csv')
+    edges = pd.read_csv(data_dir / f'edges_{suffix}.csv')
+    positions = pd.read_csv(data_dir / f'node_positions_{suffix}.csv')
+    return Scenario(name or data_dir.name, nodes, edges, positions)
+
+
+def hub_from_dict(spec):
+    """Build a Hub from its JSON form (see module docstring)."""
+    attach = spec.get('attach')
+    return Hub(
+        id=spec['id'],
+        name=spec['name'],
+        category=spec['category'],
+        color=spec['color'],
+        description=spec.get('description', ''),
+        attach=None if attach is None else tuple(attach),
+        flow=spec.get('flow', 'out'),
+        x=spec.get('x'),
+        y=spec.get('y'),
+        status=spec.get('status', 'Hypothetical'),
+        timeline=spec.get('timeline', 'Emerging/Planned'),
+    )
+
+
+def scenario_from_dict(spec):
+    """Build a ScenarioSpec from its JSON form."""
+    return ScenarioSpec(
+        name=spec['name'],
+        hubs=tuple(hub_from_dict(hub) for hub in spec['hubs']),
+        core=tuple(spec.get('core', CORE)),
+    )
+
+
+def load_scenarios(path):
+    """Load a list of scenario specs from a JSON file."""
+    return [scenario_from_dict(spec) for spec in json.loads(Path(path).read_text())]
@@ -0,0 +1,285 @@
+"""
+Precomputed search index for the map's search box.
+
+Every node's name (with its id), organization, category and the first
+MAX_DESCRIPTION_WORDS words of its description are split into lowercase
+ASCII words (search_words(); the page applies the same rule, FOLD
+included, to queries) and indexed at build time:
+
+- `tokens`: the distinct words, sorted, so every word starting with a
+  typed prefix is one contiguous range found by binary search
+- `postings`: per token, the nodes it occurs in, each as
+  node index * 4 + field (0 name, 1 organization, 2 category,
+  3 description), ascending and delta-encoded; a node keeps only its best
+  field per token
+
+For a query word with a typo that no token starts with, the page builds a
+space-padded trigram → tokens map from `tokens` the first time it is
+needed, so the trigrams are not shipped.
+
+The index is written next to the page as `<name>.search.js` and loaded
+(JSONP style, like the tooltip sidecar) the first time the search box
+gets focus. A query matches the nodes that contain every query word as a
+word prefix, ranked by the fields the words were found in, so results
+come back without scanning the nodes.
+"""
+
+import json
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ('name', 'organization', 'category', 'description')
+STOP_WORDS = {'a', 'an', 'and', 'at', 'by', 'for', 'in', 'of', 'on', 'the', 'to', 'with'}
+MAX_RESULTS = 10
+MAX_DESCRIPTION_WORDS = 12
+
+# Lowercase letters NFKD does not decompose to ASCII, and their spelling
+FOLD = {'æ': 'ae', 'ð': 'd', 'đ': 'd', 'ħ': 'h', 'ı': 'i', 'ł': 'l', 'ø': 'o', 'œ': 'oe', 'ß': 'ss', 'þ': 'th'}
+
+SEARCH_SIDECAR_SUFFIX = '.search.js'
+SEARCH_CALLBACK = 'pedpSearchLoaded'
+
+
+def _fold(value):
+    """Lowercase, spell out FOLD letters, then drop accents and anything non-ASCII."""
+    value = value.lower().translate(_FOLD_TABLE)
+    return unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+
+
+_FOLD_TABLE = str.maketrans(FOLD)
+
+
+def search_words(values):
+    """Series of lists: the lowercase ASCII words of each value (NaN → no words)."""
+    text = pd.Series(values, dtype=object).fillna('').astype(str).map(_fold)
+    return text.str.replace('&', ' and ', regex=False).str.split(r'[^a-z0-9]+', regex=True)
+
+
+def search_index(network, node_ids):
+    """
+    Build the index payload for `node_ids`, using the records of `network`.
+
+    Also holds each node's id, name and category (as codes) to list the
+    results.
+    """
+    records = [network.node(node) for node in node_ids]
+    # Ids are mostly acronyms (EDGI, AGU) and count as part of the name
+    frames = [pd.DataFrame({'word': search_words(node_ids), 'node': range(len(records)), 'field': 0})]
+    for field, column in enumerate(SEARCH_FIELDS):
+        words = search_words([record.get(column) for record in records])
+        frames.append(pd.DataFrame({'word': words, 'node': range(len(records)), 'field': field}))
+    words = pd.concat(frames, ignore_index=True).explode('word')
+    words = words[words['word'].str.len().fillna(0).ge(1) & ~words['word'].isin(STOP_WORDS)]
+    # Descriptions can run long; their first words carry the most
+    description = words['field'].eq(len(SEARCH_FIELDS) - 1)
+    words = words[~description | words.groupby(['field', 'node']).cumcount().lt(MAX_DESCRIPTION_WORDS)]
+    # Best (lowest-numbered) field per (word, node)
+    words = (words.sort_values(['word', 'node', 'field'], kind='stable')
+                  .drop_duplicates(['word', 'node']))
+
+    tokens = sorted(words['word'].unique().tolist())
+    codes = pd.Index(tokens).get_indexer(words['word'])
+    # Rows are sorted by word, then node: postings ascend within each token
+    posting = (words['node'] * 4 + words['field']).to_numpy()
+    first = np.r_[True, codes[1:] != codes[:-1]]
+    delta = np.where(first, posting, posting - np.r_[0, posting[:-1]])
+    postings = pd.Series(delta).groupby(codes, sort=True).agg(list).tolist()
+
+    category_codes, categories = pd.factorize(pd.Series([record['category'] for record in records]))
+    return {
+        'ids': list(node_ids),
+        'names': [record['name'] for record in records],
+        'categories': category_codes.tolist(),
+        'category': categories.tolist(),
+        'tokens': tokens,
+        'postings': postings,
+    }
+
+
+def write_search_sidecar(index, sidecar_path):
+    """Write the compact JSON index wrapped in the search box's callback."""
+    payload = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+    Path(sidecar_path).write_text(f"{SEARCH_CALLBACK}({payload});\n", encoding='utf-8')
+
+
+def search_script(sidecar_name, max_results=MAX_RESULTS):
+    """
+    Script that adds the search box: loads the index on first focus, lists
+    the best matches as you type and selects and focuses the chosen node
+    (expanding its clusters first on clustered maps).
+    """
+    return f"""<script type="text/javascript">
+(function () {{
+    var FIELD_WEIGHTS = [8, 4, 2, 1], TYPO_WEIGHT = 0.5, MAX_RESULTS = {max_results};
+    var STOP_WORDS = {json.dumps(sorted(STOP_WORDS))}, FOLD = {json.dumps(FOLD, ensure_ascii=False)};
+    var index = null, trigramTokens = null, requested = false, results = [], active = -1;
+
+    var box = document.createElement('div');
+    box.style.cssText = 'position: fixed; top: 10px; left: 10px; z-index: 10000; width: 320px; '
+        + 'font: 14px Arial, sans-serif;';
+    var input = document.createElement('input');
+    input.type = 'search';
+    input.placeholder = 'Search organizations…';
+    input.setAttribute('aria-label', 'Search organizations');
+    input.style.cssText = 'width: 100%; box-sizing: border-box; padding: 8px 10px; border: 1px solid #cccccc; '
+        + 'border-radius: 6px; box-shadow: 0 2px 8px rgba(0,0,0,0.15); font: inherit;';
+    var list = document.createElement('ul');
+    list.style.cssText = 'list-style: none; margin: 4px 0 0; padding: 0; background: #ffffff; '
+        + 'border-radius: 6px; box-shadow: 0 2px 8px rgba(0,0,0,0.15); max-height: 360px; overflow-y: auto;';
+    box.appendChild(input);
+    box.appendChild(list);
+    document.body.appendChild(box);
+
+    // Same rule as search_words() at build time
+    function words(text) {{
+        return text.toLowerCase().replace(/./g, function (c) {{ return FOLD[c] || c; }})
+            .normalize('NFKD').replace(/[^\\x00-\\x7f]/g, '')
+            .replace(/&/g, ' and ').split(/[^a-z0-9]+/)
+            .filter(function (word) {{ return word && STOP_WORDS.indexOf(word) < 0; }});
+    }}
+    function padded(word) {{
+        var grams = [], text = ' ' + word + ' ';
+        for (var i = 0; i + 3 <= text.length; i++) {{
+            if (grams.indexOf(text.substr(i, 3)) < 0) grams.push(text.substr(i, 3));
+        }}
+        return grams;
+    }}
+    // Trigram → token indexes, built on the first query that needs it
+    function trigrams() {{
+        if (trigramTokens === null) {{
+            trigramTokens = {{}};
+            index.tokens.forEach(function (token, t) {{
+                padded(token).forEach(function (gram) {{
+                    (trigramTokens[gram] || (trigramTokens[gram] = [])).push(t);
+                }});
+            }});
+        }}
+        return trigramTokens;
+    }}
+    function lowerBound(word) {{
+        var lo = 0, hi = index.tokens.length;
+        while (lo < hi) {{
+            var mid = (lo + hi) >> 1;
+            if (index.tokens[mid] < word) lo = mid + 1; else hi = mid;
+        }}
+        return lo;
+    }}
+    // {{token index: weight factor}} for the tokens a query word can match
+    function candidates(word) {{
+        var found = {{}}, any = false;
+        for (var t = lowerBound(word); t < index.tokens.length && index.tokens[t].lastIndexOf(word, 0) === 0; t++) {{
+            found[t] = index.tokens[t] === word ? 1 : 0.75;
+            any = true;
+        }}
+        if (any || word.length < 3) return found;
+        var grams = padded(word), shared = {{}}, byGram = trigrams();
+        var needed = Math.ceil(grams.length / 2);
+        grams.forEach(function (gram) {{
+            (byGram[gram] || []).forEach(function (t) {{ shared[t] = (shared[t] || 0) + 1; }});
+        }});
+        Object.keys(shared).forEach(function (t) {{
+            if (shared[t] >= needed) found[t] = TYPO_WEIGHT;
+        }});
+        return found;
+    }}
+    function search(query) {{
+        var scores = null;
+        words(query).forEach(function (word) {{
+            var tokens = candidates(word), best = {{}};
+            Object.keys(tokens).forEach(function (t) {{
+                var posting = 0;
+                index.postings[t].forEach(function (delta) {{
+                    posting += delta;
+                    var node = posting >> 2, score = FIELD_WEIGHTS[posting & 3] * tokens[t];
+                    if (!(best[node] >= score)) best[node] = score;
+                }});
+            }});
+            if (scores === null) {{
+                scores = best;
+                return;
+            }}
+            var both = {{}};
+            Object.keys(best).forEach(function (node) {{
+                if (node in scores) both[node] = scores[node] + best[node];
+            }});
+            scores = both;
+        }});
+        if (scores === null) return [];
+        return Object.keys(scores).map(Number).sort(function (a, b) {{
+            return scores[b] - scores[a] || index.names[a].length - index.names[b].length;
+        }}).slice(0, MAX_RESULTS);
+    }}
+
+    function show(nodes) {{
+        results = nodes;
+        active = nodes.length ? 0 : -1;
+        list.innerHTML = '';
+        nodes.forEach(function (node, i) {{
+            var item = document.createElement('li');
+            item.style.cssText = 'padding: 6px 10px; cursor: pointer; border-top: 1px solid #eeeeee;';
+            var name = document.createElement('div');
+            name.textContent = index.names[node];
+            var category = document.createElement('div');
+            category.textContent = index.category[index.categories[node]];
+            category.style.cssText = 'font-size: 12px; color: #777777;';
+            item.appendChild(name);
+            item.appendChild(category);
+            item.addEventListener('mousedown', function (event) {{
+                event.preventDefault();
+                choose(i);
+            }});
+            list.appendChild(item);
+        }});
+        highlight();
+    }}
+    function highlight() {{
+        Array.prototype.forEach.call(list.children, function (item, i) {{
+            item.style.background = i === active ? '#eef2ff' : '';
+        }});
+    }}
+    function choose(i) {{
+        if (i < 0 || i >= results.length) return;
+        var id = index.ids[results[i]];
+        if (window.pedpRevealNode) window.pedpRevealNode(id);
+        if (nodes.get(id) === null) return;
+        network.selectNodes([id]);
+        network.focus(id, {{scale: Math.max(network.getScale(), 1.2), animation: {{duration: 400}}}});
+        input.value = index.names[results[i]];
+        show([]);
+    }}
+    function update() {{
+        if (index !== null) show(input.value.trim() ? search(input.value) : []);
+    }}
+
+    window.{SEARCH_CALLBACK} = function (data) {{
+        index = data;
+        update();
+    }};
+    input.addEventListener('focus', function () {{
+        if (requested) return;
+        requested = true;
+        var script = document.createElement('script');
+        script.src = {json.dumps(sidecar_name)};
+        document.head.appendChild(script);
+    }});
+    input.addEventListener('input', update);
+    input.addEventListener('keydown', function (event) {{
+        if (event.key === 'ArrowDown' || event.key === 'ArrowUp') {{
+            if (!results.length) return;
+            active = (active + (event.key === 'ArrowDown' ? 1 : results.length - 1)) % results.length;
+            highlight();
+            event.preventDefault();
+        }} else if (event.key === 'Enter') {{
+            choose(active);
+        }} else if (event.key === 'Escape') {{
+            show([]);
+            input.blur();
+        }}
+    }});
+    input.addEventListener('blur', function () {{ show([]); }});
+}})();
+</script>
+"""
@@ -0,0 +1,346 @@
+"""
+Fetch Google Sheets tabs as CSV: concurrently, with retries and change detection.
+
+All tabs are downloaded in parallel over a shared keep-alive connection
+pool, with per-request timeouts and exponential-backoff retries. Each
+response body is parsed by pandas as it streams in.
+
+Each sync also records a manifest with one entry per tab: the SHA-256 of the
+exported CSV plus any HTTP validators (ETag / Last-Modified) the gviz
+export returned. The next sync sends those validators back as
+conditional request headers and compares content hashes, so an
+unchanged sheet can be detected without regenerating anything. The
+manifest also keys on the sync's other inputs (sync_inputs(): the
+derived-edge rules file and the sync code), so a change to either
+rebuilds even when the sheet is the same.
+"""
+
+import hashlib
+import http.client
+import io
+import json
+import random
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+# Exit status for "sheet unchanged, nothing to rebuild". 78 is the
+# "neutral" code CI wrappers conventionally use for skipped work.
+EXIT_NO_CHANGE = 78
+
+MANIFEST_VERSION = 1
+
+DEFAULT_TIMEOUT = 30      # seconds per connect/read
+DEFAULT_RETRIES = 3       # extra attempts after the first
+DEFAULT_BACKOFF = 1.0     # seconds; doubles on each retry
+MAX_REDIRECTS = 5
+STREAM_CHUNK = 64 * 1024
+
+
+class SheetFetchError(Exception):
+    """A sheet tab could not be downloaded."""
+
+    def __init__(self, name, url, reason):
+        super().__init__(f"{name}: {reason}")
+        self.name = name
+        self.url = url
+        self.reason = reason
+
+
+@dataclass
+class TabResult:
+    """One downloaded (or not-modified) sheet tab."""
+
+    name: str
+    gid: str
+    sha256: str
+    etag: str = None
+    last_modified: str = None
+    not_modified: bool = False
+    frame: pd.DataFrame = None
+
+    def manifest_entry(self):
+        return {
+            'gid': self.gid,
+            'sha256': self.sha256,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+        }
+
+
+def load_manifest(path):
+    """Return the previous sync manifest, or an empty one if missing/unreadable."""
+    path = Path(path)
+    try:
+        manifest = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {'version': MANIFEST_VERSION, 'tabs': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'tabs': {}}
+    return manifest
+
+
+def sources_digest(paths):
+    """SHA-256 hex digest of the contents of `paths`, in order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        data = Path(path).read_bytes()
+        digest.update(f"{len(data)}:".encode('ascii'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def sync_inputs(rules_path=None, code_paths=()):
+    """
+    The non-sheet inputs of a sync, as recorded in the manifest: a digest
+    of the rules file (None for the built-in rules, which are part of the
+    code) and of the sync code itself.
+    """
+    return {
+        'rules': sources_digest([rules_path]) if rules_path else None,
+        'code': sources_digest(code_paths),
+    }
+
+
+def save_manifest(path, spreadsheet_id, results, inputs=None):
+    """Write the manifest for a completed sync; `inputs` is from sync_inputs()."""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'spreadsheet_id': spreadsheet_id,
+        'synced_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'inputs': inputs,
+        'tabs': {result.name: result.manifest_entry() for result in results},
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def conditional_headers(entry):
+    """If-None-Match / If-Modified-Since headers from a manifest entry."""
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections shared by the fetch worker threads.
+
+    Connections are checked out per request and returned once the body
+    has been read, so concurrent tab downloads reuse a handful of TLS
+    sessions instead of opening one per request.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get(self, scheme, netloc):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(netloc, timeout=self.timeout)
+
+    def release(self, scheme, netloc, conn, reusable=True):
+        """Return a connection whose response was fully read, or close it."""
+        if not reusable:
+            conn.close()
+            return
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(conn)
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+class HashingReader(io.RawIOBase):
+    """File-like wrapper that hashes a response body while pandas parses it."""
+
+    def __init__(self, response):
+        self.response = response
+        self.digest = hashlib.sha256()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.response.read(len(buffer))
+        self.digest.update(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+    def drain(self):
+        """Read (and hash) whatever pandas left unread."""
+        while True:
+            data = self.response.read(STREAM_CHUNK)
+            if not data:
+                return
+            self.digest.update(data)
+
+
+class _RetryableError(Exception):
+    def __init__(self, reason, retry_after=None):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _retry_after(response):
+    try:
+        return float(response.getheader('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _request_once(pool, name, gid, url, previous):
+    """One download attempt, following redirects. Returns a TabResult."""
+    headers = conditional_headers(previous)
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        conn = pool.get(parts.scheme, parts.netloc)
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise _RetryableError(f"{type(e).__name__}: {e}") from e
+
+        status = response.status
+        reusable = not response.will_close
+
+        if status in (301, 302, 303, 307, 308) and response.getheader('Location'):
+            response.read()
+            pool.release(parts.scheme, parts.netloc, conn, reusable)
+            url = urllib.parse.urljoin(url, response.getheader('Location'))
+            continue
+
+        if status == 304 and previous:
+            response.read()
+            pool.release(parts.scheme, parts.netloc, conn, reusable)
+            return TabResult(name=name, gid=gid, sha256=previous['sha256'],
+                             etag=previous.get('etag'),
+                             last_modified=previous.get('last_modified'),
+                             not_modified=True)
+
+        if status == 429 or status >= 500:
+            retry_after = _retry_after(response)
+            conn.close()
+            raise _RetryableError(f"HTTP {status} {response.reason}", retry_after)
+
+        if status != 200:
+            conn.close()
+            raise SheetFetchError(name, url, f"HTTP {status} {response.reason}")
+
+        if 'text/html' in (response.getheader('Content-Type') or ''):
+            # A login or error page instead of the CSV export
+            conn.close()
+            raise SheetFetchError(name, url, "got an HTML page instead of CSV (is the sheet public?)")
+
+        reader = HashingReader(response)
+        try:
+            frame = pd.read_csv(io.BufferedReader(reader, buffer_size=STREAM_CHUNK))
+            reader.drain()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise _RetryableError(f"{type(e).__name__}: {e}") from e
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+            conn.close()
+            raise SheetFetchError(name, url, f"could not parse CSV: {e}") from e
+
+        pool.release(parts.scheme, parts.netloc, conn, reusable)
+        return TabResult(name=name, gid=gid, sha256=reader.digest.hexdigest(),
+                         etag=response.getheader('ETag'),
+                         last_modified=response.getheader('Last-Modified'),
+                         frame=frame)
+
+    raise SheetFetchError(name, url, f"more than {MAX_REDIRECTS} redirects")
+
+
+def fetch_tab(name, gid, url, previous=None, pool=None,
+              retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """
+    Download one tab and parse the CSV while it streams in.
+
+    `previous` is the tab's manifest entry from the last sync; its
+    validators are sent as conditional headers and a 304 response yields
+    a TabResult with not_modified=True and no frame. Connection errors,
+    timeouts, 429 and 5xx responses are retried with exponential backoff
+    (honouring Retry-After); other failures raise SheetFetchError.
+    """
+    own_pool = pool is None
+    pool = pool or ConnectionPool()
+    try:
+        for attempt in range(retries + 1):
+            try:
+                return _request_once(pool, name, gid, url, previous)
+            except _RetryableError as e:
+                if attempt == retries:
+                    raise SheetFetchError(name, url, f"{e.reason} (after {retries + 1} attempts)") from e
+                delay = e.retry_after if e.retry_after is not None else backoff * (2 ** attempt)
+                time.sleep(delay * (1 + random.random() * 0.1))
+    finally:
+        if own_pool:
+            pool.close()
+
+
+def fetch_tabs(tabs, previous=None, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+               backoff=DEFAULT_BACKOFF, max_workers=None):
+    """
+    Download several tabs concurrently over a shared connection pool.
+
+    `tabs` maps tab name -> (gid, url); `previous` maps tab name -> manifest
+    entry. Returns TabResults in the order of `tabs`. If any tab fails,
+    raises SheetFetchError for the first failure after all downloads finish.
+    """
+    previous = previous or {}
+    pool = ConnectionPool(timeout=timeout)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers or len(tabs) or 1) as executor:
+            futures = [
+                executor.submit(fetch_tab, name, gid, url, previous.get(name), pool,
+                                retries, backoff)
+                for name, (gid, url) in tabs.items()
+            ]
+            errors = [f.exception() for f in futures if f.exception() is not None]
+            if errors:
+                raise errors[0]
+            return [f.result() for f in futures]
+    finally:
+        pool.close()
+
+
+def unchanged(results, manifest, inputs=None):
+    """
+    True when every tab matches the content hash recorded in `manifest`
+    and the sync's `inputs` (see sync_inputs()) are the recorded ones.
+    """
+    if manifest.get('inputs') != inputs:
+        return False
+    tabs = manifest.get('tabs', {})
+    return all(
+        result.name in tabs
+        and tabs[result.name].get('gid') == result.gid
+        and tabs[result.name].get('sha256') == result.sha256
+        for result in results
+    )
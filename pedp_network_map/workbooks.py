@@ -0,0 +1,284 @@
+"""
+Excel ingestion shared by the funder and attendee scripts.
+
+Each workbook is read once, in openpyxl's read-only streaming mode, a
+chunk of rows at a time, and all of its sheets are cached under
+data/cache/workbooks keyed by the SHA-256 of the file. Every later read
+of an unchanged workbook, by any script, loads the cached frames instead
+of parsing the .xlsx again. The cache is a plain .npz file loaded with
+allow_pickle=False: text and mixed columns are stored as strings plus a
+per-cell type code, so reading a cache file never runs code from it.
+
+The helpers below work on whole columns: affiliation cleanup, funder
+classification, node categories and id generation replace the per-row
+iterrows() loops the scripts used to run.
+"""
+
+import datetime
+import hashlib
+import itertools
+import numbers
+import os
+import re
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from .data import PROJECT_DIR
+
+CACHE_DIR = PROJECT_DIR / 'data' / 'cache' / 'workbooks'
+CACHE_VERSION = 2
+
+ATTENDANCE_WORKBOOK = PROJECT_DIR / "Future of Open Environmental Data Convening Guest List - September 2025.xlsx"
+ATTENDANCE_SHEET = "FINAL ATTENDANCE"
+AFFILIATION_COLUMN = 'Affiliation '
+
+FUNDER_WORKBOOK = PROJECT_DIR / "PEDP Funder spreadsheet.xlsx"
+FUNDER_SHEET = "Funder List"
+
+# Affiliations containing any of these look like funders
+FUNDER_KEYWORDS = [
+    'foundation', 'fund', 'trust', 'philanthropies', 'philanthropy',
+    'project', 'initiative', 'center', 'simons', '11th hour',
+    'moore', 'pew', 'kapor', 'heising', 'aspen', 'schmidt'
+]
+# Known approved funders among the attendees
+APPROVED_FUNDER_KEYWORDS = ['moore', '11th hour']
+
+# (category, colour, keywords), first match wins
+CATEGORY_RULES = [
+    ('Research/Academic', 'blue', ['university', 'college', 'lab', 'institute', 'school']),
+    ('Government/Agency', 'orange', ['government', 'agency', 'epa', 'usgs', 'noaa', 'state', 'federal']),
+    ('Data Preservation/Archiving', 'green', ['archive', 'library']),
+    ('Data Coordination/Standards', 'red', ['data', 'tech', 'digital']),
+]
+DEFAULT_CATEGORY = ('Capacity Building/Support', 'orange')
+
+STREAM_CHUNK = 1024 * 1024
+ROW_CHUNK = 10_000
+
+# Type codes of cells in cached object columns
+MISSING, TEXT, INTEGER, REAL, BOOLEAN, DATETIME, DATE, TIME, TIMEDELTA = range(9)
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _column_names(header):
+    """Header cells as pandas names them: blanks become 'Unnamed: i', repeats get '.1', '.2'."""
+    names, seen = [], {}
+    for i, cell in enumerate(header):
+        name = f'Unnamed: {i}' if cell is None else cell
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _read_sheets(path):
+    """{sheet name: DataFrame} for every sheet, streamed row by row; first row is the header."""
+    # openpyxl is only needed by the workbook scripts, which declare it
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, ())
+            chunks = []
+            while chunk := list(itertools.islice(rows, ROW_CHUNK)):
+                chunks.append(pd.DataFrame.from_records(chunk))
+            frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            # Read-only sheets can report trailing blank rows/columns
+            filled = frame.notna()
+            frame = frame.iloc[:int(np.flatnonzero(filled.any(axis=1).to_numpy()).max(initial=-1)) + 1]
+            width = max(len(header), frame.shape[1])
+            header = tuple(header) + (None,) * (width - len(header))
+            used = filled.iloc[:len(frame)].any(axis=0).reindex(range(width), fill_value=False).to_numpy()
+            while width and header[width - 1] is None and not used[width - 1]:
+                width -= 1
+            frame = frame.reindex(columns=range(width)) if len(frame) else pd.DataFrame(
+                columns=range(width), dtype=object)
+            frame.columns = _column_names(header[:width])
+            sheets[sheet.title] = frame.fillna(np.nan).infer_objects()
+        return sheets
+    finally:
+        workbook.close()
+
+
+def _cell_kind(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NaT:
+        return MISSING
+    if isinstance(value, str):
+        return TEXT
+    if isinstance(value, (bool, np.bool_)):
+        return BOOLEAN
+    if isinstance(value, numbers.Integral):
+        return INTEGER
+    if isinstance(value, numbers.Real):
+        return REAL
+    if isinstance(value, datetime.datetime):
+        return DATETIME
+    if isinstance(value, datetime.date):
+        return DATE
+    if isinstance(value, datetime.time):
+        return TIME
+    if isinstance(value, datetime.timedelta):
+        return TIMEDELTA
+    raise TypeError(f"Cannot cache a {type(value).__name__} cell")
+
+
+def _cell_text(kind, value):
+    if kind == MISSING:
+        return ''
+    if kind in (DATETIME, DATE, TIME):
+        return value.isoformat()
+    if kind == TIMEDELTA:
+        return repr(value.total_seconds())
+    if kind == REAL:
+        return repr(float(value))
+    return str(value)
+
+
+PARSERS = {
+    TEXT: str,
+    INTEGER: int,
+    REAL: float,
+    BOOLEAN: lambda text: text == 'True',
+    DATETIME: pd.Timestamp,
+    DATE: datetime.date.fromisoformat,
+    TIME: datetime.time.fromisoformat,
+    TIMEDELTA: lambda text: pd.Timedelta(seconds=float(text)),
+}
+
+
+def _encode_objects(values):
+    """(type codes, texts) for an object array."""
+    kinds = np.array([_cell_kind(value) for value in values], dtype=np.int8)
+    texts = np.array([_cell_text(kind, value) for kind, value in zip(kinds.tolist(), values)], dtype=str)
+    return kinds, texts
+
+
+def _decode_objects(kinds, texts):
+    """Object array from _encode_objects() output; missing cells are NaN."""
+    values = np.full(len(kinds), np.nan, dtype=object)
+    for kind, parse in PARSERS.items():
+        at = np.flatnonzero(kinds == kind)
+        if len(at):
+            values[at] = [parse(text) for text in texts[at].tolist()]
+    return values
+
+
+def _save_sheets(sheets, path):
+    """Write {sheet name: DataFrame} as an .npz that loads without pickle."""
+    arrays = {'sheets': np.array(list(sheets), dtype=str),
+              'rows': np.array([len(frame) for frame in sheets.values()], dtype=np.int64)}
+    for s, frame in enumerate(sheets.values()):
+        arrays[f'{s}.columns.kinds'], arrays[f'{s}.columns'] = _encode_objects(frame.columns.to_numpy(object))
+        for c in range(frame.shape[1]):
+            values = frame.iloc[:, c].to_numpy()
+            if values.dtype == object:
+                arrays[f'{s}.{c}.kinds'], values = _encode_objects(values)
+            arrays[f'{s}.{c}'] = values
+    with open(path, 'wb') as f:
+        np.savez(f, **arrays)
+
+
+def _load_sheets(path):
+    """Read sheets written by _save_sheets()."""
+    with np.load(path, allow_pickle=False) as arrays:
+        sheets = {}
+        for s, (name, rows) in enumerate(zip(arrays['sheets'].tolist(), arrays['rows'].tolist())):
+            columns = _decode_objects(arrays[f'{s}.columns.kinds'], arrays[f'{s}.columns'])
+            data = {}
+            for c in range(len(columns)):
+                values = arrays[f'{s}.{c}']
+                if f'{s}.{c}.kinds' in arrays:
+                    values = _decode_objects(arrays[f'{s}.{c}.kinds'], values)
+                data[c] = values
+            frame = pd.DataFrame(data, index=pd.RangeIndex(rows))
+            frame.columns = pd.Index(columns.tolist())
+            sheets[name] = frame.infer_objects()
+        return sheets
+
+
+def read_workbook(path, cache_dir=CACHE_DIR):
+    """
+    Return {sheet name: DataFrame} for the workbook at `path`.
+
+    Parsed sheets are cached by file content; pass cache_dir=None to
+    always parse the workbook.
+    """
+    if cache_dir is None:
+        return _read_sheets(path)
+    cache_path = cache_dir / f'{file_digest(path)}.v{CACHE_VERSION}.npz'
+    try:
+        return _load_sheets(cache_path)
+    except (FileNotFoundError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+        pass
+
+    sheets = _read_sheets(path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    _save_sheets(sheets, tmp_path)
+    os.replace(tmp_path, cache_path)
+    return sheets
+
+
+def read_sheet(path, sheet, cache_dir=CACHE_DIR):
+    """One sheet of a workbook (see read_workbook)."""
+    return read_workbook(path, cache_dir=cache_dir)[sheet]
+
+
+def clean_text(series, strip=True):
+    """Cell values as (stripped) strings, with NaN for missing or blank cells."""
+    text = series.astype(str)
+    if strip:
+        text = text.str.strip()
+    return text.where(series.notna() & (text != '') & (text != 'nan'))
+
+
+def affiliations(attendance_df):
+    """Non-blank affiliations of the attendance sheet, in sheet order (none without the column)."""
+    if AFFILIATION_COLUMN not in attendance_df:
+        return pd.Series(dtype=object)
+    return clean_text(attendance_df[AFFILIATION_COLUMN]).dropna()
+
+
+def contains_any(names, keywords):
+    """Boolean Series: does each name contain any of `keywords` (case-insensitive)?"""
+    return names.str.contains('|'.join(map(re.escape, keywords)), case=False, regex=True, na=False)
+
+
+def is_funder(names):
+    """Boolean Series of names that look like funders (FUNDER_KEYWORDS)."""
+    return contains_any(names, FUNDER_KEYWORDS)
+
+
+def org_categories(names):
+    """(category, colour) Series for names, from the first matching CATEGORY_RULES entry."""
+    conditions = [contains_any(names, keywords).to_numpy() for _, _, keywords in CATEGORY_RULES]
+    category = np.select(conditions, [rule[0] for rule in CATEGORY_RULES], DEFAULT_CATEGORY[0])
+    color = np.select(conditions, [rule[1] for rule in CATEGORY_RULES], DEFAULT_CATEGORY[1])
+    return pd.Series(category, index=names.index), pd.Series(color, index=names.index)
+
+
+def name_ids(names, words=None, length=None):
+    """
+    Node ids from names: letters only, from the first `words` words
+    and truncated to `length` characters (None = no limit).
+    """
+    source = names.str.split().str[:words].str.join(' ') if words else names
+    ids = source.str.replace(r'[^a-zA-Z]', '', regex=True)
+    return ids.str[:length] if length else ids
@@ -1,253 +1,141 @@
 #!/usr/bin/env python3
 """
-Generate hypothetical network visualization - EXACT COPY of current network code
-but with hypothetical data loaded.
+Generate hypothetical network visualization - same renderer as the current
+network (pedp_network_map.render) but with hypothetical data loaded.
+
+`pedp-build` renders both maps in one process; this script only renders
+the hypothetical one.
+
+With --batch it renders every scenario instead: the scenarios in --spec
+(generated in memory), or every directory under --scenario-dir written by
+generate_hypothetical_network.py --spec. The current network is loaded
+once and shared with a pool of render workers (pedp_network_map.batch),
+and an index page links the maps.
+
+Usage:
+    python scripts/build_hypothetical_visualization.py
+    python scripts/build_hypothetical_visualization.py --batch --spec scenarios.json --workers 4
 """
 
-import networkx as nx
-import pandas as pd
-from pyvis.network import Network
+import argparse
+import sys
+import time
 import warnings
-warnings.filterwarnings('ignore')
-
-print("="*60)
-print("PEDP Network - Hypothetical Future State Generator")
-print("="*60)
-
-# Edge styling by relationship type (EXACT SAME as current network)
-EDGE_STYLES = {
-    'is a member of': {'color': '#8e44ad', 'width': 2.5, 'arrows': 'to'},
-    'funds': {'color': '#27ae60', 'width': 3, 'arrows': 'to'},
-    'coordinates action with': {'color': '#3498db', 'width': 2, 'arrows': 'to;from'},
-    'hypothetical connection': {'color': '#999999', 'width': 1.5, 'arrows': 'to', 'dashes': True}
-}
-
-# Load COMBINED data (current + hypothetical)
-print("\n1. Loading data...")
-nodes_current = pd.read_csv('data/processed/nodes.csv')
-nodes_hyp = pd.read_csv('data/processed/nodes_hypothetical.csv')
-nodes_df = pd.concat([nodes_current, nodes_hyp], ignore_index=True)
-
-edges_current = pd.read_csv('data/processed/edges.csv')
-edges_hyp = pd.read_csv('data/processed/edges_hypothetical.csv')
-edges_df = pd.concat([edges_current, edges_hyp], ignore_index=True)
-
-positions_current = pd.read_csv('data/processed/node_positions.csv')
-positions_hyp = pd.read_csv('data/processed/node_positions_hypothetical.csv')
-positions_df = pd.concat([positions_current, positions_hyp], ignore_index=True)
-
-# Load color config and create mapping (EXACT SAME as current)
-colors_df = pd.read_csv('data/processed/colors.csv')
-color_map = dict(zip(colors_df['name'], colors_df['hex']))
-nodes_df['hex_color'] = nodes_df['color'].map(color_map)
-
-# Create positions mapping (EXACT SAME as current - use original fixed values)
-positions_map = {row['id']: {'x': row['x'], 'y': row['y'], 'fixed': row['fixed']}
-                 for _, row in positions_df.iterrows()}
-
-print(f"   Nodes: {len(nodes_df)} ({len(nodes_current)} current + {len(nodes_hyp)} hypothetical)")
-print(f"   Edges: {len(edges_df)} ({len(edges_current)} current + {len(edges_hyp)} hypothetical)")
-
-# Build graph with ALL edges (current + hypothetical)
-print("\n2. Building network graph...")
-G = nx.DiGraph()
-
-for _, row in nodes_df.iterrows():
-    G.add_node(
-        row['id'],
-        name=row['name'],
-        organization=row['organization'],
-        category=row['category'],
-        description=row['description'],
-        status=row['status'],
-        timeline=row['timeline']
-    )
-
-for _, row in edges_df.iterrows():
-    G.add_edge(row['source'], row['target'], relationship_type=row['relationship_type'])
-
-G_undirected = G.to_undirected()
-
-# Calculate centrality on REAL edges only (for node sizing)
-print("\n3. Calculating centrality (on REAL edges only for sizing)...")
-G_real = nx.DiGraph()
-G_real.add_nodes_from(G.nodes(data=True))
-for source, target, data in G.edges(data=True):
-    if data['relationship_type'] != 'hypothetical connection':
-        G_real.add_edge(source, target, **data)
-
-G_real_undirected = G_real.to_undirected()
-
-# Create filtered graph for node sizing (EXACT SAME as current)
-G_filtered = nx.DiGraph()
-G_filtered.add_nodes_from(G_real.nodes(data=True))
-for source, target, data in G_real.edges(data=True):
-    if data['relationship_type'] != 'Interested in solving the problem':
-        G_filtered.add_edge(source, target, **data)
-
-G_filtered_undirected = G_filtered.to_undirected()
-degree_centrality_for_sizing = nx.degree_centrality(G_filtered_undirected)
-
-# Create PyVis visualization (EXACT SAME settings as current)
-print("\n4. Creating interactive visualization...")
-net = Network(
-    height='800px',
-    width='100%',
-    bgcolor='#f8f8f8',  # Light grey (only difference from current)
-    font_color='#333333',
-    directed=True
-)
-
-# EXACT SAME physics as current network
-net.barnes_hut(
-    gravity=-3000,
-    central_gravity=0.1,
-    spring_length=150,
-    spring_strength=0.01,
-    damping=0.2,
-    overlap=0
-)
-
-# Add nodes (EXACT SAME code as current network)
-for node in G.nodes():
-    node_data = nodes_df[nodes_df['id'] == node].iloc[0]
-    is_hypothetical = node.startswith('HYP-')
-
-    color = node_data['hex_color']
-
-    # SIZE STRATEGY (EXACT SAME as current)
-    if node_data['category'] == 'Funder':
-        size = 20
-    else:
-        # Only calculate for non-hypothetical nodes
-        if not is_hypothetical:
-            size = 15 + (degree_centrality_for_sizing.get(node, 0) * 200)
-        else:
-            size = 30  # Fixed size for hypothetical nodes
-
-    # Build tooltip (EXACT SAME as current)
-    tooltip_lines = [node_data['name'], f"Category: {node_data['category']}", ""]
-
-    if is_hypothetical:
-        tooltip_lines.append("⚠️ HYPOTHETICAL ORGANIZATION (NOT REAL)")
-        tooltip_lines.append("")
-        tooltip_lines.append(node_data['description'])
-    else:
-        node_degree = G_real_undirected.degree(node) if node in G_real_undirected else 0
-
-        if node_degree == 0:
-            if node_data['category'] == 'Funder':
-                tooltip_lines.append("Interested in working in this space")
-            else:
-                tooltip_lines.append("Actively working in this space")
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map import profiling
+from pedp_network_map.batch import render_scenarios, write_index
+from pedp_network_map.data import current_network, load_network, read_frames
+from pedp_network_map.graph import build_graph
+from pedp_network_map.overlays import HYPOTHETICAL_OVERLAYS
+from pedp_network_map.render import HYPOTHETICAL_BACKGROUND, RENDER_MODES, render_network
+from pedp_network_map.scenarios import generate_scenarios, load_scenarios, read_scenario
+
+DATA_DIR = Path('data/processed')
+SCENARIO_DIR = Path('data/scenarios')
+BATCH_OUTPUT_DIR = Path('outputs/scenarios')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Render the hypothetical network map(s).")
+    parser.add_argument("--batch", action="store_true",
+                        help="render every scenario plus an index page instead of one map")
+    parser.add_argument("--spec", type=Path,
+                        help="with --batch: JSON scenario specs to generate and render")
+    parser.add_argument("--scenario-dir", type=Path, default=SCENARIO_DIR,
+                        help="with --batch and no --spec: directory of scenario tables "
+                             "(default: data/scenarios)")
+    parser.add_argument("--output-dir", type=Path, default=BATCH_OUTPUT_DIR,
+                        help="with --batch: where the maps and index go (default: outputs/scenarios)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="with --batch: render processes (default: CPU count)")
+    parser.add_argument("--render-mode", choices=RENDER_MODES, default='physics',
+                        help="static, settled or physics (default: physics)")
+    return parser.parse_args()
+
+
+def render_one(args):
+    """Render data/processed's hypothetical tables to outputs/network_map_hypothetical.html."""
+    # Load COMBINED data (current + hypothetical), indexed by node id
+    print("\n1. Loading data...")
+    with profiling.stage('load') as record:
+        network = load_network(DATA_DIR, hypothetical=True)
+        record.count(nodes=len(network.nodes), edges=len(network.edges))
+    nodes_df = network.nodes
+    edges_df = network.edges
+
+    print(f"   Nodes: {len(nodes_df)} ({len(nodes_df) - network.added_nodes} current + {network.added_nodes} hypothetical)")
+    print(f"   Edges: {len(edges_df)} ({len(edges_df) - network.added_edges} current + {network.added_edges} hypothetical)")
+
+    # Build graph with ALL edges (current + hypothetical)
+    print("\n2. Building network graph...")
+    with profiling.stage('graph_build', nodes=len(network.nodes), edges=len(network.edges)):
+        G = build_graph(network)
+
+    # Sizes and tooltips are computed on REAL edges only inside the renderer
+    print("\n3. Creating interactive visualization...")
+    with profiling.stage('render', nodes=G.number_of_nodes(), edges=G.number_of_edges()):
+        output_path = render_network(G, network, 'outputs/network_map_hypothetical.html',
+                                     background=HYPOTHETICAL_BACKGROUND, mode=args.render_mode,
+                                     overlays=HYPOTHETICAL_OVERLAYS)
+    print(f"   ✓ Saved to: {output_path}")
+
+    print("\n✅ Hypothetical visualization generated!")
+    print("   Uses EXACT same physics and styling as current network")
+    print(f"   Only difference: light grey background + {network.added_nodes} hypothetical nodes + {network.added_edges} grey edges")
+    print("   Banner, watermark and legend added while writing the page")
+    return 0
+
+
+def render_batch(args):
+    """Render every scenario to --output-dir, plus index.html."""
+    print("\n1. Loading data...")
+    with profiling.stage('load') as record:
+        frames = read_frames(DATA_DIR)
+        base = current_network(frames)
+        record.count(nodes=len(base.nodes), edges=len(base.edges))
+    print(f"   Current: {len(base.nodes)} nodes, {len(base.edges)} edges")
+
+    print("\n2. Collecting scenarios...")
+    with profiling.stage('scenarios') as record:
+        if args.spec:
+            scenarios = list(generate_scenarios(frames['nodes'], frames['edges'],
+                                                load_scenarios(args.spec)).values())
         else:
-            connections = {
-                'member_of': [], 'has_members': [],
-                'funds': [], 'funded_by': [], 'coordinates': []
-            }
-
-            for _, target, edge_data in G_real.out_edges(node, data=True):
-                rel_type = edge_data['relationship_type']
-                target_name = G_real.nodes[target]['name']
-                if rel_type == "is a member of":
-                    connections['member_of'].append(target_name)
-                elif rel_type == "funds":
-                    connections['funds'].append(target_name)
-                elif rel_type == "coordinates action with":
-                    connections['coordinates'].append(target_name)
-
-            for source, _, edge_data in G_real.in_edges(node, data=True):
-                rel_type = edge_data['relationship_type']
-                source_name = G_real.nodes[source]['name']
-                if rel_type == "is a member of":
-                    connections['has_members'].append(source_name)
-                elif rel_type == "funds":
-                    connections['funded_by'].append(source_name)
-                elif rel_type == "coordinates action with":
-                    if source_name not in connections['coordinates']:
-                        connections['coordinates'].append(source_name)
-
-            if connections['member_of']:
-                tooltip_lines.append("Member of:")
-                for org in sorted(connections['member_of']):
-                    tooltip_lines.append(f"• {org}")
-                tooltip_lines.append("")
-            if connections['has_members']:
-                tooltip_lines.append("Has members:")
-                for org in sorted(connections['has_members']):
-                    tooltip_lines.append(f"• {org}")
-                tooltip_lines.append("")
-            if connections['funds']:
-                tooltip_lines.append("Funds:")
-                for org in sorted(connections['funds']):
-                    tooltip_lines.append(f"• {org}")
-                tooltip_lines.append("")
-            if connections['funded_by']:
-                tooltip_lines.append("Funded by:")
-                for org in sorted(connections['funded_by']):
-                    tooltip_lines.append(f"• {org}")
-                tooltip_lines.append("")
-            if connections['coordinates']:
-                tooltip_lines.append("Coordinates with:")
-                for org in sorted(connections['coordinates']):
-                    tooltip_lines.append(f"• {org}")
-
-    title = "\n".join(tooltip_lines).rstrip()
-    pos = positions_map[node]
-
-    # Add node - different styling for hypothetical
-    if is_hypothetical:
-        net.add_node(
-            node,
-            label=f"[HYPOTHETICAL]\n{node_data['name']}",
-            title=title,
-            color=color,
-            size=size,
-            borderWidth=3,
-            shape='box',
-            font={'color': '#666666'},
-            x=pos['x'],
-            y=pos['y'],
-            fixed=pos['fixed']
-        )
-    else:
-        net.add_node(
-            node,
-            label=node_data['name'],
-            title=title,
-            color=color,
-            size=size,
-            borderWidth=2,
-            borderWidthSelected=4,
-            x=pos['x'],
-            y=pos['y'],
-            fixed=pos['fixed']
-        )
-
-# Add edges (EXACT SAME as current)
-for edge in G.edges(data=True):
-    rel_type = edge[2]['relationship_type']
-    style = EDGE_STYLES[rel_type]
-
-    edge_config = {
-        'color': style['color'],
-        'width': style['width'],
-        'arrows': style['arrows'],
-        'title': rel_type,
-        'smooth': {'type': 'continuous'},
-        'arrowStrikethrough': False
-    }
-
-    if style.get('dashes'):
-        edge_config['dashes'] = True
-
-    net.add_edge(edge[0], edge[1], **edge_config)
-
-# Save
-print("\n5. Saving visualization...")
-net.save_graph('outputs/network_map_hypothetical.html')
-print(f"   ✓ Saved to: outputs/network_map_hypothetical.html")
-
-print("\n✅ Hypothetical visualization generated!")
-print("   Uses EXACT same physics and styling as current network")
-print("   Only difference: light grey background + 2 hypothetical nodes + 50 grey edges")
+            scenarios = [read_scenario(path) for path in sorted(args.scenario_dir.iterdir())
+                         if (path / 'nodes_hypothetical.csv').exists()]
+        record.count(scenarios=len(scenarios))
+    if not scenarios:
+        print("❌ No scenarios found - pass --spec or run generate_hypothetical_network.py --spec first")
+        return 1
+    print(f"   {len(scenarios)} scenario(s)")
+
+    print("\n3. Rendering maps...")
+    start = time.perf_counter()
+    with profiling.stage('render_batch', scenarios=len(scenarios)):
+        pages = render_scenarios(base, scenarios, args.output_dir, workers=args.workers,
+                                 mode=args.render_mode)
+        index_path = write_index(pages, args.output_dir)
+    for page in pages:
+        print(f"   ✓ {page.name}: {args.output_dir / page.filename} "
+              f"(+{page.added_nodes} nodes, +{page.added_edges} edges, {page.seconds:.2f}s)")
+
+    print(f"\n✅ Rendered {len(pages)} scenario maps in {time.perf_counter() - start:.1f}s")
+    print(f"   Index: {index_path}")
+    return 0
+
+
+def main():
+    args = parse_args()
+    warnings.filterwarnings('ignore')
+    profiling.start('build_hypothetical_visualization')
+
+    print("="*60)
+    print("PEDP Network - Hypothetical Future State Generator")
+    print("="*60)
+    return render_batch(args) if args.batch else render_one(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,26 +10,12 @@ echo "Building PEDP Network Visualizations"
 echo "=================================================="
 echo ""
 
-# Step 1: Generate hypothetical network data
-echo "Step 1: Generating hypothetical network data..."
-python3 scripts/generate_hypothetical_network.py
-echo ""
-
-# Step 2: Build current network visualization
-echo "Step 2: Building current network visualization..."
-cd notebooks
-jupyter nbconvert --execute --to notebook --inplace network_visualization.ipynb
-cd ..
-echo ""
-
-# Step 3: Build hypothetical network visualization
-echo "Step 3: Building hypothetical network visualization..."
-python3 scripts/build_hypothetical_visualization.py
-echo ""
-
-# Step 4: Add hypothetical watermark/indicators
-echo "Step 4: Adding visual indicators to hypothetical page..."
-python3 scripts/add_hypothetical_watermark.py
+# Positions → hypothetical data → current + hypothetical renders (in parallel).
+# Stages whose inputs are unchanged since the last run are skipped; the
+# hypothetical page gets its banner, watermark and legend as it is written.
+# Extra arguments go to the runner, e.g. --force or --only render-current.
+echo "Running the build pipeline (sync skipped; run ./scripts/sync_from_sheets.py first)..."
+python3 -m pedp_network_map.pipeline --skip sync "$@"
 echo ""
 
 echo "=================================================="
@@ -37,12 +23,14 @@ echo "✅ Build Complete!"
 echo "=================================================="
 echo ""
 echo "Output files:"
-echo "  • Current network:      outputs/network_map.html"
-echo "  • Hypothetical network: outputs/network_map_hypothetical.html"
+echo "  • Current network:       outputs/network_map.html"
+echo "  • Hypothetical scenario: outputs/network_map.html#scenario"
+echo "                           (delta in outputs/network_map.scenario.js)"
+echo "  • Centrality table:      outputs/centrality.csv"
 echo ""
 echo "To view:"
 echo "  open outputs/network_map.html"
-echo "  open outputs/network_map_hypothetical.html"
+echo "  then click '🔮 Show hypothetical scenario', or add #scenario to the URL"
 echo ""
-echo "Compare side-by-side to see current vs future state!"
+echo "Toggle between the two to see current vs future state!"
 echo "=================================================="
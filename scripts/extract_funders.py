@@ -4,19 +4,25 @@
 # ///
 """Extract funder data from Excel file."""
 
-import pandas as pd
+import sys
 from pathlib import Path
 
-# File path
-excel_file = Path(__file__).parent.parent / "Future of Open Environmental Data Convening Guest List - September 2025.xlsx"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map import profiling
+from pedp_network_map.workbooks import (
+    AFFILIATION_COLUMN, ATTENDANCE_SHEET, ATTENDANCE_WORKBOOK, read_sheet,
+)
 
-# Load FINAL ATTENDANCE tab
+profiling.start('extract_funders')
+
+# Load FINAL ATTENDANCE tab (parsed once, then cached by file hash)
 print("Loading FINAL ATTENDANCE tab...")
-df = pd.read_excel(excel_file, sheet_name="FINAL ATTENDANCE")
+with profiling.stage('read_workbook') as record:
+    df = read_sheet(ATTENDANCE_WORKBOOK, ATTENDANCE_SHEET)
+    record.count(rows=len(df))
 
 print(f"✓ Loaded {len(df)} rows")
 print("\nColumns:", df.columns.tolist())
 print("\nAll affiliations:")
-for idx, row in df.iterrows():
-    affiliation = row.get('Affiliation ', 'N/A')
-    print(f"{idx:2d}. {affiliation}")
+affiliations = df[AFFILIATION_COLUMN] if AFFILIATION_COLUMN in df else ['N/A'] * len(df)
+print('\n'.join(f"{idx:2d}. {affiliation}" for idx, affiliation in enumerate(affiliations)))
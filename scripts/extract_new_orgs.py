@@ -2,105 +2,108 @@
 # /// script
 # dependencies = ["pandas", "openpyxl"]
 # ///
-"""Extract new organizations from attendance list that aren't already in nodes."""
+"""
+Extract new organizations from attendance list that aren't already in nodes.
 
+Affiliations are matched against the names and organizations of the known
+nodes and funders with the trigram index in pedp_network_map.matching.
+Ranked candidates go to data/new_orgs_matches.csv for review, and likely
+duplicates already inside the Nodes tab are listed.
+"""
+
+import sys
 import pandas as pd
 from pathlib import Path
-import re
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map import profiling
+from pedp_network_map.matching import (
+    KNOWN_THRESHOLD, MATCH_THRESHOLD, find_duplicates, node_index,
+)
+from pedp_network_map.workbooks import (
+    ATTENDANCE_SHEET, ATTENDANCE_WORKBOOK, affiliations, name_ids, org_categories, read_sheet,
+)
 
 # File paths
-attendance_file = Path(__file__).parent.parent / "Future of Open Environmental Data Convening Guest List - September 2025.xlsx"
 nodes_file = Path(__file__).parent.parent / "data" / "processed" / "nodes.csv"
 funders_file = Path(__file__).parent.parent / "data" / "funders_to_add.csv"
 output_file = Path(__file__).parent.parent / "data" / "new_orgs_to_add.csv"
+matches_file = Path(__file__).parent.parent / "data" / "new_orgs_matches.csv"
+
+profiling.start('extract_new_orgs')
 
 # Load existing data
 print("Loading existing nodes and funders...")
-existing_nodes = pd.read_csv(nodes_file)
-existing_funders = pd.read_csv(funders_file)
-
-# Combine to get all known organizations
-all_known_orgs = set()
-for df in [existing_nodes, existing_funders]:
-    all_known_orgs.update(df['name'].str.lower().str.strip())
-    all_known_orgs.update(df['organization'].str.lower().str.strip())
-
-print(f"✓ Found {len(all_known_orgs)} known organizations\n")
-
-# Load attendance list
+with profiling.stage('load') as record:
+    existing_nodes = pd.read_csv(nodes_file)
+    existing_funders = pd.read_csv(funders_file)
+    record.count(nodes=len(existing_nodes), funders=len(existing_funders))
+
+# Index the names and organizations of all known nodes and funders
+with profiling.stage('index') as record:
+    known_index = node_index(existing_nodes, existing_funders)
+    record.count(names=len(known_index))
+print(f"✓ Indexed {len(known_index)} known names\n")
+
+# Load attendance list (parsed once, then cached by file hash)
 print("Loading FINAL ATTENDANCE...")
-attendance_df = pd.read_excel(attendance_file, sheet_name="FINAL ATTENDANCE")
+with profiling.stage('read_workbook') as record:
+    attendance_df = read_sheet(ATTENDANCE_WORKBOOK, ATTENDANCE_SHEET)
+    record.count(rows=len(attendance_df))
 print(f"✓ Loaded {len(attendance_df)} attendees\n")
 
 # Extract unique organizations
-attendee_orgs = []
-for idx, row in attendance_df.iterrows():
-    affiliation = str(row.get('Affiliation ', '')).strip()
-
-    if pd.isna(affiliation) or affiliation == 'nan' or affiliation == '':
-        continue
-
-    attendee_orgs.append(affiliation)
-
-unique_attendee_orgs = set(attendee_orgs)
+unique_attendee_orgs = set(affiliations(attendance_df))
 print(f"Found {len(unique_attendee_orgs)} unique organizations in attendance list\n")
 
-# Find NEW organizations (not in existing nodes or funders)
-new_orgs = []
-for org in sorted(unique_attendee_orgs):
-    org_lower = org.lower().strip()
-
-    # Check if this org is already known
-    is_known = False
-    for known_org in all_known_orgs:
-        if org_lower in known_org or known_org in org_lower:
-            is_known = True
-            break
-
-    if not is_known:
-        new_orgs.append(org)
-
-print(f"✓ Found {len(new_orgs)} NEW organizations not in existing data\n")
-
-# Generate CSV entries for new orgs
-new_nodes = []
-for org in new_orgs:
-    # Generate ID
-    org_id = re.sub(r'[^a-zA-Z]', '', org.replace(' ', ''))[:20]
-
-    # Determine category based on keywords
-    org_lower = org.lower()
-    if any(word in org_lower for word in ['university', 'college', 'lab', 'institute', 'school']):
-        category = 'Research/Academic'
-        color = 'blue'
-    elif any(word in org_lower for word in ['government', 'agency', 'epa', 'usgs', 'noaa', 'state', 'federal']):
-        category = 'Government/Agency'
-        color = 'orange'
-    elif any(word in org_lower for word in ['archive', 'library']):
-        category = 'Data Preservation/Archiving'
-        color = 'green'
-    elif any(word in org_lower for word in ['data', 'tech', 'digital']):
-        category = 'Data Coordination/Standards'
-        color = 'red'
-    else:
-        category = 'Capacity Building/Support'
-        color = 'orange'
-
-    new_nodes.append({
-        'id': org_id,
-        'name': org,
-        'organization': org,
-        'contact': '',
-        'description': f'Organization from Future of Open Environmental Data Convening (Sept 2025)',
-        'status': 'Established',
-        'website': '',
-        'category': category,
-        'timeline': 'Established/Long-running',
-        'color': color
-    })
-
-# Create DataFrame and save
-new_nodes_df = pd.DataFrame(new_nodes)
+# Find NEW organizations (no known node or funder scores KNOWN_THRESHOLD)
+with profiling.stage('match', queries=len(unique_attendee_orgs)) as record:
+    matches_df = known_index.match_all(sorted(unique_attendee_orgs), limit=3)
+    matches_df.to_csv(matches_file, index=False)
+    record.count(rows=len(matches_df))
+best_score = matches_df.groupby('query')['score'].max()
+new_orgs = [org for org in sorted(unique_attendee_orgs) if best_score[org] < KNOWN_THRESHOLD]
+
+print(f"✓ Found {len(new_orgs)} NEW organizations not in existing data")
+print(f"✓ Ranked candidates saved to: {matches_file}\n")
+
+# Near misses are added as new, but worth a look before copying them over
+near = matches_df[(matches_df['rank'] == 1) & (matches_df['score'] >= MATCH_THRESHOLD)
+                  & (matches_df['score'] < KNOWN_THRESHOLD)]
+if len(near):
+    print(f"⚠️  {len(near)} new organizations have a close known match:")
+    for _, row in near.iterrows():
+        print(f"  • {row['query']} ~ {row['name']} ({row['key']}, score {row['score']:.2f})")
+    print()
+
+# Likely duplicates already in the Nodes tab
+with profiling.stage('duplicates', nodes=len(existing_nodes)) as record:
+    duplicates_df = find_duplicates(existing_nodes)
+    record.count(pairs=len(duplicates_df))
+if len(duplicates_df):
+    print(f"⚠️  {len(duplicates_df)} likely duplicate pairs in the Nodes tab:")
+    for _, row in duplicates_df.iterrows():
+        print(f"  • {row['id_a']} '{row['name_a']}' ~ {row['id_b']} '{row['name_b']}' "
+              f"(score {row['score']:.2f})")
+    print()
+
+# Generate CSV entries for new orgs, with categories from CATEGORY_RULES keywords
+new_names = pd.Series(new_orgs, dtype=object)
+category, color = org_categories(new_names)
+new_nodes_df = pd.DataFrame({
+    'id': name_ids(new_names, length=20),
+    'name': new_names,
+    'organization': new_names,
+    'contact': '',
+    'description': 'Organization from Future of Open Environmental Data Convening (Sept 2025)',
+    'status': 'Established',
+    'website': '',
+    'category': category,
+    'timeline': 'Established/Long-running',
+    'color': color
+})
+
+# Save
 new_nodes_df.to_csv(output_file, index=False)
 
 print(f"✓ Generated {len(new_nodes_df)} new organization entries")
@@ -115,8 +118,8 @@ category_counts = new_nodes_df['category'].value_counts()
 for category, count in category_counts.items():
     print(f"\n{category}: {count} organizations")
     orgs_in_cat = new_nodes_df[new_nodes_df['category'] == category]
-    for idx, org in orgs_in_cat.iterrows():
-        print(f"  • {org['name']}")
+    for name in orgs_in_cat['name']:
+        print(f"  • {name}")
 
 print("\n" + "=" * 70)
 print("Next step: Copy these rows into your Google Sheet Nodes tab")
@@ -4,15 +4,20 @@
 # ///
 """Extract funder data from PEDP Funder spreadsheet."""
 
-import pandas as pd
+import sys
 from pathlib import Path
 
-# File path
-excel_file = Path(__file__).parent.parent / "PEDP Funder spreadsheet.xlsx"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map import profiling
+from pedp_network_map.workbooks import FUNDER_SHEET, FUNDER_WORKBOOK, read_sheet
 
-# Load Funder List sheet
+profiling.start('extract_pedp_funders')
+
+# Load Funder List sheet (parsed once, then cached by file hash)
 print("Loading Funder List sheet...")
-df = pd.read_excel(excel_file, sheet_name="Funder List")
+with profiling.stage('read_workbook') as record:
+    df = read_sheet(FUNDER_WORKBOOK, FUNDER_SHEET)
+    record.count(rows=len(df))
 
 print(f"✓ Loaded {len(df)} rows")
 print("\nColumns:", df.columns.tolist())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Google Sheets gviz CSV export.
+
+Serves canned CSV files so sync_from_sheets.py can be exercised without
+network access, with injected latency and failures to check timeouts,
+retries and conditional requests (ETag / If-None-Match → 304).
+
+Each tab is served from <csv-dir>/<gid>.csv. By default the current
+data/processed/nodes.csv and edges.csv are served under the gids in
+sync_from_sheets.py.
+
+Usage:
+    python3 scripts/fake_sheets_server.py --latency 0.5 --fail-rate 0.3
+    PEDP_SHEETS_BASE_URL=http://127.0.0.1:8765 ./scripts/sync_from_sheets.py
+"""
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_TABS = {
+    "941366450": PROJECT_DIR / "data" / "processed" / "nodes.csv",
+    "562789525": PROJECT_DIR / "data" / "processed" / "edges.csv",
+}
+
+
+class FakeSheetsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real export
+
+    def do_GET(self):
+        server = self.server
+        gid = parse_qs(urlsplit(self.path).query).get("gid", [""])[0]
+        with server.lock:
+            server.requests += 1
+            fail = server.fail_first > 0 or random.random() < server.fail_rate
+            if server.fail_first > 0:
+                server.fail_first -= 1
+
+        time.sleep(server.latency)
+
+        if fail:
+            self.send_error(503, "Injected failure")
+            return
+
+        path = server.tabs.get(gid)
+        if path is None or not path.exists():
+            self.send_error(400, f"Unknown gid {gid}")
+            return
+
+        body = path.read_bytes()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        # Trickle the body out so streaming parsing is exercised
+        for start in range(0, len(body), server.chunk):
+            self.wfile.write(body[start:start + server.chunk])
+            self.wfile.flush()
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8765, tabs=None, latency=0.0, fail_rate=0.0,
+                fail_first=0, chunk=4096, verbose=False):
+    """Create (but do not start) a fake sheets server."""
+    server = ThreadingHTTPServer((host, port), FakeSheetsHandler)
+    server.tabs = tabs or DEFAULT_TABS
+    server.latency = latency
+    server.fail_rate = fail_rate
+    server.fail_first = fail_first
+    server.chunk = chunk
+    server.verbose = verbose
+    server.requests = 0
+    server.lock = threading.Lock()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve canned CSV like the gviz export.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--csv-dir", type=Path,
+                        help="serve <csv-dir>/<gid>.csv instead of data/processed")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds to wait before every response")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="probability of answering 503 (0-1)")
+    parser.add_argument("--fail-first", type=int, default=0,
+                        help="answer the first N requests with 503")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    tabs = None
+    if args.csv_dir:
+        tabs = {path.stem: path for path in args.csv_dir.glob("*.csv")}
+
+    server = make_server(port=args.port, tabs=tabs, latency=args.latency,
+                         fail_rate=args.fail_rate, fail_first=args.fail_first,
+                         verbose=args.verbose)
+    print(f"Serving fake sheets on http://127.0.0.1:{args.port} (Ctrl+C to stop)")
+    print(f"  export PEDP_SHEETS_BASE_URL=http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -4,85 +4,58 @@
 # ///
 """Generate funders CSV from Excel file."""
 
+import sys
+import numpy as np
 import pandas as pd
 from pathlib import Path
-import re
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map import profiling
+from pedp_network_map.workbooks import (
+    APPROVED_FUNDER_KEYWORDS, ATTENDANCE_SHEET, ATTENDANCE_WORKBOOK,
+    affiliations, contains_any, is_funder, name_ids, read_sheet,
+)
 
 # File paths
-excel_file = Path(__file__).parent.parent / "Future of Open Environmental Data Convening Guest List - September 2025.xlsx"
 output_file = Path(__file__).parent.parent / "data" / "funders_to_add.csv"
 
-# Load FINAL ATTENDANCE tab
+profiling.start('generate_funders_csv')
+
+# Load FINAL ATTENDANCE tab (parsed once, then cached by file hash)
 print("Loading FINAL ATTENDANCE tab...")
-df = pd.read_excel(excel_file, sheet_name="FINAL ATTENDANCE")
+with profiling.stage('read_workbook') as record:
+    df = read_sheet(ATTENDANCE_WORKBOOK, ATTENDANCE_SHEET)
+    record.count(rows=len(df))
 print(f"✓ Loaded {len(df)} rows")
 
-# Identify funders by keywords in affiliation
-funder_keywords = [
-    'foundation', 'fund', 'trust', 'philanthropies', 'philanthropy',
-    'project', 'initiative', 'center', 'simons', '11th hour',
-    'moore', 'pew', 'kapor', 'heising', 'aspen', 'schmidt'
-]
-
-funders = []
-seen_orgs = set()
-
-for idx, row in df.iterrows():
-    affiliation = str(row.get('Affiliation ', '')).strip()
-
-    if pd.isna(affiliation) or affiliation == 'nan' or affiliation == '':
-        continue
-
-    # Check if this looks like a funder
-    is_funder = any(keyword in affiliation.lower() for keyword in funder_keywords)
-
-    if is_funder:
-        # Clean up the name
-        org_name = affiliation.strip()
-
-        # Skip duplicates
-        if org_name in seen_orgs:
-            continue
-        seen_orgs.add(org_name)
-
-        # Generate ID (first word or first 2 words, clean)
-        id_parts = org_name.split()[:2]
-        org_id = ''.join(re.sub(r'[^a-zA-Z]', '', word) for word in id_parts)
-
-        # Determine status (default to conversation)
-        # Moore Foundation is known approved funder
-        if 'moore' in org_name.lower():
-            status = '4. approved'
-        elif '11th hour' in org_name.lower():
-            status = '4. approved'
-        else:
-            status = '1. In conversation'
-
-        funders.append({
-            'id': org_id,
-            'name': org_name,
-            'organization': org_name,
-            'contact': '',
-            'description': f'Funder interested in environmental data initiatives',
-            'status': status,
-            'website': '',
-            'category': 'Funder',
-            'timeline': 'Established/Long-running',
-            'color': 'teal'
-        })
-
-# Create DataFrame
-funders_df = pd.DataFrame(funders)
+# Identify funders by keywords in affiliation (FUNDER_KEYWORDS), skipping duplicates
+names = affiliations(df)
+names = names[is_funder(names)].drop_duplicates().reset_index(drop=True)
+
+# ID from the first 2 words; Moore and 11th Hour are known approved funders
+funders_df = pd.DataFrame({
+    'id': name_ids(names, words=2),
+    'name': names,
+    'organization': names,
+    'contact': '',
+    'description': 'Funder interested in environmental data initiatives',
+    'status': np.where(contains_any(names, APPROVED_FUNDER_KEYWORDS), '4. approved', '1. In conversation'),
+    'website': '',
+    'category': 'Funder',
+    'timeline': 'Established/Long-running',
+    'color': 'teal'
+})
 
 # Save to CSV
-funders_df.to_csv(output_file, index=False)
+with profiling.stage('write', rows=len(funders_df)):
+    funders_df.to_csv(output_file, index=False)
 
 print(f"\n✓ Generated {len(funders_df)} funders")
 print(f"✓ Saved to: {output_file}\n")
 
 print("Funders extracted:")
-for idx, row in funders_df.iterrows():
-    print(f"  • {row['name']:40s} status: {row['status']}")
+for name, status in zip(funders_df['name'], funders_df['status']):
+    print(f"  • {name:40s} status: {status}")
 
 print("\n" + "="*60)
 print("Next step: Copy these rows into your Google Sheet Nodes tab")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Query the append-only sync history in data/history.
+
+Commands:
+- record: add the current data/processed tables to the history (the sync
+  does this itself; use it once to start the history from existing CSVs)
+- at DATE: write nodes.csv and edges.csv as they were synced at DATE
+- timelapse: node/edge counts at regular intervals, as CSV
+
+A bare date (2026-04-01) means the end of that day, so every sync made
+on it is included.
+
+Usage:
+    python scripts/network_history.py record
+    python scripts/network_history.py at 2026-04-01 --output-dir /tmp/network-2026-04-01
+    python scripts/network_history.py timelapse --freq W --output outputs/growth.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map.data import EDGE_COLUMNS, NODE_COLUMNS, PROCESSED_DIR
+from pedp_network_map.history import HISTORY_DIR, load_history, record_sync
+
+
+def as_of(value):
+    """Parse a DATE argument (UTC); a bare date means the last moment of that day."""
+    when = pd.Timestamp(value)
+    when = when.tz_localize('UTC') if when.tzinfo is None else when.tz_convert('UTC')
+    if len(value) == 10:
+        when += pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+    return when
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Query the append-only network history.")
+    parser.add_argument("--history-dir", type=Path, default=HISTORY_DIR,
+                        help="history log directory (default: data/history)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="record the current processed tables")
+    record.add_argument("--data-dir", type=Path, default=PROCESSED_DIR,
+                        help="directory with nodes.csv and edges.csv (default: data/processed)")
+
+    at = commands.add_parser("at", help="write the tables as they were at DATE")
+    at.add_argument("date", type=as_of, help="date or ISO timestamp (UTC)")
+    at.add_argument("--output-dir", type=Path, required=True,
+                    help="where to write nodes.csv and edges.csv")
+
+    timelapse = commands.add_parser("timelapse", help="node/edge counts over time")
+    timelapse.add_argument("--freq", default="D",
+                           help="pandas frequency between frames, e.g. D, W, MS (default: D)")
+    timelapse.add_argument("--start", type=as_of, help="first frame (default: first sync)")
+    timelapse.add_argument("--end", type=as_of, help="last frame (default: last change)")
+    timelapse.add_argument("--output", type=Path, help="CSV to write (default: print)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.command == "record":
+        nodes_df = pd.read_csv(args.data_dir / "nodes.csv")
+        edges_df = pd.read_csv(args.data_dir / "edges.csv")
+        changes = record_sync(nodes_df[NODE_COLUMNS], edges_df[EDGE_COLUMNS], args.history_dir)
+        for table, (opened, closed) in changes.items():
+            print(f"✓ {table}: {opened} opened, {closed} closed")
+        return 0
+
+    history = load_history(args.history_dir)
+    if history.first is None:
+        print(f"❌ No history in {args.history_dir} - run a sync or `record` first")
+        return 1
+
+    if args.command == "at":
+        nodes_df, edges_df = history.snapshot(args.date)
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+        nodes_df.to_csv(args.output_dir / "nodes.csv", index=False)
+        edges_df.to_csv(args.output_dir / "edges.csv", index=False)
+        print(f"✓ {len(nodes_df)} nodes, {len(edges_df)} edges at {args.date} → {args.output_dir}")
+        return 0
+
+    start = args.start or history.first
+    end = args.end or history.last
+    # Always include the first and last moment, whatever the frequency
+    times = pd.date_range(start, end, freq=args.freq).union(pd.DatetimeIndex([start, end]))
+    frame = history.timelapse(times)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        frame.to_csv(args.output, index=False)
+        print(f"✓ {len(frame)} frames → {args.output}")
+    else:
+        print(frame.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
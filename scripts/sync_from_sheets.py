@@ -9,13 +9,40 @@ Google Sheet: https://docs.google.com/spreadsheets/d/1G1b8zy-aWqFBeeBIgBMXgnZQI8
 
 Simplified approach:
 - Funders are regular rows in Nodes tab with category="Funder"
-- Script auto-generates funding edges based on status field
+- Script auto-generates funding edges based on status field, using the
+  declarative rules in pedp_network_map.rules (--rules FILE adds custom
+  rules to the defaults); edges already in the Edges tab are not duplicated
+
+Change detection:
+- Each run records per-tab content hashes and HTTP validators in
+  data/processed/sync_manifest.json
+- If no tab changed since the last sync, nothing is rewritten and the
+  script exits with status 78 (EXIT_NO_CHANGE) so later stages can be
+  skipped. Pass --force to regenerate anyway.
+- The manifest also records digests of the --rules file and of the sync
+  code (SYNC_CODE), so changing either regenerates the CSVs
+
+History:
+- Every sync that writes the CSVs also appends the node/edge rows that
+  changed to the log in data/history (pedp_network_map.history), so past
+  states can be rebuilt with scripts/network_history.py
 """
 
+import argparse
+import os
 import pandas as pd
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from pedp_network_map import profiling
+from pedp_network_map.artifact import write_artifact
+from pedp_network_map.history import HISTORY_DIR, record_sync
+from pedp_network_map.rules import DEFAULT_RULES, derive_edges, load_rules
+from pedp_network_map.sheets import (
+    EXIT_NO_CHANGE, SheetFetchError, fetch_tabs, load_manifest, save_manifest, sync_inputs, unchanged,
+)
+
 # Configuration
 SPREADSHEET_ID = "1G1b8zy-aWqFBeeBIgBMXgnZQI81du6wp8hieei2hkTc"
 SHEET_IDS = {
@@ -24,79 +51,127 @@ SHEET_IDS = {
 }
 
 OUTPUT_DIR = Path(__file__).parent.parent / "data" / "processed"
+MANIFEST_FILE = OUTPUT_DIR / "sync_manifest.json"
+
+# Code whose changes invalidate the manifest (fetching, derived edges, CSV output)
+PACKAGE_DIR = Path(__file__).parent.parent / "pedp_network_map"
+SYNC_CODE = [Path(__file__), PACKAGE_DIR / "sheets.py", PACKAGE_DIR / "rules.py"]
+
+# Point at a local stand-in (scripts/fake_sheets_server.py) for testing
+SHEETS_BASE_URL = os.environ.get("PEDP_SHEETS_BASE_URL", "https://docs.google.com/spreadsheets/d")
 
 def get_sheet_url(gid):
     """Generate CSV export URL for a Google Sheet tab."""
-    return f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/gviz/tq?tqx=out:csv&gid={gid}"
+    return f"{SHEETS_BASE_URL}/{SPREADSHEET_ID}/gviz/tq?tqx=out:csv&gid={gid}"
+
+def print_setup_help(url):
+    """Explain how to make the sheet readable after a failed download."""
+    print("\n" + "="*60)
+    print("SETUP REQUIRED:")
+    print("="*60)
+    print("\n1. Make the Google Sheet publicly accessible:")
+    print("   • Open the sheet")
+    print("   • Click 'Share' (top right)")
+    print("   • Change 'Restricted' to 'Anyone with the link'")
+    print("   • Set permission to 'Viewer'")
+    print("   • Click 'Done'")
+    print(f"\n2. Current URL: {url}")
+    print("\n3. Re-run this script")
+    print("="*60 + "\n")
 
-def load_sheet(name, gid):
-    """Load a Google Sheet tab as a DataFrame."""
-    url = get_sheet_url(gid)
-    print(f"Loading {name} sheet (gid={gid})...")
+def load_sheets(tabs, previous=None, args=None):
+    """Load Google Sheet tabs concurrently, sending validators from the previous sync."""
+    urls = {name: (gid, get_sheet_url(gid)) for name, gid in tabs.items()}
+    for name, gid in tabs.items():
+        print(f"Loading {name} sheet (gid={gid})...")
     try:
-        df = pd.read_csv(url)
-        print(f"✓ Loaded {len(df)} rows from {name}")
-        return df
-    except Exception as e:
-        print(f"✗ Failed to load {name}: {e}")
-        print("\n" + "="*60)
-        print("SETUP REQUIRED:")
-        print("="*60)
-        print("\n1. Make the Google Sheet publicly accessible:")
-        print("   • Open the sheet")
-        print("   • Click 'Share' (top right)")
-        print("   • Change 'Restricted' to 'Anyone with the link'")
-        print("   • Set permission to 'Viewer'")
-        print("   • Click 'Done'")
-        print(f"\n2. Current URL: {url}")
-        print("\n3. Re-run this script")
-        print("="*60 + "\n")
-        sys.exit(1)
-
-def generate_funding_edges(nodes_df):
-    """
-    Auto-generate funding edges for funders based on status.
-
-    Rule: category="Funder" AND status="4. approved" → creates "funds" edge to PEDP
-    """
-    funding_edges = []
-
-    # Find funders with approved status
-    funders = nodes_df[
-        (nodes_df['category'] == 'Funder') &
-        (nodes_df['status'].str.contains('4', na=False) | nodes_df['status'].str.contains('approved', na=False))
-    ]
-
-    for idx, funder in funders.iterrows():
-        edge = {
-            'source': funder['id'],
-            'target': 'PEDP',
-            'relationship_type': 'funds'
-        }
-        funding_edges.append(edge)
-        print(f"  • {funder['name']}: status '{funder['status']}' → funds PEDP")
-
-    return pd.DataFrame(funding_edges)
+        results = fetch_tabs(urls, previous=previous, timeout=args.timeout, retries=args.retries)
+    except SheetFetchError as e:
+        print(f"✗ Failed to load {e.name}: {e.reason}")
+        print_setup_help(e.url)
+        return None
+    for result in results:
+        if result.not_modified:
+            print(f"✓ {result.name} not modified since last sync")
+        else:
+            print(f"✓ Loaded {len(result.frame)} rows from {result.name}")
+    return results
+
+def report_derived_edges(derived_df, nodes_df, limit=20):
+    """Print the derived edges (the first `limit` of them) grouped by rule."""
+    names = nodes_df.drop_duplicates('id').set_index('id')['name']
+    for rule, group in derived_df.groupby('rule', sort=False):
+        print(f"  {rule}: {len(group)} edges")
+        for edge in group.head(limit).itertuples(index=False):
+            print(f"  • {names.get(edge.source, edge.source)} → {edge.relationship_type} {edge.target}")
+        if len(group) > limit:
+            print(f"  … and {len(group) - limit} more")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sync nodes and edges from Google Sheets.")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate the CSVs even if the sheet is unchanged")
+    parser.add_argument("--timeout", type=float, default=30,
+                        help="seconds per request before retrying (default: 30)")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="retries per tab with exponential backoff (default: 3)")
+    parser.add_argument("--rules", type=Path,
+                        help="JSON file of extra derived-edge rules, applied after the default "
+                             "rule (approved funders fund PEDP)")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    profiling.start('sync')
+
     print("="*60)
     print("PEDP Network Map - Google Sheets Sync")
     print("="*60 + "\n")
 
-    # Load nodes and edges
-    nodes_df = load_sheet("Nodes", SHEET_IDS["nodes"])
-    edges_df = load_sheet("Edges", SHEET_IDS["edges"])
-
-    # Auto-generate funding edges
-    print("\nGenerating funding edges for approved funders...")
-    funding_edges_df = generate_funding_edges(nodes_df)
-
-    if len(funding_edges_df) > 0:
+    nodes_file = OUTPUT_DIR / "nodes.csv"
+    edges_file = OUTPUT_DIR / "edges.csv"
+    manifest = load_manifest(MANIFEST_FILE)
+    previous = manifest.get('tabs', {})
+
+    # Load nodes and edges (conditional requests against the last sync)
+    tabs = {"Nodes": SHEET_IDS["nodes"], "Edges": SHEET_IDS["edges"]}
+    with profiling.stage('fetch', tabs=len(tabs)):
+        results = load_sheets(tabs, previous, args)
+    if results is None:
+        return 1
+
+    inputs = sync_inputs(args.rules, SYNC_CODE)
+    if (not args.force and unchanged(results, manifest, inputs)
+            and nodes_file.exists() and edges_file.exists()):
+        print("\n✓ Sheet unchanged since last sync "
+              f"({manifest.get('synced_at', 'unknown time')}) - nothing to rebuild")
+        return EXIT_NO_CHANGE
+
+    # Something changed: re-download any tab that came back 304
+    stale = {result.name: result.gid for result in results if result.frame is None}
+    if stale:
+        with profiling.stage('refetch', tabs=len(stale)):
+            refetched = load_sheets(stale, args=args)
+        if refetched is None:
+            return 1
+        refetched = {result.name: result for result in refetched}
+        results = [refetched.get(result.name, result) for result in results]
+    nodes_df, edges_df = (result.frame for result in results)
+
+    # Auto-generate derived edges (e.g. approved funders → funds PEDP)
+    rules = DEFAULT_RULES + (load_rules(args.rules) if args.rules else [])
+    print(f"\nGenerating derived edges from {len(rules)} rule(s)...")
+    with profiling.stage('derive_edges', nodes=len(nodes_df), edges=len(edges_df)) as record:
+        derived_df = derive_edges(nodes_df, rules, existing_edges=edges_df)
+        record.count(derived_edges=len(derived_df))
+
+    if len(derived_df) > 0:
+        report_derived_edges(derived_df, nodes_df)
         # Add to existing edges
-        edges_df = pd.concat([edges_df, funding_edges_df], ignore_index=True)
-        print(f"\n✓ Added {len(funding_edges_df)} funding edges")
+        edges_df = pd.concat([edges_df, derived_df.drop(columns='rule')], ignore_index=True)
+        print(f"\n✓ Added {len(derived_df)} derived edges")
     else:
-        print("  (No approved funders found)")
+        print("  (No new derived edges)")
 
     # Ensure required columns exist
     required_node_cols = ['id', 'name', 'organization', 'contact', 'description',
@@ -113,17 +188,25 @@ def main():
     # Save to CSV
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    nodes_file = OUTPUT_DIR / "nodes.csv"
-    edges_file = OUTPUT_DIR / "edges.csv"
-
-    nodes_df[required_node_cols].to_csv(nodes_file, index=False)
-    edges_df[required_edge_cols].to_csv(edges_file, index=False)
+    with profiling.stage('write', nodes=len(nodes_df), edges=len(edges_df)):
+        nodes_df[required_node_cols].to_csv(nodes_file, index=False)
+        edges_df[required_edge_cols].to_csv(edges_file, index=False)
+        artifact_dir = write_artifact(OUTPUT_DIR)
+        save_manifest(MANIFEST_FILE, SPREADSHEET_ID, results, inputs)
+    with profiling.stage('history') as record:
+        changes = record_sync(nodes_df[required_node_cols], edges_df[required_edge_cols], HISTORY_DIR)
+        (nodes_opened, nodes_closed), (edges_opened, edges_closed) = changes['nodes'], changes['edges']
+        record.count(nodes_opened=nodes_opened, nodes_closed=nodes_closed,
+                     edges_opened=edges_opened, edges_closed=edges_closed)
 
     print("\n" + "="*60)
     print("SYNC COMPLETE ✓")
     print("="*60)
     print(f"\n📁 Saved {len(nodes_df)} nodes to: {nodes_file}")
     print(f"📁 Saved {len(edges_df)} edges to: {edges_file}")
+    print(f"📦 Wrote binary tables to: {artifact_dir}")
+    print("🕓 History: " + ", ".join(f"{table} +{opened}/-{closed}"
+                                      for table, (opened, closed) in changes.items()))
 
     # Show summary
     print("\n=== Entity Summary ===")
@@ -134,9 +217,10 @@ def main():
 
     print("\nNext steps:")
     print("  1. Review the generated CSV files")
-    print("  2. Run the notebook to regenerate visualization:")
-    print("     jupyter nbconvert --execute --to notebook --inplace notebooks/network_visualization.ipynb")
+    print("  2. Regenerate the visualizations:")
+    print("     pedp-build")
     print("  3. Open outputs/network_map.html\n")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
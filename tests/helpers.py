@@ -0,0 +1,70 @@
+"""Run the pages' scripts in Node.js against stub vis DataSets and DOM."""
+
+import json
+import re
+import shutil
+import subprocess
+
+import pytest
+
+needs_node = pytest.mark.skipif(shutil.which('node') is None, reason='needs Node.js')
+
+# Just enough of vis-data and the DOM for the page scripts
+HARNESS = """
+function DataSet(items) { this.items = new Map(); this.add(items || []); }
+DataSet.prototype.add = function (items) {
+    var self = this;
+    return [].concat(items).map(function (item) {
+        if (self.items.has(item.id)) throw new Error('duplicate id ' + item.id);
+        var id = item.id === undefined ? 'auto' + self.items.size : item.id;
+        self.items.set(id, Object.assign({}, item, {id: id}));
+        return id;
+    });
+};
+DataSet.prototype.get = function (ids) {
+    var self = this;
+    if (Array.isArray(ids)) return ids.map(function (id) { return self.items.get(id); });
+    return self.items.has(ids) ? self.items.get(ids) : null;
+};
+DataSet.prototype.getIds = function () { return Array.from(this.items.keys()); };
+DataSet.prototype.remove = function (ids) {
+    var self = this;
+    [].concat(ids).forEach(function (id) { self.items.delete(id); });
+};
+DataSet.prototype.update = function (items) {
+    var self = this;
+    [].concat(items).forEach(function (item) {
+        if (!self.items.has(item.id)) throw new Error('update of missing id ' + item.id);
+        Object.assign(self.items.get(item.id), item);
+    });
+};
+function element() {
+    var el = {style: {}, children: [], listeners: {}, textContent: '', value: '',
+              appendChild: function (child) { this.children.push(child); },
+              insertBefore: function (child) { this.children.push(child); },
+              remove: function () {}, setAttribute: function () {}, blur: function () {},
+              addEventListener: function (type, fn) { this.listeners[type] = fn; }};
+    Object.defineProperty(el, 'innerHTML', {set: function () { el.children = []; }});
+    return el;
+}
+var listeners = {};
+var window = globalThis, location = {hash: '', pathname: '/map.html', search: ''};
+var history = {replaceState: function () {}};
+var document = {title: 'map', body: element(), head: element(), createElement: element,
+                getElementById: function () { return element(); }};
+window.addEventListener = function (type, fn) { listeners[type] = fn; };
+var network = {on: function () {}, once: function () {}, getScale: function () { return 1; },
+               selectNodes: function () {}, focus: function () {}};
+"""
+
+
+def script_body(script):
+    """The JavaScript inside a <script> block."""
+    return re.sub(r'</?script[^>]*>', '', script)
+
+
+def run_node(source):
+    """Run `source` after HARNESS and return what it prints, parsed as JSON."""
+    result = subprocess.run(['node', '-e', HARNESS + source], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout)
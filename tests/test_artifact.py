@@ -0,0 +1,52 @@
+"""The binary artifact goes stale when a CSV's content changes, and stat() settles the common case."""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from pedp_network_map import artifact
+from pedp_network_map.artifact import CSV_FILES, artifact_status, load_artifact, write_artifact
+from pedp_network_map.data import PROCESSED_DIR
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for csv in CSV_FILES.values():
+        if (PROCESSED_DIR / csv).exists():
+            shutil.copy(PROCESSED_DIR / csv, tmp_path / csv)
+    write_artifact(tmp_path)
+    return tmp_path
+
+
+def test_artifact_matches_csvs(data_dir):
+    frames = load_artifact(data_dir)
+    for name, frame in frames.items():
+        pd.testing.assert_frame_equal(frame, pd.read_csv(data_dir / CSV_FILES[name]))
+
+
+def test_touching_a_csv_keeps_the_artifact(data_dir):
+    csv = data_dir / CSV_FILES['nodes']
+    stat = csv.stat()
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert artifact_status(data_dir) == 'fresh'
+
+
+def test_same_size_edit_makes_it_stale(data_dir):
+    csv = data_dir / CSV_FILES['nodes']
+    size = csv.stat().st_size
+    text = csv.read_text(encoding='utf-8')
+    csv.write_text(text[:-2] + ('x' if text[-2] != 'x' else 'y') + text[-1], encoding='utf-8')
+    stat = csv.stat()
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert csv.stat().st_size == size
+    assert artifact_status(data_dir) == 'stale'
+    assert load_artifact(data_dir) is None
+
+
+def test_unchanged_stat_skips_hashing(data_dir, monkeypatch):
+    def digest(path):
+        raise AssertionError(f"hashed {path}")
+    monkeypatch.setattr(artifact, '_digest', digest)
+    assert artifact_status(data_dir) == 'fresh'
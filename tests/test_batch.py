@@ -0,0 +1,25 @@
+"""Scenario pages never overwrite the index page."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from pedp_network_map.batch import INDEX_FILENAME, render_scenarios, slugify
+
+
+@pytest.mark.parametrize('name, slug', [
+    ('Index', 'index-scenario'),
+    (' INDEX! ', 'index-scenario'),
+    ('Indexing hubs', 'indexing-hubs'),
+    ('???', 'scenario'),
+])
+def test_slugify(name, slug):
+    assert slugify(name) == slug
+    assert f'{slugify(name)}.html' != INDEX_FILENAME
+
+
+def test_renamed_slug_still_checked_for_collisions(tmp_path):
+    scenarios = [SimpleNamespace(name=name, nodes=None, edges=None, positions=None)
+                 for name in ('index', 'Index scenario')]
+    with pytest.raises(ValueError, match='index-scenario.html'):
+        render_scenarios(None, scenarios, tmp_path)
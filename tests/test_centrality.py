@@ -0,0 +1,60 @@
+"""Brandes betweenness and closeness, against NetworkX."""
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from pedp_network_map.centrality import path_centrality
+from pedp_network_map.data import build_network_data, current_network, read_frames
+from pedp_network_map.graph import build_graph, real_graph
+
+
+def random_network(n=120, p=0.03, seed=1):
+    """A G(n, p) graph: several components, isolated nodes included."""
+    G = nx.gnp_random_graph(n, p, seed=seed, directed=True)
+    ids = [f'N{i}' for i in range(n)]
+    return build_network_data(
+        pd.DataFrame({'id': ids, 'name': ids, 'color': 'blue'}),
+        pd.DataFrame([(ids[s], ids[t], 'member') for s, t in G.edges],
+                     columns=['source', 'target', 'relationship_type']),
+        pd.DataFrame(columns=['id', 'x', 'y', 'fixed']),
+        pd.DataFrame({'name': ['blue'], 'hex': ['#00f']}),
+    )
+
+
+@pytest.fixture(params=['current', 'random'])
+def undirected(request):
+    network = current_network(read_frames()) if request.param == 'current' else random_network()
+    return real_graph(build_graph(network)).to_undirected()
+
+
+def test_exact_results_match_networkx(undirected):
+    G = undirected.to_networkx()
+    result = path_centrality(undirected, samples=0)
+    assert result.exact and not result.error.any()
+    nodes = undirected.nodes()
+    betweenness, closeness = nx.betweenness_centrality(G), nx.closeness_centrality(G)
+    np.testing.assert_allclose(result.betweenness, [betweenness[node] for node in nodes], atol=1e-12)
+    np.testing.assert_allclose(result.closeness, [closeness[node] for node in nodes], atol=1e-12)
+
+
+def test_workers_and_cache_give_the_same_result(undirected, tmp_path):
+    serial = path_centrality(undirected, samples=0)
+    parallel = path_centrality(undirected, samples=0, workers=2, cache_dir=tmp_path)
+    cached = path_centrality(undirected, samples=0, cache_dir=tmp_path)
+    assert not parallel.cached and cached.cached
+    for result in (parallel, cached):
+        np.testing.assert_allclose(result.betweenness, serial.betweenness, atol=1e-12)
+        np.testing.assert_array_equal(result.closeness, parallel.closeness)
+
+
+def test_sampled_betweenness_stays_within_its_bound():
+    undirected = real_graph(build_graph(random_network(n=400, p=0.008))).to_undirected()
+    exact = path_centrality(undirected, samples=0)
+    sampled = path_centrality(undirected, samples=150)
+    assert not sampled.exact and sampled.sources < exact.sources
+    assert (sampled.error > 0).any()
+    # The bound holds per node at 95%; allow a few misses
+    misses = np.abs(sampled.betweenness - exact.betweenness) > sampled.error
+    assert misses.mean() < 0.05
@@ -0,0 +1,46 @@
+"""The id-indexed node store and extend_network()."""
+
+import pandas as pd
+
+from pedp_network_map.data import current_network, extend_network, read_frames
+
+
+def test_added_nodes_skips_ids_already_present():
+    frames = read_frames(hypothetical=True)
+    base = current_network(frames)
+    hubs = frames['nodes_hypothetical']
+    existing = base.nodes.iloc[[0]].drop(columns='hex_color')
+    nodes_df = pd.concat([hubs, hubs.iloc[[0]], existing], ignore_index=True)
+
+    network = extend_network(base, nodes_df, frames['edges_hypothetical'], frames['positions_hypothetical'])
+
+    assert network.added_nodes == hubs['id'].nunique()
+    assert len(network.nodes) == len(base.nodes) + network.added_nodes
+    assert network.node(existing['id'].iloc[0]) == base.node(existing['id'].iloc[0])
+
+
+def test_node_store_matches_mask_lookups():
+    frames = read_frames()
+    network = current_network(frames)
+    nodes_df, colors = frames['nodes'], dict(zip(frames['colors']['name'], frames['colors']['hex']))
+    assert list(network.nodes.index) == list(dict.fromkeys(nodes_df['id']))
+    for node_id in nodes_df['id'].sample(20, random_state=0):
+        row = nodes_df[nodes_df['id'] == node_id].iloc[0]
+        record = network.node(node_id)
+        pd.testing.assert_series_equal(pd.Series(record)[nodes_df.columns], row, check_names=False,
+                                       check_dtype=False)
+        assert network.name(node_id) == row['name']
+        assert record['hex_color'] == colors.get(row['color'])
+    positions = frames['positions'].set_index('id')
+    for node_id, position in network.positions.items():
+        assert (position['x'], position['y']) == (positions.at[node_id, 'x'], positions.at[node_id, 'y'])
+
+
+def test_duplicate_ids_keep_their_first_row():
+    frames = read_frames()
+    nodes_df = frames['nodes']
+    duplicate = nodes_df.iloc[[0]].assign(name='Second copy')
+    frames['nodes'] = pd.concat([nodes_df, duplicate], ignore_index=True)
+    network = current_network(frames)
+    assert len(network.nodes) == nodes_df['id'].nunique()
+    assert network.name(nodes_df['id'].iloc[0]) == nodes_df['name'].iloc[0]
@@ -0,0 +1,94 @@
+"""The scenario toggle on a clustered map, run in Node against stub vis DataSets."""
+
+import copy
+import json
+
+import pytest
+
+from helpers import needs_node, run_node, script_body
+from pedp_network_map.clusters import cluster_hierarchy, collapse_clusters, lod_script
+from pedp_network_map.data import current_network, hypothetical_network, read_frames
+from pedp_network_map.delta import (
+    SCENARIO_CALLBACK, is_redirect, scenario_delta, scenario_payload, scenario_toggle, write_redirect,
+)
+from pedp_network_map.graph import build_graph
+from pedp_network_map.render import build_pyvis_network
+
+pytestmark = needs_node
+
+
+@pytest.fixture(scope='module')
+def clustered():
+    frames = read_frames(hypothetical=True)
+    current = current_network(frames)
+    hypothetical = hypothetical_network(frames, base=current)
+    G, G_hyp = build_graph(current), build_graph(hypothetical)
+    net = build_pyvis_network(G, current)
+    delta = scenario_delta(net, build_pyvis_network(G_hyp, hypothetical))
+    full_nodes = copy.deepcopy(net.nodes)
+    payload = collapse_clusters(net, cluster_hierarchy(G, current, min_community=2))
+    return {'visible': net.nodes, 'payload': payload, 'delta': delta, 'full_nodes': full_nodes}
+
+
+def test_toggle_applies_and_reverts_on_clustered_map(clustered):
+    delta = clustered['delta']
+    assert delta['nodes'] and delta['edges'] and delta['updates']
+    hub_ids = [node['id'] for node in delta['nodes']]
+    source = f"""
+location.hash = '#scenario';
+var nodes = new DataSet({json.dumps(clustered['visible'])}), edges = new DataSet([]);
+{script_body(scenario_toggle('map.scenario.js'))}
+{script_body(lod_script(clustered['payload']))}
+var hubs = {json.dumps(hub_ids)}, out = {{}};
+window.{SCENARIO_CALLBACK}({json.dumps(scenario_payload(delta))});
+function snapshot() {{
+    return {{
+        hubs: hubs.filter(function (id) {{ return nodes.get(id) !== null; }}).length,
+        hubEdges: edges.get(edges.getIds()).filter(function (edge) {{
+            return hubs.indexOf(edge.from) >= 0 || hubs.indexOf(edge.to) >= 0;
+        }}).length,
+        dangling: edges.get(edges.getIds()).filter(function (edge) {{
+            return nodes.get(edge.from) === null || nodes.get(edge.to) === null;
+        }}).length,
+        visible: nodes.getIds().length
+    }};
+}}
+out.applied = snapshot();
+// Expanding clusters rebuilds the DataSets from the full lists
+{json.dumps([node['id'] for node in clustered['full_nodes']])}.forEach(window.pedpRevealNode);
+out.expanded = snapshot();
+out.sizes = {json.dumps([update['id'] for update in delta['updates']])}.map(function (id) {{
+    return nodes.get(id).size;
+}});
+location.hash = '';
+listeners.hashchange();
+out.reverted = snapshot();
+out.revertedSizes = {json.dumps([update['id'] for update in delta['updates']])}.map(function (id) {{
+    return nodes.get(id).size;
+}});
+console.log(JSON.stringify(out));
+"""
+    out = run_node(source)
+    sizes_before = {node['id']: node['size'] for node in clustered['full_nodes']}
+
+    assert out['applied']['hubs'] == len(hub_ids)
+    assert out['applied']['hubEdges'] > 0
+    assert out['applied']['dangling'] == 0
+
+    assert out['expanded']['hubs'] == len(hub_ids)
+    assert out['expanded']['hubEdges'] == len(delta['edges'])
+    assert out['expanded']['dangling'] == 0
+    assert out['sizes'] == [update['size'] for update in delta['updates']]
+
+    assert out['reverted']['hubs'] == 0
+    assert out['reverted']['hubEdges'] == 0
+    assert out['reverted']['visible'] == len(clustered['full_nodes'])
+    assert out['revertedSizes'] == [sizes_before[update['id']] for update in delta['updates']]
+
+
+def test_redirect_stub_is_recognised(tmp_path):
+    stub = write_redirect('network_map.html', tmp_path / 'network_map_hypothetical.html')
+    page = tmp_path / 'network_map.html'
+    page.write_text('<html><head><script>location.replace("#scenario");</script></head></html>')
+    assert is_redirect(stub)
+    assert not is_redirect(page)
@@ -0,0 +1,73 @@
+"""The typed CSR graph and its views, against NetworkX."""
+
+import networkx as nx
+import pandas as pd
+
+from pedp_network_map.data import build_network_data, hypothetical_network, read_frames
+from pedp_network_map.graph import (
+    HYPOTHETICAL_RELATIONSHIP, NON_SIZING_RELATIONSHIP, build_graph, real_graph, sizing_graph,
+)
+
+
+def network(edges, ids=('A', 'B', 'C', 'D')):
+    return build_network_data(
+        pd.DataFrame({'id': list(ids), 'name': list(ids), 'color': 'blue'}),
+        pd.DataFrame(edges, columns=['source', 'target', 'relationship_type']),
+        pd.DataFrame(columns=['id', 'x', 'y', 'fixed']),
+        pd.DataFrame({'name': ['blue'], 'hex': ['#00f']}),
+    )
+
+
+def reference(network):
+    G = nx.DiGraph()
+    G.add_nodes_from(network.nodes['id'])
+    for source, target, relationship in network.edges.itertuples(index=False):
+        G.add_edge(source, target, relationship_type=relationship)
+    return G
+
+
+EDGES = [
+    ('A', 'B', 'member'),
+    ('B', 'A', 'funds'),
+    ('A', 'B', 'partner'),          # repeat: keeps the last type
+    ('C', 'C', 'member'),           # self-loop
+    ('C', 'A', NON_SIZING_RELATIONSHIP),
+    ('D', 'E', HYPOTHETICAL_RELATIONSHIP),  # E is not a node
+]
+
+
+def test_degrees_match_networkx_on_the_current_network():
+    net = hypothetical_network(read_frames(hypothetical=True))
+    G, expected = build_graph(net), reference(net)
+    assert G.nodes()[:len(net.nodes)] == list(net.nodes['id'])
+    assert G.number_of_edges() == expected.number_of_edges()
+    assert G.degree() == dict(expected.degree())
+    assert dict(zip(G.nodes(), G.in_degrees().tolist())) == dict(expected.in_degree())
+    undirected = G.to_undirected()
+    assert undirected.degree() == dict(expected.to_undirected().degree())
+    assert undirected.number_of_edges() == expected.to_undirected().number_of_edges()
+    assert undirected.degree_centrality() == nx.degree_centrality(expected.to_undirected())
+
+
+def test_repeated_edges_self_loops_and_missing_endpoints():
+    G = build_graph(network(EDGES))
+    assert G.nodes() == ['A', 'B', 'C', 'D', 'E']
+    assert list(G.edges(data=True)) == list(reference(network(EDGES)).edges(data=True))
+    assert ('A', 'B', {'relationship_type': 'partner'}) in G.edges(data=True)
+    assert G.degree() == {'A': 3, 'B': 2, 'C': 3, 'D': 1, 'E': 1}
+    assert G.to_undirected().degree() == {'A': 2, 'B': 1, 'C': 3, 'D': 1, 'E': 1}
+    assert G.to_undirected().degree('C') == 3
+    assert G.successors('A') == ['B'] and G.predecessors('A') == ['B', 'C']
+    assert sorted(G.to_undirected().neighbors('C')) == ['A', 'C']
+
+
+def test_relationship_views():
+    G = build_graph(network(EDGES))
+    real, sizing = real_graph(G), sizing_graph(G)
+    assert real.number_of_edges() == 4 and sizing.number_of_edges() == 3
+    assert sizing.degree() == {'A': 2, 'B': 2, 'C': 2, 'D': 0, 'E': 0}
+    assert G.only({'funds'}).degree('A') == 1
+    assert G.graph.view(['no such type']).number_of_edges() == 0
+    undirected = sizing.to_undirected().to_networkx()
+    assert sorted(undirected.nodes) == G.nodes()
+    assert sorted(map(sorted, undirected.edges)) == [['A', 'B'], ['C', 'C']]
@@ -0,0 +1,77 @@
+"""The sync history rebuilds past states and counts them over time."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pedp_network_map.data import EDGE_COLUMNS, NODE_COLUMNS
+from pedp_network_map.history import IntervalTree, load_history, read_log, record_sync
+
+DAYS = pd.date_range('2026-01-01', periods=4, freq='D', tz='UTC')
+
+
+def nodes(*rows):
+    return pd.DataFrame([dict(zip(NODE_COLUMNS, row)) for row in rows], columns=NODE_COLUMNS).fillna('')
+
+
+def edges(*rows):
+    return pd.DataFrame([dict(zip(EDGE_COLUMNS, row)) for row in rows], columns=EDGE_COLUMNS).fillna('')
+
+
+SYNCS = [
+    (nodes(('A', 'Alpha'), ('B', 'Beta')), edges(('A', 'B'))),
+    (nodes(('A', 'Alpha'), ('B', 'Beta'), ('C', 'Gamma')), edges(('A', 'B'), ('C', 'A'))),
+    (nodes(('A', 'Alpha Org'), ('C', 'Gamma')), edges(('C', 'A'))),
+    (nodes(('A', 'Alpha Org'), ('C', 'Gamma'), ('B', 'Beta')), edges(('C', 'A'), ('B', 'C'))),
+]
+
+
+@pytest.fixture
+def history_dir(tmp_path):
+    for day, (nodes_df, edges_df) in zip(DAYS, SYNCS):
+        record_sync(nodes_df, edges_df, tmp_path, at=day)
+    return tmp_path
+
+
+def sort(frame):
+    return frame.sort_values(list(frame.columns)).reset_index(drop=True)
+
+
+def test_snapshot_rebuilds_each_past_sync(history_dir):
+    history = load_history(history_dir)
+    for day, (nodes_df, edges_df) in zip(DAYS, SYNCS):
+        for when in (day, day + pd.Timedelta(hours=12)):
+            past_nodes, past_edges = history.snapshot(when)
+            pd.testing.assert_frame_equal(sort(past_nodes), sort(nodes_df), check_dtype=False)
+            pd.testing.assert_frame_equal(sort(past_edges), sort(edges_df), check_dtype=False)
+    before_nodes, before_edges = history.snapshot(DAYS[0] - pd.Timedelta(seconds=1))
+    assert before_nodes.empty and before_edges.empty
+
+
+def test_log_only_grows_with_changes(history_dir):
+    log_rows = len(read_log(history_dir, 'nodes'))
+    assert record_sync(*SYNCS[-1], history_dir, at=DAYS[-1] + pd.Timedelta(days=1)) == {
+        'nodes': (0, 0), 'edges': (0, 0)}
+    assert len(read_log(history_dir, 'nodes')) == log_rows
+    # Day 3 renamed A (one close, one open) and dropped B; day 4 brought B back
+    log = read_log(history_dir, 'nodes')
+    assert log.groupby('op').size().to_dict() == {'close': 2, 'open': 5}
+
+
+def test_timelapse_counts(history_dir):
+    frame = load_history(history_dir).timelapse(DAYS)
+    assert frame['nodes'].tolist() == [2, 3, 2, 3]
+    assert frame['edges'].tolist() == [1, 2, 1, 2]
+    assert frame['nodes_opened'].tolist() == [2, 1, 1, 1]
+    assert frame['nodes_closed'].tolist() == [0, 0, 2, 0]
+
+
+def test_interval_tree_matches_a_scan():
+    rng = np.random.default_rng(0)
+    starts = np.sort(rng.integers(0, 1_000, 2_000))
+    ends = starts + rng.integers(0, 300, 2_000)
+    ends[rng.random(2_000) < 0.3] = np.iinfo(np.int64).max
+    tree = IntervalTree(starts, ends)
+    for t in rng.integers(-10, 1_400, 200):
+        np.testing.assert_array_equal(tree.stab(t), np.flatnonzero((starts <= t) & (ends > t)))
+    assert len(IntervalTree(starts[:0], ends[:0]).stab(5)) == 0
@@ -0,0 +1,57 @@
+"""The offline force-directed layout."""
+
+import numpy as np
+import pandas as pd
+
+from pedp_network_map import layout
+from pedp_network_map.data import read_frames
+from pedp_network_map.layout import CORE_MARGIN, MIN_CORE_RADIUS, calculate_positions, force_layout
+
+
+def two_clusters(size=20):
+    """Two cliques of `size` nodes joined by a single edge."""
+    edges = [(i, j) for offset in (0, size) for i in range(offset, offset + size)
+             for j in range(i + 1, offset + size)]
+    edges.append((0, size))
+    return 2 * size, *np.array(edges).T
+
+
+def test_connected_nodes_end_up_closer():
+    n, sources, targets = two_clusters()
+    pos = force_layout(n, sources, targets, iterations=200)
+    np.testing.assert_allclose(pos.mean(axis=0), 0, atol=1e-9)
+    within = np.linalg.norm(pos[sources] - pos[targets], axis=1).mean()
+    across = np.linalg.norm(pos[:n // 2, None] - pos[None, n // 2:], axis=2).mean()
+    assert within < across / 2
+
+
+def test_grid_repulsion_keeps_the_clusters_apart(monkeypatch):
+    monkeypatch.setattr(layout, 'EXACT_REPULSION_LIMIT', 10)
+    n, sources, targets = two_clusters()
+    pos = force_layout(n, sources, targets, iterations=200)
+    first, second = pos[:n // 2].mean(axis=0), pos[n // 2:].mean(axis=0)
+    spread = np.linalg.norm(pos[:n // 2] - first, axis=1).mean()
+    assert np.linalg.norm(first - second) > spread
+
+
+def test_every_node_gets_a_position():
+    frames = read_frames()
+    nodes_df, edges_df = frames['nodes'], frames['edges']
+    positions = calculate_positions(nodes_df, edges_df, iterations=50)
+    assert positions['id'].tolist() == nodes_df['id'].tolist()
+    assert positions.columns.tolist() == ['id', 'x', 'y', 'fixed']
+    pd.testing.assert_frame_equal(positions, calculate_positions(nodes_df, edges_df, iterations=50))
+
+
+def test_isolated_nodes_sit_in_their_corner_blocks():
+    nodes_df = pd.DataFrame({
+        'id': ['A', 'B', 'C', 'F1', 'F2', 'N1', 'N2'],
+        'category': ['Data', 'Funder', 'Data', 'Funder', 'Funder', 'Data', 'Data'],
+    })
+    edges_df = pd.DataFrame({'source': ['A', 'B'], 'target': ['B', 'C'],
+                             'relationship_type': ['member', 'funds']})
+    xy = calculate_positions(nodes_df, edges_df).set_index('id')[['x', 'y']]
+    assert (xy.loc[['A', 'B', 'C']].abs() <= MIN_CORE_RADIUS).all().all()
+    assert (xy.loc[['F1', 'F2']] >= MIN_CORE_RADIUS + CORE_MARGIN).all().all()
+    assert (xy.loc[['N1', 'N2']] <= -MIN_CORE_RADIUS - CORE_MARGIN).all().all()
+    assert xy.loc['F2', 'x'] > xy.loc['F1', 'x'] and xy.loc['N2', 'x'] < xy.loc['N1', 'x']
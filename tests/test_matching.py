@@ -0,0 +1,59 @@
+"""Trigram name matching."""
+
+import pandas as pd
+
+from pedp_network_map.data import read_frames
+from pedp_network_map.matching import NameIndex, find_duplicates, node_index, normalize_name, trigrams
+
+
+def dice(a, b):
+    a, b = trigrams(normalize_name(a)), trigrams(normalize_name(b))
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def test_normalize_name():
+    assert normalize_name('The Café & Co., Inc.') == 'cafe and'
+    assert normalize_name('Open-Data  Foundation LLC') == 'open data foundation'
+    assert normalize_name('Co') == 'co'
+    assert normalize_name(None) == normalize_name(float('nan')) == ''
+
+
+def test_search_finds_every_name_a_full_scan_would():
+    nodes_df = read_frames()['nodes']
+    index = node_index(nodes_df)
+    queries = ['Environmental Data Initiative', 'Data Rescue Project', 'Public Data',
+               'Internet Archive Foundation', 'Goggle.org', 'EDGI']
+    for threshold in (0.3, 0.5, 0.8):
+        for query in queries:
+            best = {}
+            for key, name in zip(index.keys, index.names):
+                score = round(dice(query, name), 4)
+                if score >= threshold and score > best.get(key, -1):
+                    best[key] = score
+            found = {match.key: match.score for match in index.search(query, limit=len(index), threshold=threshold)}
+            assert found == best, (query, threshold)
+
+
+def test_ranking_and_one_match_per_key():
+    index = NameIndex(['Open Data Foundation', 'Open Data Fund', 'ODF', 'Data'],
+                      keys=['odf', 'fund', 'odf', 'data'])
+    matches = index.search('open data foundation inc', limit=5)
+    assert [match.key for match in matches] == ['odf', 'fund']
+    assert matches[0].score == 1.0 and matches[0].name == 'Open Data Foundation'
+    assert index.search('Data', threshold=0.5)[0].key == 'data'
+    assert all(match.key != 'odf' for match in index.search('Data', threshold=0.5))
+
+    table = index.match_all(['Open Data Fund', 'Nothing Alike'], limit=1)
+    assert table['rank'].tolist() == [1, 0]
+    assert table['key'].iloc[0] == 'fund' and pd.isna(table['key'].iloc[1])
+
+
+def test_find_duplicates():
+    nodes_df = pd.DataFrame({
+        'id': ['A', 'B', 'C'],
+        'name': ['Environmental Data & Governance Initiative', 'Environmental Data and Governance Initiative',
+                 'Data Rescue Project'],
+        'organization': [None, 'EDGI', None],
+    })
+    duplicates = find_duplicates(nodes_df)
+    assert duplicates[['id_a', 'id_b', 'score']].values.tolist() == [['A', 'B', 1.0]]
@@ -0,0 +1,83 @@
+"""Up-to-date checks and dependency order of the stage runner."""
+
+import sys
+
+import pytest
+
+from pedp_network_map.pipeline import Stage, dependencies, run_pipeline
+from pedp_network_map.sheets import EXIT_NO_CHANGE
+
+
+def copy(source, target, log='runs.log'):
+    """A stage command that copies `source` to `target` and logs the run."""
+    code = (f"import pathlib; p = pathlib.Path; p({target!r}).write_text(p({source!r}).read_text()); "
+            f"open({log!r}, 'a').write({target!r} + '\\n')")
+    return [sys.executable, '-c', code]
+
+
+def stages(sync_code=0):
+    return [
+        Stage('fetch', [sys.executable, '-c', f"open('runs.log', 'a').write('fetch\\n'); exit({sync_code})"],
+              outputs=['raw.txt'], ok_codes=(0, EXIT_NO_CHANGE)),
+        Stage('clean', copy('raw.txt', 'clean.txt'), inputs=['raw.txt'], outputs=['clean.txt']),
+        Stage('report', copy('clean.txt', 'report.txt'), inputs=['clean.txt'], outputs=['report.txt']),
+        Stage('chart', copy('clean.txt', 'chart.txt'), inputs=['clean.txt'], outputs=['chart.txt']),
+    ]
+
+
+@pytest.fixture
+def run(tmp_path):
+    (tmp_path / 'raw.txt').write_text('v1')
+
+    def run(**kwargs):
+        (tmp_path / 'runs.log').write_text('')
+        status = run_pipeline(root=tmp_path, state_file=tmp_path / 'state.json',
+                              **{'stages': stages(), **kwargs})
+        return status, sorted((tmp_path / 'runs.log').read_text().split())
+    run.root = tmp_path
+    return run
+
+
+def test_dependencies():
+    assert dependencies(stages()) == {'fetch': [], 'clean': ['fetch'], 'report': ['clean'],
+                                      'chart': ['clean']}
+
+
+def test_second_run_skips_everything_but_the_fetch(run):
+    status, ran = run()
+    assert set(status.values()) == {'ran'}
+    assert (run.root / 'report.txt').read_text() == 'v1'
+    status, ran = run()
+    assert ran == ['fetch']
+    assert status == {'fetch': 'ran', 'clean': 'up to date', 'report': 'up to date', 'chart': 'up to date'}
+
+
+def test_changed_input_reruns_downstream_stages(run):
+    run()
+    (run.root / 'raw.txt').write_text('v2')
+    status, ran = run(dry_run=True, skip=['fetch'])
+    assert ran == [] and set(status.values()) == {'would run'}
+    status, ran = run(skip=['fetch'])
+    assert ran == ['chart.txt', 'clean.txt', 'report.txt']
+    assert (run.root / 'chart.txt').read_text() == 'v2'
+
+
+def test_deleted_or_edited_output_reruns_its_stage(run):
+    run()
+    (run.root / 'report.txt').unlink()
+    (run.root / 'chart.txt').write_text('edited')
+    status, ran = run(skip=['fetch'])
+    assert ran == ['chart.txt', 'report.txt'] and status['clean'] == 'up to date'
+    assert run(force=True, only=['clean'])[1] == ['clean.txt']
+
+
+def test_no_change_exit_counts_as_success(run):
+    run()
+    status, ran = run(stages=stages(sync_code=EXIT_NO_CHANGE))
+    assert status['fetch'] == 'ran' and status['report'] == 'up to date'
+
+
+def test_failure_blocks_dependent_stages(run):
+    status, ran = run(stages=stages(sync_code=1))
+    assert status == {'fetch': 'failed', 'clean': 'blocked', 'report': 'blocked', 'chart': 'blocked'}
+    assert ran == ['fetch']
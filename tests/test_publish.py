@@ -0,0 +1,28 @@
+"""A rebuild that only changes the data leaves the published page unchanged."""
+
+from pedp_network_map.data import current_network, read_frames
+from pedp_network_map.graph import build_graph
+from pedp_network_map.publish import publish_pages
+from pedp_network_map.render import render_network
+
+
+def publish(network, out_dir):
+    page = render_network(build_graph(network), network, out_dir / 'network_map.html', mode='static')
+    publish_pages([(page, 'index.html')], out_dir / 'site', compress=False)
+    return out_dir / 'site'
+
+
+def test_data_change_keeps_the_page(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)   # pyvis copies its lib/ into the working directory
+    frames = read_frames()
+    before = publish(current_network(frames), tmp_path / 'before')
+    frames['nodes'].loc[0, 'name'] = frames['nodes'].loc[0, 'name'] + ' (renamed)'
+    after = publish(current_network(frames), tmp_path / 'after')
+
+    assert (after / 'index.html').read_bytes() == (before / 'index.html').read_bytes()
+    assert (after / 'index.data.js').read_bytes() != (before / 'index.data.js').read_bytes()
+    pointer = (after / 'index.data.js').read_text(encoding='utf-8')
+    [data_file] = (after / 'assets').glob('network_map.data.*.js')
+    assert f'"assets/{data_file.name}"' in pointer
+    assert '(renamed)' in data_file.read_text(encoding='utf-8')
+    assert (after / 'index.tooltips.js').exists() and (after / 'index.search.js').exists()
@@ -0,0 +1,76 @@
+"""Declarative edge rules and derive_edges()."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from pedp_network_map.data import read_frames
+from pedp_network_map.rules import DEFAULT_RULES, Condition, EdgeRule, derive_edges, load_rules
+
+NODES = pd.DataFrame({
+    'id': ['PEDP', 'F1', 'F2', 'F3', 'O1', 'O2'],
+    'category': ['Coalition', 'Funder', 'Funder', 'Funder', 'Data', None],
+    'status': ['Established', '4. Approved', 'approved', '2. Proposal submitted', '4. Approved', ' '],
+    'organization': [None, 'PEDP', 'F1', None, 'F1', 'PEDP'],
+})
+
+
+def edges(derived):
+    return sorted(map(tuple, derived[['source', 'target', 'relationship_type']].to_numpy()))
+
+
+def test_default_rule_matches_the_old_funding_edges():
+    nodes_df = read_frames()['nodes']
+    status = nodes_df['status']
+    funders = nodes_df[(nodes_df['category'] == 'Funder')
+                       & (status.str.contains('4', na=False) | status.str.contains('approved', na=False))]
+    derived = derive_edges(nodes_df)
+    assert edges(derived) == sorted((source, 'PEDP', 'funds') for source in funders['id'].unique())
+    assert set(derived['rule']) == {'approved funders fund PEDP'}
+
+
+def test_operators():
+    def matching(op, column, value=None):
+        rule = EdgeRule('r', (Condition(column, op, value),), 'r', target='X')
+        return derive_edges(NODES, [rule])['source'].tolist()
+
+    assert matching('equals', 'category', 'Funder') == ['F1', 'F2', 'F3']
+    assert matching('not_equals', 'category', 'Funder') == ['PEDP', 'O1']
+    assert matching('matches', 'status', '^4') == ['F1', 'O1']
+    assert matching('in', 'category', ['Data', 'Coalition']) == ['PEDP', 'O1']
+    assert matching('not_empty', 'organization') == ['F1', 'F2', 'O1', 'O2']
+    assert matching('not_empty', 'status') == ['PEDP', 'F1', 'F2', 'F3', 'O1']
+    assert matching('equals', 'missing', 'x') == []
+
+
+def test_target_column_duplicates_and_existing_edges():
+    member = EdgeRule('member of', (Condition('organization', 'not_empty'),), 'member',
+                      target_column='organization')
+    twice = EdgeRule('again', (Condition('category', 'equals', 'Funder'),), 'member',
+                     target_column='organization')
+    existing = pd.DataFrame({'source': ['O2'], 'target': ['PEDP'], 'relationship_type': ['member']})
+    derived = derive_edges(NODES, [member, twice], existing_edges=existing)
+    assert edges(derived) == [('F1', 'PEDP', 'member'), ('F2', 'F1', 'member'), ('O1', 'F1', 'member')]
+    # F3 has no organization, and F1/F2 keep the first rule that produced them
+    assert set(derived['rule']) == {'member of'}
+    assert derive_edges(NODES, []).columns.tolist() == ['source', 'target', 'relationship_type', 'rule']
+
+
+def test_rules_load_from_json(tmp_path):
+    path = tmp_path / 'rules.json'
+    path.write_text(json.dumps([{
+        'name': 'approved funders fund PEDP',
+        'when': {'category': {'equals': 'Funder'}, 'status': {'matches': '4|approved'}},
+        'edge': {'relationship_type': 'funds', 'target': 'PEDP'},
+    }]))
+    assert load_rules(path) == DEFAULT_RULES
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError, match='Unknown operator'):
+        Condition('status', 'contains', 'x')
+    with pytest.raises(ValueError, match='exactly one of target'):
+        EdgeRule('r', (), 'funds', target='PEDP', target_column='organization')
+    with pytest.raises(ValueError, match='exactly one of target'):
+        EdgeRule('r', (), 'funds')
@@ -0,0 +1,82 @@
+"""Hypothetical scenarios generated from hub specs."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from pedp_network_map.data import read_frames
+from pedp_network_map.scenarios import (
+    DEFAULT_SCENARIO, BaseNetwork, Hub, ScenarioSpec, generate_scenario, generate_scenarios,
+    hub_positions, load_scenarios, read_scenario, write_scenario,
+)
+
+NODES = pd.DataFrame({
+    'id': ['PEDP', 'DataFoundation', 'F1', 'F2', 'D1', 'R1', 'X'],
+    'category': ['Coalition', 'Data', 'Funder', 'Funder', 'Data', 'Research', 'Funder'],
+})
+EDGES = pd.DataFrame({'source': ['X'], 'target': ['PEDP'], 'relationship_type': ['funds']})
+
+
+def test_default_scenario_matches_the_committed_tables():
+    frames = read_frames(hypothetical=True)
+    scenario = generate_scenarios(frames['nodes'], frames['edges'], [DEFAULT_SCENARIO])['default']
+    for generated, committed in ((scenario.nodes, 'nodes_hypothetical'),
+                                 (scenario.edges, 'edges_hypothetical'),
+                                 (scenario.positions, 'positions_hypothetical')):
+        pd.testing.assert_frame_equal(generated.fillna(''), frames[committed].fillna(''), check_dtype=False)
+
+
+def test_hubs_claim_isolated_nodes_in_flow_order():
+    base = BaseNetwork(NODES, EDGES)
+    assert base.isolated_ids().tolist() == ['DataFoundation', 'F1', 'F2', 'D1', 'R1']
+    scenario = generate_scenario(base, DEFAULT_SCENARIO)
+    assert scenario.attached == {'HYP-HUB2': 2, 'HYP-HUB1': 3}
+    assert list(scenario.edges[['source', 'target']].itertuples(index=False, name=None)) == [
+        ('F1', 'HYP-HUB2'), ('F2', 'HYP-HUB2'),                          # isolated → hub
+        ('HYP-HUB2', 'PEDP'), ('HYP-HUB2', 'DataFoundation'),            # hub → core
+        ('PEDP', 'HYP-HUB1'), ('DataFoundation', 'HYP-HUB1'),            # core → hub
+        ('HYP-HUB1', 'DataFoundation'), ('HYP-HUB1', 'D1'), ('HYP-HUB1', 'R1'),  # hub → isolated
+    ]
+    assert scenario.positions[['x', 'y']].values.tolist() == [[-180, -180], [180, 180]]
+
+
+def test_hub_positions_and_validation():
+    hubs = [Hub('HYP-A', 'A', 'Data', 'red'), Hub('HYP-B', 'B', 'Data', 'red', x=5, y=7),
+            Hub('HYP-C', 'C', 'Data', 'red'), Hub('HYP-D', 'D', 'Data', 'red')]
+    assert hub_positions(hubs) == [(-180, -180), (5, 7), (180, 180), (-180, 180)]
+    with pytest.raises(ValueError, match='must start with'):
+        Hub('HUB', 'A', 'Data', 'red')
+    with pytest.raises(ValueError, match='unknown flow'):
+        Hub('HYP-A', 'A', 'Data', 'red', flow='sideways')
+    with pytest.raises(ValueError, match='both x and y'):
+        Hub('HYP-A', 'A', 'Data', 'red', x=1)
+    with pytest.raises(ValueError, match='repeats a hub id'):
+        ScenarioSpec('twice', (hubs[0], hubs[0]))
+
+
+def test_json_specs_and_round_trip(tmp_path):
+    path = tmp_path / 'scenarios.json'
+    path.write_text(json.dumps([
+        {'name': 'default', 'hubs': [
+            {'id': 'HYP-HUB1', 'name': 'Regional Data Coordination Hub',
+             'category': 'Data Coordination/Standards', 'color': 'red', 'attach': None, 'flow': 'out',
+             'description': DEFAULT_SCENARIO.hubs[0].description},
+            {'id': 'HYP-HUB2', 'name': 'Funder Collaborative Network', 'category': 'Funder',
+             'color': 'teal', 'attach': ['Funder'], 'flow': 'in',
+             'description': DEFAULT_SCENARIO.hubs[1].description}]},
+        {'name': 'research', 'core': ['PEDP'], 'hubs': [
+            {'id': 'HYP-R', 'name': 'Research Hub', 'category': 'Research', 'color': 'blue',
+             'attach': ['Research'], 'x': 0, 'y': 300}]},
+    ]))
+    specs = load_scenarios(path)
+    assert specs[0] == DEFAULT_SCENARIO
+    research = generate_scenarios(NODES, EDGES, specs)['research']
+    assert research.edges[['source', 'target']].values.tolist() == [['PEDP', 'HYP-R'], ['HYP-R', 'R1']]
+
+    write_scenario(research, tmp_path / 'research')
+    loaded = read_scenario(tmp_path / 'research')
+    assert loaded.name == 'research'
+    for frame in ('nodes', 'edges', 'positions'):
+        pd.testing.assert_frame_equal(getattr(loaded, frame).fillna(''), getattr(research, frame).fillna(''),
+                                      check_dtype=False)
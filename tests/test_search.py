@@ -0,0 +1,65 @@
+"""The search index and the page's query matching agree on accented names."""
+
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from helpers import needs_node, run_node, script_body
+from pedp_network_map.search import SEARCH_CALLBACK, STOP_WORDS, search_index, search_script, search_words
+
+pytestmark = needs_node
+
+NAMES = {
+    'KU': 'Københavns Universitet',
+    'LODZ': 'Łódź Data Lab',
+    'CAFE': 'Café Ñandú & Co',
+    'STR': 'Straße der Umweltdaten',
+    'ZOBS': 'Zürich Observatory',
+    'ISL': 'Þingvellir Æðarfugl Station',
+    'PEDP': 'Public Environmental Data Partners',
+}
+
+
+@pytest.fixture(scope='module')
+def network():
+    records = {node: {'name': name, 'organization': None, 'category': 'Data',
+                      'description': 'Climate and ocean data'}
+               for node, name in NAMES.items()}
+    return SimpleNamespace(node=records.__getitem__)
+
+
+def test_query_words_match_index_words():
+    script = script_body(search_script('map.search.js'))
+    constants = re.search(r'    var STOP_WORDS = .*?;\n', script).group(0)
+    words = re.search(r'    function words\(text\) \{.*?\n    \}\n', script, re.S).group(0)
+    names = list(NAMES.values()) + ['ØRSTED Œuvre', 'İstanbul Đakovo', 'Ħal Far']
+    out = run_node(constants + words + f"console.log(JSON.stringify({json.dumps(names)}.map(words)));")
+    expected = [[word for word in name_words if word and word not in STOP_WORDS]
+                for name_words in search_words(names)]
+    assert out == expected
+    assert out[0] == ['kobenhavns', 'universitet']
+
+
+@pytest.mark.parametrize('query, node', [
+    ('København', 'KU'), ('kobenhavn', 'KU'),
+    ('Łódź', 'LODZ'), ('lodz data', 'LODZ'),
+    ('café ñandú', 'CAFE'), ('nandu', 'CAFE'),
+    ('Straße', 'STR'), ('strasse', 'STR'),
+    ('zurich', 'ZOBS'), ('obsrvatory', 'ZOBS'),
+    ('þingvellir æðarfugl', 'ISL'), ('aedarfugl', 'ISL'),
+])
+def test_accented_queries_find_their_node(network, query, node):
+    index = search_index(network, list(NAMES))
+    out = run_node(f"""
+var nodes = new DataSet({json.dumps([{'id': node_id} for node_id in NAMES])});
+{script_body(search_script('map.search.js'))}
+var box = document.body.children[0], input = box.children[0], list = box.children[1];
+input.listeners.focus();
+window.{SEARCH_CALLBACK}({json.dumps(index)});
+input.value = {json.dumps(query)};
+input.listeners.input();
+console.log(JSON.stringify(list.children.map(function (item) {{ return item.children[0].textContent; }})));
+""")
+    assert out[0] == NAMES[node]
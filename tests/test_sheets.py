@@ -0,0 +1,108 @@
+"""Sheet downloads against scripts/fake_sheets_server.py."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from pedp_network_map.sheets import (
+    SheetFetchError, fetch_tabs, load_manifest, save_manifest, sync_inputs, unchanged,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+from fake_sheets_server import make_server
+
+NODES = "id,name,category\nPEDP,Public Environmental Data Partners,Coalition\nEDGI,EDGI,Data\n"
+EDGES = "source,target,relationship_type\nEDGI,PEDP,member\n"
+
+
+@pytest.fixture
+def sheets(tmp_path):
+    """A running fake sheets server; tests set its latency and failure attributes."""
+    (tmp_path / '1.csv').write_text(NODES)
+    (tmp_path / '2.csv').write_text(EDGES)
+    server = make_server(port=0, tabs={'1': tmp_path / '1.csv', '2': tmp_path / '2.csv'})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f'http://127.0.0.1:{server.server_address[1]}/export?gid='
+    server.tab_urls = {'Nodes': ('1', base + '1'), 'Edges': ('2', base + '2')}
+    server.csv_dir = tmp_path
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetches_every_tab(sheets):
+    nodes, edges = fetch_tabs(sheets.tab_urls, backoff=0)
+    pd.testing.assert_frame_equal(nodes.frame, pd.read_csv(sheets.csv_dir / '1.csv'))
+    pd.testing.assert_frame_equal(edges.frame, pd.read_csv(sheets.csv_dir / '2.csv'))
+    assert nodes.etag and not nodes.not_modified
+    assert sheets.requests == 2
+
+
+def test_tabs_download_concurrently(sheets):
+    sheets.latency = 0.5
+    start = time.perf_counter()
+    fetch_tabs(sheets.tab_urls, backoff=0)
+    assert time.perf_counter() - start < 0.9
+
+
+def test_retries_after_failures(sheets):
+    sheets.fail_first = 2
+    results = fetch_tabs(sheets.tab_urls, retries=3, backoff=0.01)
+    assert [len(result.frame) for result in results] == [2, 1]
+    assert sheets.requests == 4
+
+
+def test_backoff_doubles(sheets):
+    sheets.fail_first = 2
+    start = time.perf_counter()
+    fetch_tabs({'Nodes': sheets.tab_urls['Nodes']}, retries=2, backoff=0.1)
+    # 0.1s after the first failure, 0.2s after the second
+    assert 0.3 <= time.perf_counter() - start < 0.6
+
+
+def test_gives_up_after_retries(sheets):
+    sheets.fail_rate = 1.0
+    with pytest.raises(SheetFetchError, match=r'HTTP 503.*after 3 attempts') as error:
+        fetch_tabs({'Nodes': sheets.tab_urls['Nodes']}, retries=2, backoff=0)
+    assert error.value.name == 'Nodes'
+    assert sheets.requests == 3
+
+
+def test_timeout_is_retried_then_fails(sheets):
+    sheets.latency = 1.0
+    with pytest.raises(SheetFetchError, match=r'(?i)timed? ?out.*after 2 attempts'):
+        fetch_tabs({'Nodes': sheets.tab_urls['Nodes']}, timeout=0.2, retries=1, backoff=0)
+
+
+def test_validators_give_not_modified(sheets):
+    first = fetch_tabs(sheets.tab_urls, backoff=0)
+    previous = {result.name: result.manifest_entry() for result in first}
+    second = fetch_tabs(sheets.tab_urls, previous=previous, backoff=0)
+    assert all(result.not_modified and result.frame is None for result in second)
+    assert [result.sha256 for result in second] == [result.sha256 for result in first]
+
+
+def test_unchanged_sheet_means_no_change_exit(sheets, tmp_path):
+    rules = tmp_path / 'rules.json'
+    rules.write_text('[]')
+    inputs = sync_inputs(rules, [Path(__file__)])
+    manifest_path = tmp_path / 'sync_manifest.json'
+    save_manifest(manifest_path, 'sheet', fetch_tabs(sheets.tab_urls, backoff=0), inputs)
+    manifest = load_manifest(manifest_path)
+
+    results = fetch_tabs(sheets.tab_urls, previous=manifest['tabs'], backoff=0)
+    # sync_from_sheets.py exits with EXIT_NO_CHANGE exactly when this holds
+    assert unchanged(results, manifest, inputs)
+
+    rules.write_text('[{"name": "extra"}]')
+    assert not unchanged(results, manifest, sync_inputs(rules, [Path(__file__)]))
+
+    (sheets.csv_dir / '2.csv').write_text(EDGES + "PEDP,EDGI,member\n")
+    results = fetch_tabs(sheets.tab_urls, previous=manifest['tabs'], backoff=0)
+    assert not unchanged(results, manifest, inputs)
+    assert not results[1].not_modified and len(results[1].frame) == 2
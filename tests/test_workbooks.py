@@ -0,0 +1,49 @@
+"""The workbook cache loads the same frames the streaming reader built."""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from pedp_network_map import workbooks
+
+openpyxl = pytest.importorskip('openpyxl')
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    book = openpyxl.Workbook()
+    sheet = book.active
+    sheet.title = workbooks.ATTENDANCE_SHEET
+    sheet.append(['Name', 'Affiliation ', None, 'When', 3, 'Mixed', None])
+    sheet.append(['A', 'Moore Foundation', None, datetime.datetime(2025, 9, 1, 10), 1.5, 'x', None])
+    sheet.append(['B', None, None, datetime.datetime(2025, 9, 2), 2, 7, None])
+    sheet.append(['C', 'Univ', 'stray', None, None, datetime.time(9, 30), None])
+    sheet.append([None] * 7)
+    book.create_sheet('Empty')
+    book.create_sheet('Header only').append(['a', 'b'])
+    other = book.create_sheet('Other')
+    for row in (['x'], [True], [datetime.date(2020, 1, 1)]):
+        other.append(row)
+    path = tmp_path / 'guests.xlsx'
+    book.save(path)
+    return path
+
+
+def test_cached_sheets_match_fresh_read(workbook, tmp_path):
+    fresh = workbooks.read_workbook(workbook, cache_dir=None)
+    workbooks.read_workbook(workbook, cache_dir=tmp_path / 'cache')
+    [cache_file] = (tmp_path / 'cache').iterdir()
+    assert cache_file.suffix == '.npz'
+    cached = workbooks.read_workbook(workbook, cache_dir=tmp_path / 'cache')
+
+    assert list(cached) == list(fresh)
+    for name, frame in fresh.items():
+        pd.testing.assert_frame_equal(cached[name], frame, check_index_type=False)
+    attendance = cached[workbooks.ATTENDANCE_SHEET]
+    assert list(attendance.columns) == ['Name', 'Affiliation ', 'Unnamed: 2', 'When', 3, 'Mixed']
+    assert attendance['Mixed'].tolist() == ['x', 7, datetime.time(9, 30)]
+
+
+def test_affiliations_without_the_column():
+    assert workbooks.affiliations(pd.DataFrame({'Name': ['A']})).empty
@@ -22,17 +22,24 @@ def verify_data():
     """Verify data files load correctly."""
     print("\nChecking data files...")
     try:
-        import pandas as pd
+        from pedp_network_map.artifact import artifact_status
+        from pedp_network_map.data import read_frames
 
-        nodes_df = pd.read_csv('data/processed/nodes.csv')
-        edges_df = pd.read_csv('data/processed/edges.csv')
+        status = artifact_status('data/processed', ['nodes', 'edges'])
+        frames = read_frames('data/processed')
+        nodes_df, edges_df = frames['nodes'], frames['edges']
 
+        if status == 'fresh':
+            print("✓ Loaded from binary tables (data/processed/network.arrays)")
+        else:
+            print(f"ℹ️  Binary tables {status}; loaded the CSVs (run a sync to rebuild them)")
         print(f"✓ Loaded {len(nodes_df)} nodes")
         print(f"✓ Loaded {len(edges_df)} edges")
 
         # Verify expected structure
-        assert len(nodes_df) == 19, f"Expected 19 nodes, got {len(nodes_df)}"
-        assert len(edges_df) >= 40, f"Expected 40+ edges, got {len(edges_df)}"
+        # Counts grow with the sheet; only require a non-empty network
+        assert len(nodes_df) > 0, "No nodes loaded"
+        assert len(edges_df) > 0, "No edges loaded"
         assert 'id' in nodes_df.columns, "Missing 'id' column in nodes"
         assert 'color' in nodes_df.columns, "Missing 'color' column in nodes"
         assert 'source' in edges_df.columns, "Missing 'source' column in edges"
@@ -61,10 +68,10 @@ def verify_network():
     print("\nBuilding network...")
     try:
         import networkx as nx
-        import pandas as pd
+        from pedp_network_map.data import read_frames
 
-        nodes_df = pd.read_csv('data/processed/nodes.csv')
-        edges_df = pd.read_csv('data/processed/edges.csv')
+        frames = read_frames('data/processed')
+        nodes_df, edges_df = frames['nodes'], frames['edges']
 
         G = nx.DiGraph()
 